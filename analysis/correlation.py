@@ -2,8 +2,15 @@ import pandas as pd
 import numpy as np
 from scipy import stats
 
+try:
+    from analysis.estimators import volatility_column
+    from analysis.volatility import _sort_by_ticker
+except ImportError:
+    from estimators import volatility_column
+    from volatility import _sort_by_ticker
 
-def merge_sentiment_volatility(sentiment_df, stock_df, mode='daily'):
+
+def merge_sentiment_volatility(sentiment_df, stock_df, mode='daily', volatility='Volatility'):
     """
     Verbindet Sentiment-Daten mit Volatilitäts-Daten.
     
@@ -11,12 +18,17 @@ def merge_sentiment_volatility(sentiment_df, stock_df, mode='daily'):
         sentiment_df: DataFrame mit 'ticker', 'date'/'year_week', 'sentiment_score'
         stock_df: DataFrame mit 'Ticker', 'Date', 'Volatility', 'Daily_Return'
         mode: 'daily' oder 'weekly'
+        volatility: Schätzer, der als Spalte 'Volatility' übernommen wird
+            (z.B. 'parkinson', siehe analysis.estimators); weitere
+            'Volatility_*'-Spalten werden mitgeführt
     
     Returns:
         Kombinierter DataFrame
     """
     sentiment_df = sentiment_df.copy()
     stock_df = stock_df.copy()
+    stock_df['Volatility'] = stock_df[volatility_column(volatility)]
+    vol_columns = [c for c in stock_df.columns if c.startswith('Volatility')]
     
     if mode == 'weekly':
         # Wöchentliches Merge
@@ -36,7 +48,7 @@ def merge_sentiment_volatility(sentiment_df, stock_df, mode='daily'):
         
         merged = pd.merge(
             sentiment_df,
-            stock_df[['ticker', 'date', 'Volatility', 'Daily_Return', 'Close']],
+            stock_df[['ticker', 'date', *vol_columns, 'Daily_Return', 'Close']],
             on=['ticker', 'date'],
             how='inner'
         )
@@ -65,17 +77,22 @@ def calculate_correlation(df, col1='sentiment_score', col2='Volatility'):
     return corr, p_value
 
 
-def calculate_all_correlations(df):
+def calculate_all_correlations(df, volatility='Volatility'):
     """
     Berechnet alle relevanten Korrelationen.
     
+    Args:
+        df: Kombinierter DataFrame
+        volatility: Name des Volatilitäts-Schätzers (Standard: Spalte 'Volatility')
+    
     Returns:
         Dictionary mit Korrelationsergebnissen
     """
     results = {}
+    vol = volatility_column(volatility)
     
     # 1. Sentiment vs Volatilität
-    corr, p = calculate_correlation(df, 'sentiment_score', 'Volatility')
+    corr, p = calculate_correlation(df, 'sentiment_score', vol)
     results['sentiment_vs_volatility'] = {'correlation': corr, 'p_value': p}
     
     # 2. Sentiment vs Rendite (zum Vergleich)
@@ -85,42 +102,304 @@ def calculate_all_correlations(df):
     # 3. Absolutes Sentiment vs Volatilität
     df_temp = df.copy()
     df_temp['abs_sentiment'] = df_temp['sentiment_score'].abs()
-    corr, p = calculate_correlation(df_temp, 'abs_sentiment', 'Volatility')
+    corr, p = calculate_correlation(df_temp, 'abs_sentiment', vol)
     results['abs_sentiment_vs_volatility'] = {'correlation': corr, 'p_value': p}
     
     return results
 
 
-def lead_lag_analysis(df, max_lag=5):
+def compute_ticker_stats(df, col1='sentiment_score', volatility='Volatility'):
+    """
+    Statistik pro Ticker in einem gruppierten Durchlauf.
+    
+    Ersetzt das Filtern des gesamten DataFrames je Ticker: Anzahl, Mittelwerte
+    und Pearson-Korrelation (mit p-Wert) entstehen aus Gruppensummen über
+    alle Ticker gleichzeitig. Sonderfälle wie calculate_correlation
+    (weniger als 3 Paare: NaN; konstante Werte: r=0, p=1).
+    
+    Konstant heißt hier: alle gültigen Werte sind gleich. Bei konstanten
+    Gleitkommawerten (z. B. 0.1) liefert std() durch Rundung oft knapp
+    über 0, sodass die Berechnung pro Ticker bisher pearsonr aufrief und
+    NaN erhielt; hier ergibt sich in diesem Fall immer r=0, p=1.
+    
+    Args:
+        df: Kombinierter DataFrame mit 'ticker', col1 und Volatilität
+        col1: Erste Spalte (Standard: 'sentiment_score')
+        volatility: Name des Volatilitäts-Schätzers (Standard: Spalte 'Volatility')
+    
+    Returns:
+        DataFrame (Ticker in Reihenfolge des ersten Auftretens) mit ticker,
+        n_points, correlation, p_value, avg_sentiment, avg_volatility
+    """
+    col2 = volatility_column(volatility)
+    codes, tickers = pd.factorize(df['ticker'])
+    k = len(tickers)
+    x = df[col1].to_numpy(dtype=np.float64)
+    y = df[col2].to_numpy(dtype=np.float64)
+    
+    def group_sum(weights):
+        return np.bincount(codes, weights=weights, minlength=k)
+    
+    def group_mean(values):
+        valid = ~np.isnan(values)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return group_sum(np.where(valid, values, 0.0)) / group_sum(valid)
+    
+    # Korrelation nur über Zeilen, in denen beide Werte vorhanden sind
+    pair = ~np.isnan(x) & ~np.isnan(y)
+    n_pairs = group_sum(pair)
+    a = np.where(pair, x - group_mean(np.where(pair, x, np.nan))[codes], 0.0)
+    b = np.where(pair, y - group_mean(np.where(pair, y, np.nan))[codes], 0.0)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        r = np.clip(group_sum(a * b) / np.sqrt(group_sum(a * a) * group_sum(b * b)), -1.0, 1.0)
+    p = pearson_p_value(r, n_pairs)
+    
+    # Konstante Werte exakt erkennen (Minimum == Maximum je Gruppe)
+    constant = np.zeros(k, dtype=bool)
+    for values in (x, y):
+        grouped = pd.Series(np.where(pair, values, np.nan)).groupby(codes)
+        constant |= (grouped.min() == grouped.max()).reindex(range(k), fill_value=False).to_numpy()
+    r = np.where(constant, 0.0, r)
+    p = np.where(constant, 1.0, p)
+    r = np.where(n_pairs < 3, np.nan, r)
+    p = np.where(n_pairs < 3, np.nan, p)
+    
+    return pd.DataFrame({
+        'ticker': tickers,
+        'n_points': np.bincount(codes, minlength=k),
+        'correlation': r,
+        'p_value': p,
+        'avg_sentiment': group_mean(x),
+        'avg_volatility': group_mean(y)
+    })
+
+
+def pearson_p_value(r, n):
+    """
+    Zweiseitiger p-Wert der Pearson-Korrelation (t-Verteilung mit n-2 Freiheitsgraden).
+    
+    Entspricht scipy.stats.pearsonr, arbeitet aber vektorisiert auf Arrays.
+    """
+    r = np.clip(np.asarray(r, dtype=np.float64), -1.0, 1.0)
+    n = np.asarray(n, dtype=np.float64)
+    df = n - 2
+    with np.errstate(divide='ignore', invalid='ignore'):
+        t = np.abs(r) * np.sqrt(df / (1 - r * r))
+        p = 2 * stats.t.sf(t, df)
+    return np.where(np.abs(r) == 1.0, 0.0, p)
+
+
+def _pad_by_ticker(df, columns):
+    """
+    Ordnet die Spalten als Matrix (Ticker × Zeit) an, nach Datum sortiert, mit NaN aufgefüllt.
+    
+    Returns:
+        (Ticker in Reihenfolge des ersten Auftretens, Liste der Matrizen)
+    """
+    sorted_df, group_start = _sort_by_ticker(df, group='ticker', date='date')
+    tickers = list(sorted_df['ticker'].unique())
+    group_ids = np.cumsum(np.r_[True, group_start[1:] != group_start[:-1]]) - 1
+    position = np.arange(len(sorted_df)) - group_start
+    length = int(position.max()) + 1
+    
+    matrices = []
+    for column in columns:
+        matrix = np.full((len(tickers), length), np.nan)
+        matrix[group_ids, position] = sorted_df[column].to_numpy(dtype=np.float64)
+        matrices.append(matrix)
+    return tickers, matrices
+
+
+def _lag_sums_direct(x, y, mx, my, lags):
+    """Summen n, Σx, Σy, Σx², Σy², Σxy pro Ticker und Lag über verschobene Slices."""
+    k, length = x.shape
+    sums = np.zeros((6, k, len(lags)))
+    constant = np.zeros((k, len(lags)), dtype=bool)
+    
+    for j, lag in enumerate(lags):
+        if abs(lag) >= length:
+            continue
+        if lag >= 0:
+            xs, ys = slice(0, length - lag), slice(lag, length)
+        else:
+            xs, ys = slice(-lag, length), slice(0, length + lag)
+        mask = mx[:, xs] & my[:, ys]
+        a = np.where(mask, x[:, xs], 0.0)
+        b = np.where(mask, y[:, ys], 0.0)
+        sums[:, :, j] = (mask.sum(axis=1), a.sum(axis=1), b.sum(axis=1),
+                         (a * a).sum(axis=1), (b * b).sum(axis=1), (a * b).sum(axis=1))
+        
+        # Konstante Werte exakt erkennen (wie std() == 0 in calculate_correlation)
+        for values, sl in ((x, xs), (y, ys)):
+            low = np.where(mask, values[:, sl], np.inf).min(axis=1)
+            high = np.where(mask, values[:, sl], -np.inf).max(axis=1)
+            constant[:, j] |= low == high
+    return sums, constant
+
+
+def _lag_sums_fft(x, y, mx, my, lags):
+    """Dieselben Summen über FFT-Kreuzkorrelation, alle Lags auf einmal."""
+    k, length = x.shape
+    nfft = 1 << int(np.ceil(np.log2(2 * length)))
+    x0 = np.where(mx, x, 0.0)
+    y0 = np.where(my, y, 0.0)
+    fx = mx.astype(np.float64)
+    fy = my.astype(np.float64)
+    
+    def xcorr(a, b):
+        # c[lag] = Σ_t a[t] · b[t + lag]
+        c = np.fft.irfft(np.conj(np.fft.rfft(a, nfft)) * np.fft.rfft(b, nfft), nfft)
+        return c[:, np.asarray(lags) % nfft]
+    
+    sums = np.stack([xcorr(fx, fy), xcorr(x0, fy), xcorr(fx, y0),
+                     xcorr(x0 * x0, fy), xcorr(fx, y0 * y0), xcorr(x0, y0)])
+    sums[0] = np.rint(sums[0])
+    out_of_range = np.abs(np.asarray(lags)) >= length
+    sums[:, :, out_of_range] = 0.0
+    
+    # Konstanz nur näherungsweise: Varianz im Rundungsbereich der Werte
+    n = np.maximum(sums[0], 1)
+    scale_x = np.abs(x0).max(axis=1, keepdims=True) ** 2
+    scale_y = np.abs(y0).max(axis=1, keepdims=True) ** 2
+    var_x = sums[3] / n - (sums[1] / n) ** 2
+    var_y = sums[4] / n - (sums[2] / n) ** 2
+    constant = (var_x <= 1e-10 * scale_x) | (var_y <= 1e-10 * scale_y)
+    return sums, constant
+
+
+def lead_lag_analysis(df, max_lag=5, volatility='Volatility', method='auto'):
     """
     Lead-Lag-Analyse: Korreliert Sentiment(t) mit Volatilität(t+lag).
     
+    Alle Ticker werden als Matrix (Ticker × Zeit) gleichzeitig verarbeitet;
+    pro Lag werden nur Summen über verschobene Slices gebildet
+    (method='direct') bzw. alle Lags auf einmal per FFT berechnet
+    (method='fft', für großes max_lag und lange Reihen). Die p-Werte
+    folgen analytisch aus r und der Anzahl gültiger Paare.
+    
+    Ergebnisse entsprechen der früheren Schleife mit shift(-lag) und
+    calculate_correlation pro Ticker und Lag. Ausnahme: Ist eine Reihe
+    konstant (bei 'fft' bis auf Rundungsfehler), ergibt sich r=0, p=1
+    wie im std() == 0-Zweig von calculate_correlation; die Schleife lieferte
+    für konstante Gleitkommawerte mit std() knapp über 0 dagegen NaN.
+    
     Args:
         df: DataFrame mit sentiment_score und Volatility
         max_lag: Maximale Verzögerung in Tagen
+        volatility: Name des Volatilitäts-Schätzers (Standard: Spalte 'Volatility')
+        method: 'direct', 'fft' oder 'auto'
     
     Returns:
         DataFrame mit Korrelationen pro Lag
     """
-    results = []
+    vol = volatility_column(volatility)
+    lags = np.arange(-max_lag, max_lag + 1)
+    if df.empty:
+        return pd.DataFrame(columns=['ticker', 'lag', 'correlation', 'p_value'])
     
-    for ticker in df['ticker'].unique():
-        ticker_df = df[df['ticker'] == ticker].sort_values('date').copy()
-        
-        for lag in range(-max_lag, max_lag + 1):
-            # Volatilität um 'lag' Tage verschieben
-            ticker_df['Volatility_shifted'] = ticker_df['Volatility'].shift(-lag)
-            
-            corr, p = calculate_correlation(ticker_df, 'sentiment_score', 'Volatility_shifted')
-            
-            results.append({
-                'ticker': ticker,
-                'lag': lag,
-                'correlation': corr,
-                'p_value': p
-            })
-    
-    return pd.DataFrame(results)
+    tickers, (x, y) = _pad_by_ticker(df, ['sentiment_score', vol])
+    # Nicht endliche Werte (NaN, ±inf) gelten als fehlend
+    mx, my = np.isfinite(x), np.isfinite(y)
+    
+    # Pro Ticker zentrieren: verringert Auslöschung in den Summen
+    for values, mask in ((x, mx), (y, my)):
+        count = np.maximum(mask.sum(axis=1, keepdims=True), 1)
+        values -= np.where(mask, values, 0.0).sum(axis=1, keepdims=True) / count
+    
+    if method == 'auto':
+        method = 'fft' if len(lags) > 4 * np.log2(max(x.shape[1], 2)) else 'direct'
+    if method == 'fft':
+        sums, constant = _lag_sums_fft(x, y, mx, my, lags)
+    elif method == 'direct':
+        sums, constant = _lag_sums_direct(x, y, mx, my, lags)
+    else:
+        raise ValueError(f"Unbekannte Methode: {method}")
+    
+    n, sx, sy, sxx, syy, sxy = sums
+    with np.errstate(divide='ignore', invalid='ignore'):
+        cov = sxy - sx * sy / n
+        var_x = sxx - sx * sx / n
+        var_y = syy - sy * sy / n
+        r = np.clip(cov / np.sqrt(var_x * var_y), -1.0, 1.0)
+    p = pearson_p_value(r, n)
+    
+    # Gleiche Sonderfälle wie calculate_correlation
+    r = np.where(constant, 0.0, r)
+    p = np.where(constant, 1.0, p)
+    r = np.where(n < 3, np.nan, r)
+    p = np.where(n < 3, np.nan, p)
+    
+    return pd.DataFrame({
+        'ticker': np.repeat(tickers, len(lags)),
+        'lag': np.tile(lags, len(tickers)),
+        'correlation': r.ravel(),
+        'p_value': p.ravel()
+    })
+
+
+def rolling_correlation(df, window=30, min_periods=None, col1='sentiment_score', volatility='Volatility'):
+    """
+    Zeitlich veränderliche Korrelation pro Ticker (Rolling Window über Zeilen).
+    
+    Alle Ticker werden einmal nach Datum sortiert; Σx, Σy, Σx², Σy², Σxy im
+    Fenster ergeben sich aus Differenzen kumulativer Summen. Der Aufwand ist
+    damit O(n) statt O(n·window). Es zählen nur Zeilen, in denen beide Werte
+    vorhanden sind. Fenster mit konstanten Werten ergeben NaN wie bei
+    rolling().corr() in pandas (nicht r=0 wie compute_ticker_stats).
+    
+    Args:
+        df: Kombinierter DataFrame mit 'ticker', 'date', col1 und Volatilität
+        window: Fenstergröße in Datenpunkten
+        min_periods: Mindestanzahl gültiger Paare im Fenster (Standard: window)
+        col1: Erste Spalte (Standard: 'sentiment_score')
+        volatility: Name des Volatilitäts-Schätzers (Standard: Spalte 'Volatility')
+    
+    Returns:
+        Nach Ticker und Datum sortierter DataFrame mit Spalte 'rolling_correlation'
+    """
+    col2 = volatility_column(volatility)
+    min_periods = window if min_periods is None else min_periods
+    sorted_df, group_start = _sort_by_ticker(df, group='ticker', date='date')
+    
+    x = sorted_df[col1].to_numpy(dtype=np.float64)
+    y = sorted_df[col2].to_numpy(dtype=np.float64)
+    # Nicht endliche Werte (NaN, ±inf) gelten als fehlend; sie dürfen nicht in
+    # die kumulativen Summen eingehen, da diese über alle Ticker laufen
+    valid = np.isfinite(x) & np.isfinite(y)
+    
+    # Pro Ticker zentrieren: verringert Auslöschung bei den Summen
+    group_ids = np.cumsum(np.r_[True, group_start[1:] != group_start[:-1]]) - 1
+    counts = np.maximum(np.bincount(group_ids, weights=valid), 1)
+    centered = []
+    for values in (x, y):
+        means = np.bincount(group_ids, weights=np.where(valid, values, 0.0)) / counts
+        centered.append(np.where(valid, values - means[group_ids], 0.0))
+    a, b = centered
+    
+    def window_sums(values):
+        c = np.concatenate(([0.0], np.cumsum(values)))
+        return c[end] - c[start]
+    
+    end = np.arange(len(x)) + 1
+    start = np.maximum(end - window, group_start)
+    n = window_sums(valid.astype(np.float64))
+    sx, sy = window_sums(a), window_sums(b)
+    sxx, syy, sxy = window_sums(a * a), window_sums(b * b), window_sums(a * b)
+    
+    with np.errstate(divide='ignore', invalid='ignore'):
+        var_x = sxx - sx * sx / n
+        var_y = syy - sy * sy / n
+        r = np.clip((sxy - sx * sy / n) / np.sqrt(var_x * var_y), -1.0, 1.0)
+    
+    # Konstante Werte im Fenster (Varianz im Rundungsbereich) ergeben NaN
+    scale_x = np.bincount(group_ids, weights=a * a) / counts
+    scale_y = np.bincount(group_ids, weights=b * b) / counts
+    ok = ((n >= max(min_periods, 2))
+          & (var_x > 1e-10 * n * scale_x[group_ids])
+          & (var_y > 1e-10 * n * scale_y[group_ids]))
+    
+    sorted_df['rolling_correlation'] = np.where(ok, r, np.nan)
+    return sorted_df
 
 
 def print_correlation_summary(results):
@@ -0,0 +1,117 @@
+"""
+Volatilitäts-Schätzer auf Basis von Open/High/Low/Close.
+
+Range-basierte Schätzer nutzen die gesamte Tagesspanne und konvergieren mit
+deutlich weniger Beobachtungen als die Standardabweichung der Schlusskurs-
+Renditen. Alle Schätzer werden in einem Durchlauf über alle Ticker berechnet
+(sortiertes Array mit Gruppen-Offsets, keine Schleife pro Ticker).
+
+Schätzer (tägliche Volatilität, Spalte 'Volatility_<name>'):
+    close         Rolling-Standardabweichung der Tagesrenditen (wie calculate_volatility)
+    parkinson     Parkinson (1980), High/Low
+    garman_klass  Garman-Klass (1980), Open/High/Low/Close
+    yang_zhang    Yang-Zhang (2000), inkl. Übernacht-Rendite
+    ewma          RiskMetrics EWMA der quadrierten Renditen (lambda = 0.94)
+"""
+import numpy as np
+import pandas as pd
+
+try:
+    from analysis.volatility import _sort_by_ticker, _grouped_rolling_std, _grouped_rolling_mean
+except ImportError:
+    from volatility import _sort_by_ticker, _grouped_rolling_std, _grouped_rolling_mean
+
+
+ESTIMATORS = ('close', 'parkinson', 'garman_klass', 'yang_zhang', 'ewma')
+
+
+def volatility_column(name):
+    """Spaltenname eines Schätzers ('Volatility' bleibt die Standardspalte)."""
+    if name is None or name == 'Volatility':
+        return 'Volatility'
+    if name.startswith('Volatility_'):
+        return name
+    if name not in ESTIMATORS:
+        raise ValueError(f"Unbekannter Volatilitäts-Schätzer: {name} (verfügbar: {', '.join(ESTIMATORS)})")
+    return f'Volatility_{name}'
+
+
+def _previous(values, group_start):
+    """Vorheriger Wert innerhalb derselben Gruppe (NaN am Gruppenanfang)."""
+    prev = np.empty_like(values)
+    prev[0] = np.nan
+    prev[1:] = values[:-1]
+    prev[np.arange(len(values)) == group_start] = np.nan
+    return prev
+
+
+def _ewma_volatility(returns, group_start, lam, window):
+    """
+    EWMA-Volatilität (Rekursion sigma² = lam·sigma² + (1-lam)·r²) pro Gruppe.
+
+    Nicht endliche Renditen zählen wie fehlende Werte (sonst bliebe die
+    Varianz ab einem inf dauerhaft unendlich).
+    """
+    group_ids = np.cumsum(np.r_[True, group_start[1:] != group_start[:-1]]) - 1
+    returns = np.where(np.isfinite(returns), returns, np.nan)
+    squared = pd.Series(returns * returns)
+    var = (squared.groupby(group_ids)
+           .ewm(alpha=1 - lam, adjust=False, min_periods=window)
+           .mean()
+           .reset_index(level=0, drop=True)
+           .sort_index())
+    return np.sqrt(var.to_numpy())
+
+
+def volatility_estimators(df, window=20, estimators=ESTIMATORS, ewma_lambda=0.94, dtype=np.float64):
+    """
+    Berechnet mehrere Volatilitäts-Schätzer für alle Ticker in einem Durchlauf.
+    
+    Args:
+        df: DataFrame mit 'Ticker', 'Date', 'Open', 'High', 'Low', 'Close'
+            (für 'close'/'ewma' zusätzlich 'Daily_Return')
+        window: Fenstergröße in Tagen
+        estimators: Namen der Schätzer (siehe ESTIMATORS)
+        ewma_lambda: Abklingfaktor für 'ewma'
+        dtype: Datentyp der Ergebnisspalten
+    
+    Returns:
+        Nach Ticker und Datum sortierter DataFrame mit Spalten 'Volatility_<name>'
+    """
+    sorted_df, group_start = _sort_by_ticker(df)
+    
+    def col(name):
+        return sorted_df[name].to_numpy(dtype=np.float64)
+    
+    results = {}
+    needs_ohlc = {'parkinson', 'garman_klass', 'yang_zhang'} & set(estimators)
+    if needs_ohlc:
+        o, h, l, c = col('Open'), col('High'), col('Low'), col('Close')
+        with np.errstate(divide='ignore', invalid='ignore'):
+            log_hl = np.log(h / l)
+            log_co = np.log(c / o)
+    
+    for name in estimators:
+        volatility_column(name)
+        if name == 'close':
+            sigma = _grouped_rolling_std(col('Daily_Return'), group_start, window)
+        elif name == 'parkinson':
+            var = _grouped_rolling_mean(log_hl ** 2, group_start, window) / (4 * np.log(2))
+            sigma = np.sqrt(var)
+        elif name == 'garman_klass':
+            term = 0.5 * log_hl ** 2 - (2 * np.log(2) - 1) * log_co ** 2
+            sigma = np.sqrt(np.maximum(_grouped_rolling_mean(term, group_start, window), 0.0))
+        elif name == 'yang_zhang':
+            with np.errstate(divide='ignore', invalid='ignore'):
+                overnight = np.log(o / _previous(c, group_start))
+                rs = np.log(h / c) * np.log(h / o) + np.log(l / c) * np.log(l / o)
+            k = 0.34 / (1.34 + (window + 1) / (window - 1))
+            var = (_grouped_rolling_std(overnight, group_start, window) ** 2
+                   + k * _grouped_rolling_std(log_co, group_start, window) ** 2
+                   + (1 - k) * _grouped_rolling_mean(rs, group_start, window))
+            sigma = np.sqrt(np.maximum(var, 0.0))
+        else:
+            sigma = _ewma_volatility(col('Daily_Return'), group_start, ewma_lambda, window)
+        results[f'Volatility_{name}'] = sigma.astype(dtype)
+    
+    return sorted_df.assign(**results)
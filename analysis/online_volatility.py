@@ -0,0 +1,237 @@
+"""
+Inkrementelle Rolling Volatility für laufend aktualisierte Kurse.
+
+Statt bei jedem neuen Kurs rolling(window).std() über die gesamte Historie
+neu zu berechnen, hält OnlineVolatility pro Ticker einen Ringpuffer der
+letzten window Renditen sowie Mittelwert und Quadratsumme (Welford).
+Ein neuer Tick kostet O(1): der älteste Wert wird entfernt, der neue
+hinzugefügt. Nach jedem vollständigen Umlauf des Ringpuffers werden
+Mittelwert und Quadratsumme aus dem Puffer neu berechnet, damit sich
+Rundungsfehler nicht aufsummieren (amortisiert weiterhin O(1)).
+
+Alle Ticker liegen in gemeinsamen numpy-Arrays (eine Zeile pro Ticker),
+damit auch tausende Ticker kompakt im Speicher bleiben und ein Tick für
+viele Ticker gleichzeitig vektorisiert verarbeitet werden kann.
+"""
+import os
+
+import numpy as np
+import pandas as pd
+
+try:
+    from analysis.volatility import _sort_by_ticker
+except ImportError:
+    from volatility import _sort_by_ticker
+
+
+class OnlineVolatility:
+    """
+    Rolling Volatility (Standardabweichung, ddof=1) mit O(1) pro Tick.
+
+    Liefert dieselben Werte wie calculate_volatility(): NaN, solange das
+    Fenster nicht window gültige Renditen enthält.
+    """
+
+    _STATE = ('buffer', 'pos', 'filled', 'n_valid', 'mean', 'm2', 'last_close')
+
+    def __init__(self, window=20, capacity=64):
+        if window < 1:
+            raise ValueError("window muss mindestens 1 sein")
+        self.window = window
+        self.tickers = []
+        self._index = {}
+
+        capacity = max(int(capacity), 1)
+        self.buffer = np.full((capacity, window), np.nan)   # Ringpuffer der Renditen
+        self.pos = np.zeros(capacity, dtype=np.int32)        # nächste Schreibposition
+        self.filled = np.zeros(capacity, dtype=np.int32)     # belegte Plätze (<= window)
+        self.n_valid = np.zeros(capacity, dtype=np.int32)    # gültige (nicht-NaN) Werte
+        self.mean = np.zeros(capacity)
+        self.m2 = np.zeros(capacity)                         # Summe der quadrierten Abweichungen
+        self.last_close = np.full(capacity, np.nan)          # für update_prices()
+
+    def __len__(self):
+        return len(self.tickers)
+
+    def _grow(self, capacity):
+        """Vergrößert alle Zustands-Arrays auf capacity Zeilen."""
+        for name in self._STATE:
+            old = getattr(self, name)
+            fill = np.nan if name in ('buffer', 'last_close') else 0
+            new = np.full((capacity,) + old.shape[1:], fill, dtype=old.dtype)
+            new[:len(old)] = old
+            setattr(self, name, new)
+
+    def _rows(self, tickers):
+        """Zeilenindizes der Ticker; unbekannte Ticker werden angelegt."""
+        rows = np.empty(len(tickers), dtype=np.intp)
+        for i, ticker in enumerate(tickers):
+            row = self._index.get(ticker)
+            if row is None:
+                row = len(self.tickers)
+                self._index[ticker] = row
+                self.tickers.append(ticker)
+            rows[i] = row
+
+        if len(self.tickers) > len(self.mean):
+            self._grow(max(len(self.tickers), 2 * len(self.mean)))
+        if len(np.unique(rows)) != len(rows):
+            raise ValueError("Jeder Ticker darf pro Aufruf nur einmal vorkommen")
+        return rows
+
+    def _add(self, rows, x):
+        n = self.n_valid[rows] + 1
+        delta = x - self.mean[rows]
+        mean = self.mean[rows] + delta / n
+        self.m2[rows] += delta * (x - mean)
+        self.mean[rows] = mean
+        self.n_valid[rows] = n
+
+    def _remove(self, rows, x):
+        n = self.n_valid[rows] - 1
+        delta = x - self.mean[rows]
+        mean = np.where(n > 0, self.mean[rows] - delta / np.maximum(n, 1), 0.0)
+        m2 = np.where(n > 0, self.m2[rows] - delta * (x - mean), 0.0)
+        self.mean[rows] = mean
+        self.m2[rows] = np.maximum(m2, 0.0)
+        self.n_valid[rows] = n
+
+    def _resync(self, rows):
+        """Berechnet Mittelwert und Quadratsumme exakt aus dem Ringpuffer."""
+        values = self.buffer[rows]
+        valid = ~np.isnan(values)
+        n = valid.sum(axis=1)
+        total = np.where(valid, values, 0.0).sum(axis=1)
+        mean = np.divide(total, n, out=np.zeros(len(rows)), where=n > 0)
+        dev = np.where(valid, values - mean[:, None], 0.0)
+        self.n_valid[rows] = n
+        self.mean[rows] = mean
+        self.m2[rows] = (dev * dev).sum(axis=1)
+
+    def _volatility(self, rows):
+        ok = self.n_valid[rows] == self.window
+        with np.errstate(divide='ignore', invalid='ignore'):
+            sigma = np.sqrt(self.m2[rows] / (self.window - 1))
+        return np.where(ok, sigma, np.nan)
+
+    def _update(self, rows, x):
+        # Nicht endliche Renditen (z.B. nach Kurs 0) zählen wie fehlende Werte
+        x = np.where(np.isfinite(x), x, np.nan)
+        slot = self.pos[rows]
+        old = self.buffer[rows, slot]
+
+        # Ältesten Wert entfernen (nur wenn der Puffer voll ist), neuen hinzufügen
+        remove = (self.filled[rows] == self.window) & ~np.isnan(old)
+        self._remove(rows[remove], old[remove])
+        add = ~np.isnan(x)
+        self._add(rows[add], x[add])
+
+        self.buffer[rows, slot] = x
+        self.filled[rows] = np.minimum(self.filled[rows] + 1, self.window)
+        self.pos[rows] = (slot + 1) % self.window
+
+        # Nach einem vollen Umlauf Rundungsfehler zurücksetzen
+        wrapped = rows[self.pos[rows] == 0]
+        if len(wrapped):
+            self._resync(wrapped)
+        return self._volatility(rows)
+
+    def update_returns(self, tickers, returns):
+        """
+        Fügt je Ticker eine neue Rendite hinzu.
+
+        Args:
+            tickers: Liste der Ticker (jeder höchstens einmal)
+            returns: Renditen in derselben Reihenfolge (NaN erlaubt)
+
+        Returns:
+            np.array mit der aktuellen Volatilität je Ticker
+        """
+        rows = self._rows(list(tickers))
+        return self._update(rows, np.asarray(returns, dtype=np.float64))
+
+    def update_prices(self, tickers, closes):
+        """
+        Fügt je Ticker einen neuen Schlusskurs hinzu (Rendite wie pct_change()).
+
+        Returns:
+            np.array mit der aktuellen Volatilität je Ticker
+        """
+        rows = self._rows(list(tickers))
+        closes = np.asarray(closes, dtype=np.float64)
+        previous = self.last_close[rows]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            returns = closes / previous - 1
+        self.last_close[rows] = closes
+        return self._update(rows, returns)
+
+    def update(self, ticker, close):
+        """Neuer Schlusskurs für einen Ticker; gibt die aktuelle Volatilität zurück."""
+        return float(self.update_prices([ticker], [close])[0])
+
+    def volatility(self, tickers=None):
+        """Aktuelle Volatilität als Series (Index: Ticker)."""
+        if tickers is None:
+            tickers = self.tickers
+        rows = np.array([self._index[t] for t in tickers], dtype=np.intp)
+        return pd.Series(self._volatility(rows), index=list(tickers), name='Volatility')
+
+    @classmethod
+    def from_frame(cls, df, window=20, column='Daily_Return'):
+        """
+        Initialisiert den Zustand aus historischen Daten (letzte window Renditen je Ticker).
+
+        Args:
+            df: DataFrame mit 'Ticker', 'Date', Renditespalte und optional 'Close'
+            window: Fenstergröße in Tagen
+            column: Spalte mit den Renditen
+        """
+        sorted_df, group_start = _sort_by_ticker(df)
+        state = cls(window=window, capacity=sorted_df['Ticker'].nunique())
+        rows = state._rows(list(sorted_df['Ticker'].unique()))
+        if not len(sorted_df):
+            return state
+
+        values = sorted_df[column].to_numpy(dtype=np.float64)
+        values = np.where(np.isfinite(values), values, np.nan)
+        group_ids = np.cumsum(np.r_[True, group_start[1:] != group_start[:-1]]) - 1
+        position = np.arange(len(values)) - group_start
+        length = np.bincount(group_ids)
+
+        # Nur die letzten window Werte je Ticker, an ihrer Ringposition
+        keep = position >= length[group_ids] - window
+        state.buffer[rows[group_ids[keep]], position[keep] % window] = values[keep]
+        state.pos[rows] = length % window
+        state.filled[rows] = np.minimum(length, window)
+        if 'Close' in sorted_df.columns:
+            last = np.r_[group_start[1:][group_start[1:] != group_start[:-1]], len(values)] - 1
+            state.last_close[rows] = sorted_df['Close'].to_numpy(dtype=np.float64)[last]
+        state._resync(rows)
+        return state
+
+    def save(self, path):
+        """Speichert den Zustand atomar als .npz-Checkpoint."""
+        n = len(self.tickers)
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp = path + '.tmp'
+        with open(tmp, 'wb') as f:
+            np.savez(
+                f,
+                window=np.array(self.window),
+                tickers=np.array([str(t) for t in self.tickers], dtype=str),
+                **{name: getattr(self, name)[:n] for name in self._STATE}
+            )
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path):
+        """Lädt einen mit save() geschriebenen Checkpoint."""
+        with np.load(path, allow_pickle=False) as data:
+            tickers = [str(t) for t in data['tickers']]
+            state = cls(window=int(data['window']), capacity=max(len(tickers), 1))
+            state._rows(tickers)
+            for name in cls._STATE:
+                getattr(state, name)[:len(tickers)] = data[name]
+        return state
@@ -0,0 +1,229 @@
+"""
+Resampling-Signifikanztests für Korrelationen (Permutation, Moving-Block-Bootstrap).
+
+Der parametrische p-Wert von pearsonr setzt unabhängige Beobachtungen
+voraus. Rolling Volatility ist aber stark autokorreliert (benachbarte Tage
+teilen sich fast das ganze Fenster), der parametrische p-Wert ist dadurch
+zu optimistisch. Hier werden stattdessen
+
+- p-Werte per Permutation von Blöcken (die Autokorrelation innerhalb eines
+  Blocks bleibt erhalten) und
+- Konfidenzintervalle per Moving-Block-Bootstrap der Paare
+
+berechnet. Alle Resamples eines Tickers entstehen als Index-Matrix
+(Resamples × Beobachtungen) und werden vektorisiert ausgewertet; die Ticker
+werden auf einen Prozess-Pool verteilt. Jeder Ticker erhält einen eigenen,
+aus seed und dem Tickersymbol abgeleiteten Zufallsstrom: Ergebnisse sind
+unabhängig von der Anzahl der Worker, der Reihenfolge der Ticker und einer
+Aufteilung des Universums auf Shards reproduzierbar.
+"""
+import os
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+try:
+    from analysis.correlation import pearson_p_value
+except ImportError:
+    from correlation import pearson_p_value
+
+
+# Mindestanzahl Blöcke: längere Blöcke werden gekürzt, da sich aus zu wenigen
+# Blöcken kaum verschiedene Permutationen bilden lassen (p-Wert entartet)
+MIN_BLOCKS = 5
+
+
+def default_block_size(n):
+    """Blocklänge nach Faustregel n^(1/3) (mindestens 1)."""
+    return max(1, int(round(n ** (1 / 3))))
+
+
+def effective_block_size(n, block_size=None):
+    """Blocklänge für n Beobachtungen: höchstens n // MIN_BLOCKS (mindestens 1)."""
+    if block_size is None:
+        block_size = default_block_size(n)
+    return max(1, min(block_size, n // MIN_BLOCKS))
+
+
+def permutation_indices(n, n_resamples, rng, block_size=1):
+    """
+    Index-Matrix (n_resamples × n) zufälliger Permutationen.
+
+    Bei block_size > 1 werden zusammenhängende Blöcke vertauscht, die
+    Reihenfolge innerhalb eines Blocks bleibt erhalten.
+    """
+    # Zufällige Schlüssel sortieren ist deutlich schneller als rng.permuted zeilenweise
+    if block_size <= 1:
+        return np.argsort(rng.random((n_resamples, n)), axis=1)
+
+    n_blocks = -(-n // block_size)
+    order = np.argsort(rng.random((n_resamples, n_blocks)), axis=1).astype(np.int32)
+    index = (order[:, :, None] * block_size + np.arange(block_size, dtype=np.int32)).reshape(n_resamples, -1)
+    # Der letzte Block ist ggf. kürzer: überzählige Positionen entfernen
+    return index[index < n].reshape(n_resamples, n)
+
+
+def block_bootstrap_indices(n, n_resamples, rng, block_size=1):
+    """
+    Index-Matrix (n_resamples × n) für den Moving-Block-Bootstrap.
+
+    Jede Zeile besteht aus zufällig gezogenen, überlappenden Blöcken der
+    Länge block_size (mit Zurücklegen), abgeschnitten auf n.
+    """
+    block_size = min(max(block_size, 1), n)
+    n_blocks = -(-n // block_size)
+    starts = rng.integers(0, n - block_size + 1, size=(n_resamples, n_blocks))
+    index = (starts[:, :, None] + np.arange(block_size)).reshape(n_resamples, -1)
+    return index[:, :n]
+
+
+def _correlations(x, y):
+    """Pearson-Korrelation entlang der letzten Achse."""
+    xc = x - x.mean(axis=-1, keepdims=True)
+    yc = y - y.mean(axis=-1, keepdims=True)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return (xc * yc).sum(axis=-1) / np.sqrt((xc * xc).sum(axis=-1) * (yc * yc).sum(axis=-1))
+
+
+def _block_sums(values, block_size):
+    """Summen über alle Blöcke values[s:s+block_size] (Länge n - block_size + 1)."""
+    c = np.concatenate(([0.0], np.cumsum(values)))
+    return c[block_size:] - c[:-block_size]
+
+
+def _bootstrap_correlations(x, y, starts, block_size):
+    """
+    Korrelationen für Moving-Block-Bootstrap-Stichproben aus Blocksummen.
+
+    Statt jede Stichprobe (n Werte) zu indizieren, werden die Summen Σx, Σy,
+    Σx², Σy², Σxy aus vorberechneten Blocksummen zusammengesetzt: Aufwand
+    O(Stichproben × Blöcke) statt O(Stichproben × n). Der letzte Block wird
+    wie in block_bootstrap_indices auf n gekürzt.
+    """
+    n = len(x)
+    last = n - (starts.shape[1] - 1) * block_size
+    products = (x, y, x * x, y * y, x * y)
+    sums = []
+    for values in products:
+        full = _block_sums(values, block_size)
+        partial = _block_sums(values, last)
+        sums.append(full[starts[:, :-1]].sum(axis=1) + partial[starts[:, -1]])
+    sx, sy, sxx, syy, sxy = sums
+    with np.errstate(divide='ignore', invalid='ignore'):
+        cov = sxy - sx * sy / n
+        return cov / np.sqrt((sxx - sx * sx / n) * (syy - sy * sy / n))
+
+
+def resample_correlation(x, y, n_resamples=10000, block_size=None, confidence=0.95,
+                         seed=None, chunk_size=1000):
+    """
+    Korrelation mit Permutations-p-Wert und Bootstrap-Konfidenzintervall.
+
+    Args:
+        x, y: Gleich lange Arrays ohne NaN, zeitlich sortiert
+        n_resamples: Anzahl Permutationen bzw. Bootstrap-Stichproben
+        block_size: Blocklänge (Standard: n^(1/3); 1 = klassische Permutation/Bootstrap);
+                    höchstens n // MIN_BLOCKS
+        confidence: Niveau des Konfidenzintervalls
+        seed: Seed bzw. np.random.SeedSequence für Reproduzierbarkeit
+        chunk_size: Resamples pro Block im Speicher
+
+    Returns:
+        Dictionary mit n, correlation, p_value (parametrisch), p_permutation,
+        ci_low, ci_high
+    """
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    n = len(x)
+    result = {'n': n, 'correlation': np.nan, 'p_value': np.nan,
+              'p_permutation': np.nan, 'ci_low': np.nan, 'ci_high': np.nan}
+    if n < 3:
+        return result
+    if np.ptp(x) == 0 or np.ptp(y) == 0:
+        # Wie calculate_correlation: keine Korrelation möglich
+        result.update(correlation=0.0, p_value=1.0, p_permutation=1.0)
+        return result
+
+    block_size = effective_block_size(n, block_size)
+    rng = np.random.default_rng(seed)
+
+    # Standardisieren: Permutationen ändern Mittelwert und Norm nicht,
+    # die Korrelation ist dann ein reines Skalarprodukt
+    xs = (x - x.mean()) / np.linalg.norm(x - x.mean())
+    ys = (y - y.mean()) / np.linalg.norm(y - y.mean())
+    # Zentrieren verbessert die Genauigkeit der Summen im Bootstrap
+    xc, yc = x - x.mean(), y - y.mean()
+    r = float(np.clip(xs @ ys, -1.0, 1.0))
+    n_blocks = -(-n // block_size)
+
+    exceed = 0
+    boot = np.empty(n_resamples)
+    for start in range(0, n_resamples, chunk_size):
+        size = min(chunk_size, n_resamples - start)
+
+        # Nullverteilung: y blockweise permutieren, x bleibt fest
+        perm = permutation_indices(n, size, rng, block_size)
+        exceed += int((np.abs(ys[perm] @ xs) >= abs(r) - 1e-12).sum())
+
+        # Bootstrap: Paare (x, y) blockweise mit Zurücklegen ziehen
+        starts = rng.integers(0, n - block_size + 1, size=(size, n_blocks))
+        boot[start:start + size] = _bootstrap_correlations(xc, yc, starts, block_size)
+
+    alpha = (1 - confidence) / 2
+    low, high = np.nanquantile(boot, [alpha, 1 - alpha])
+    result.update(
+        correlation=r,
+        p_value=float(pearson_p_value(r, n)),
+        p_permutation=(exceed + 1) / (n_resamples + 1),
+        ci_low=float(low),
+        ci_high=float(high),
+    )
+    return result
+
+
+def _resample_task(args):
+    ticker, x, y, kwargs = args
+    return {'ticker': ticker, **resample_correlation(x, y, **kwargs)}
+
+
+def resample_by_ticker(df, col1='sentiment_score', col2='Volatility', n_resamples=10000,
+                       block_size=None, confidence=0.95, seed=42, n_workers=None):
+    """
+    Resampling-Signifikanztest pro Ticker, parallel über einen Prozess-Pool.
+
+    Args:
+        df: Kombinierter DataFrame mit 'ticker', 'date', col1, col2
+        col1, col2: Zu korrelierende Spalten
+        n_resamples: Anzahl Resamples pro Ticker
+        block_size: Blocklänge (Standard: n^(1/3) je Ticker; höchstens n // MIN_BLOCKS)
+        confidence: Niveau des Konfidenzintervalls
+        seed: Seed für reproduzierbare Ergebnisse (None: zufällig, aber innerhalb
+              des Aufrufs wie ein fester Seed behandelt)
+        n_workers: Anzahl Prozesse (Standard: Anzahl CPU-Kerne; 1 = ohne Pool)
+
+    Returns:
+        DataFrame mit ticker, n, correlation, p_value, p_permutation, ci_low, ci_high
+    """
+    # Ohne Seed einmal Entropie ziehen, damit alle Ticker-Ströme daraus abgeleitet werden
+    entropy = np.random.SeedSequence(seed).entropy
+    tasks = []
+    for ticker, ticker_df in df.groupby('ticker', sort=False):
+        # Eigener Zufallsstrom pro Ticker (aus seed und Symbol), unabhängig von
+        # Worker-Anzahl, Reihenfolge und Sharding
+        ticker_seed = np.random.SeedSequence([entropy, zlib.crc32(str(ticker).encode('utf-8'))])
+        ticker_df = ticker_df.sort_values('date')[[col1, col2]].dropna()
+        kwargs = {'n_resamples': n_resamples, 'block_size': block_size,
+                  'confidence': confidence, 'seed': ticker_seed}
+        tasks.append((ticker, ticker_df[col1].to_numpy(), ticker_df[col2].to_numpy(), kwargs))
+
+    n_workers = min(n_workers or os.cpu_count() or 1, max(len(tasks), 1))
+    if n_workers <= 1:
+        results = [_resample_task(task) for task in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=n_workers) as executor:
+            results = list(executor.map(_resample_task, tasks))
+
+    columns = ['ticker', 'n', 'correlation', 'p_value', 'p_permutation', 'ci_low', 'ci_high']
+    return pd.DataFrame(results, columns=columns)
@@ -18,6 +18,112 @@ def calculate_volatility(df, window=20):
     return df
 
 
+def _sort_by_ticker(df, group='Ticker', date='Date'):
+    """
+    Sortiert nach Ticker (Reihenfolge des ersten Auftretens) und Datum.
+    
+    Returns:
+        (sortierter DataFrame, Startposition der Gruppe pro Zeile)
+    """
+    codes, _ = pd.factorize(df[group])
+    # Als UTC ohne Zeitzone: datetime64 statt Objekt-Array (schnelles Sortieren)
+    dates = pd.to_datetime(df[date], utc=True).dt.tz_localize(None).to_numpy()
+    order = np.lexsort((dates, codes))
+    sorted_df = df.iloc[order].reset_index(drop=True)
+    
+    # Startposition der jeweiligen Ticker-Gruppe für jede Zeile
+    sorted_codes = codes[order]
+    is_start = np.ones(len(sorted_codes), dtype=bool)
+    is_start[1:] = sorted_codes[1:] != sorted_codes[:-1]
+    group_start = np.maximum.accumulate(np.where(is_start, np.arange(len(sorted_codes)), 0))
+    return sorted_df, group_start
+
+
+def _grouped_rolling_std(values, group_start, window):
+    """
+    Rolling-Standardabweichung (ddof=1) pro Gruppe über kumulative Summen.
+    
+    Entspricht rolling(window).std() je Gruppe: Das Ergebnis ist NaN, solange
+    das Fenster nicht window gültige Werte derselben Gruppe enthält. Nicht
+    endliche Werte (NaN, ±inf) gelten als ungültig; sie dürfen nicht in die
+    kumulativen Summen eingehen, da diese über alle Gruppen laufen.
+    """
+    n = len(values)
+    valid = np.isfinite(values)
+    
+    # Pro Gruppe zentrieren: verringert Auslöschung bei den Summen
+    group_ids = np.cumsum(np.r_[True, group_start[1:] != group_start[:-1]]) - 1
+    sums = np.bincount(group_ids, weights=np.where(valid, values, 0.0))
+    counts = np.bincount(group_ids, weights=valid)
+    means = np.divide(sums, counts, out=np.zeros_like(sums), where=counts > 0)
+    centered = np.where(valid, values - means[group_ids], 0.0)
+    
+    c1 = np.concatenate(([0.0], np.cumsum(centered)))
+    c2 = np.concatenate(([0.0], np.cumsum(centered * centered)))
+    cn = np.concatenate(([0], np.cumsum(valid)))
+    
+    end = np.arange(n) + 1
+    start = end - window
+    ok = start >= group_start
+    start = np.where(ok, start, 0)
+    
+    count = cn[end] - cn[start]
+    s1 = c1[end] - c1[start]
+    s2 = c2[end] - c2[start]
+    ok &= count == window
+    
+    with np.errstate(invalid='ignore', divide='ignore'):
+        var = (s2 - s1 * s1 / window) / (window - 1)
+    std = np.sqrt(np.maximum(var, 0.0))
+    return np.where(ok, std, np.nan)
+
+
+def _grouped_rolling_mean(values, group_start, window):
+    """
+    Rolling-Mittelwert pro Gruppe über kumulative Summen.
+    
+    NaN, solange das Fenster nicht window gültige (endliche) Werte derselben
+    Gruppe enthält.
+    """
+    n = len(values)
+    valid = np.isfinite(values)
+    c1 = np.concatenate(([0.0], np.cumsum(np.where(valid, values, 0.0))))
+    cn = np.concatenate(([0], np.cumsum(valid)))
+    
+    end = np.arange(n) + 1
+    start = end - window
+    ok = start >= group_start
+    start = np.where(ok, start, 0)
+    ok &= (cn[end] - cn[start]) == window
+    return np.where(ok, (c1[end] - c1[start]) / window, np.nan)
+
+
+def rolling_volatility(df, windows=(5, 10, 20, 60), column='Daily_Return', dtype=np.float32):
+    """
+    Berechnet Rolling Volatility für mehrere Fenster in einem Durchlauf.
+    
+    Statt jeden Ticker einzeln zu filtern, wird der DataFrame einmal nach
+    Ticker und Datum sortiert; alle Fenster werden über kumulative Summen
+    auf einem zusammenhängenden Array berechnet (O(Zeilen) je Fenster).
+    
+    Args:
+        df: DataFrame mit 'Ticker', 'Date' und Renditespalte
+        windows: Fenstergrößen in Tagen
+        column: Spalte mit den Renditen
+        dtype: Datentyp der Ergebnisspalten (Standard: float32)
+    
+    Returns:
+        Nach Ticker und Datum sortierter DataFrame mit Spalten 'Volatility_<window>'
+    """
+    sorted_df, group_start = _sort_by_ticker(df)
+    values = sorted_df[column].to_numpy(dtype=np.float64)
+    
+    for window in windows:
+        sorted_df[f'Volatility_{window}'] = _grouped_rolling_std(values, group_start, window).astype(dtype)
+    
+    return sorted_df
+
+
 def calculate_volatility_by_ticker(df, window=20):
     """
     Berechnet Volatility für jeden Ticker separat.
@@ -29,15 +135,8 @@ def calculate_volatility_by_ticker(df, window=20):
     Returns:
         DataFrame mit Volatility pro Ticker
     """
-    result = []
-    
-    for ticker in df['Ticker'].unique():
-        ticker_df = df[df['Ticker'] == ticker].copy()
-        ticker_df = ticker_df.sort_values('Date')
-        ticker_df['Volatility'] = ticker_df['Daily_Return'].rolling(window=window).std()
-        result.append(ticker_df)
-    
-    return pd.concat(result, ignore_index=True)
+    result = rolling_volatility(df, windows=(window,), dtype=np.float64)
+    return result.rename(columns={f'Volatility_{window}': 'Volatility'})
 
 
 def calculate_weekly_volatility(df):
@@ -0,0 +1,89 @@
+"""
+Benchmark: Inferenz-Backends (torch, torch-int8, onnx, onnx-int8).
+
+Misst pro Backend Ladezeit, Durchsatz und Spitzen-Speicher (jeweils in einem
+eigenen Prozess) sowie die Übereinstimmung mit den fp32-Scores auf dem
+Fixture-Set aus sentiment.backends.
+
+Aufruf (aus dem Projektverzeichnis):
+    python benchmarks/bench_backends.py [--n 1000] [--model ProsusAI/finbert]
+"""
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import pandas as pd
+
+from sentiment.backends import BACKENDS, check_agreement
+from sentiment.finbert_analyzer import FinBertAnalyzer, MODEL_NAME, analyze_dataframe
+
+
+def run_single(backend, model, n):
+    """Misst ein Backend im aktuellen Prozess und gibt das Ergebnis als JSON aus."""
+    from bench_batching import make_headlines
+
+    df = pd.DataFrame({'title': make_headlines(n)})
+    analyzer = FinBertAnalyzer(model_name=model, device='cpu', backend=backend)
+
+    t0 = time.perf_counter()
+    analyzer.load()
+    load_s = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    analyze_dataframe(df, analyzer=analyzer, use_cache=False, batching='bucket')
+    score_s = time.perf_counter() - t0
+
+    reference = FinBertAnalyzer(model_name=model, device='cpu', backend='torch')
+    agreement = check_agreement(analyzer, reference)
+
+    # ru_maxrss ist unter Linux in KiB
+    peak_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    print(json.dumps({
+        'backend': backend,
+        'load_s': load_s,
+        'articles_per_s': n / score_s,
+        'peak_rss_mb': peak_mb,
+        'max_abs_score_diff': agreement['max_abs_score_diff'],
+        'label_agreement': agreement['label_agreement'],
+        'agreement_ok': agreement['passed'],
+    }))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--n', type=int, default=1000)
+    parser.add_argument('--backends', nargs='+', default=list(BACKENDS))
+    parser.add_argument('--model', default=MODEL_NAME)
+    parser.add_argument('--single', default=None, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.single:
+        run_single(args.single, args.model, args.n)
+        return
+
+    rows = []
+    for backend in args.backends:
+        out = subprocess.run(
+            [sys.executable, os.path.abspath(__file__), '--single', backend,
+             '--model', args.model, '--n', str(args.n)],
+            cwd=ROOT, capture_output=True, text=True
+        )
+        if out.returncode != 0:
+            print(f"✗ {backend}: {out.stderr.strip().splitlines()[-1]}")
+            continue
+        rows.append(json.loads(out.stdout.strip().splitlines()[-1]))
+
+    print("\n=== Backends ===")
+    print(pd.DataFrame(rows).round(4).to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
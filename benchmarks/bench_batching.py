@@ -0,0 +1,76 @@
+"""
+Benchmark: Feste Batches vs. längen-sortierte Batches (Token-Budget).
+
+Erzeugt synthetische Überschriften mit gemischter Länge (kurze Google-News-
+Titel, lange Finnhub-Headlines) und misst Padding-Anteil und Durchsatz.
+
+Aufruf (aus dem Projektverzeichnis):
+    python benchmarks/bench_batching.py [--n 2000] [--model ProsusAI/finbert]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import pandas as pd
+
+from sentiment.finbert_analyzer import (
+    FinBertAnalyzer, MODEL_NAME, analyze_dataframe, make_token_batches, padding_waste
+)
+
+WORDS = ("apple stock rises falls market shares record revenue profit recession fears "
+         "company announces quarterly dividend analysts expect earnings guidance tesla "
+         "nvidia microsoft beats misses estimates investors outlook growth").split()
+
+
+def make_headlines(n, seed=42):
+    """Überwiegend kurze Titel, dazwischen einzelne sehr lange."""
+    rng = random.Random(seed)
+    headlines = []
+    for _ in range(n):
+        length = rng.randint(40, 80) if rng.random() < 0.1 else rng.randint(5, 14)
+        headlines.append(' '.join(rng.choice(WORDS) for _ in range(length)))
+    return headlines
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--n', type=int, default=2000)
+    parser.add_argument('--batch-size', type=int, default=16)
+    parser.add_argument('--token-budget', type=int, default=4096)
+    parser.add_argument('--model', default=MODEL_NAME)
+    args = parser.parse_args()
+
+    analyzer = FinBertAnalyzer(model_name=args.model).load()
+    texts = make_headlines(args.n)
+    lengths = analyzer.token_lengths(texts)
+
+    fixed = [list(range(i, min(i + args.batch_size, len(texts))))
+             for i in range(0, len(texts), args.batch_size)]
+    bucket = make_token_batches(lengths, args.token_budget)
+
+    print("=== Padding-Anteil ===")
+    print(f"  fest   ({len(fixed):5d} Batches): {padding_waste(lengths, fixed):6.1%}")
+    print(f"  bucket ({len(bucket):5d} Batches): {padding_waste(lengths, bucket):6.1%}")
+
+    df = pd.DataFrame({'title': texts})
+    print("\n=== Durchsatz ===")
+    results = {}
+    for mode in ('fixed', 'bucket'):
+        t0 = time.perf_counter()
+        results[mode] = analyze_dataframe(df, batch_size=args.batch_size, analyzer=analyzer,
+                                          use_cache=False, batching=mode,
+                                          token_budget=args.token_budget)
+        elapsed = time.perf_counter() - t0
+        print(f"  {mode:6s}: {elapsed:7.2f} s ({len(texts) / elapsed:8.1f} Texte/s)")
+
+    diff = (results['fixed']['sentiment_score'] - results['bucket']['sentiment_score']).abs().max()
+    print(f"\nMax. Score-Abweichung fixed vs. bucket: {diff:.2e}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""
+Benchmark: Volatilitäts-Schätzer (Parkinson, Garman-Klass, Yang-Zhang, EWMA).
+
+Vergleicht volatility_estimators() (ein Durchlauf über alle Ticker) mit einer
+Referenz per groupby/rolling pro Ticker und prüft die Abweichung.
+
+Aufruf (aus dem Projektverzeichnis):
+    python benchmarks/bench_estimators.py [--tickers 500] [--years 10]
+"""
+import argparse
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import numpy as np
+import pandas as pd
+
+from analysis.estimators import ESTIMATORS, volatility_estimators
+from synthetic import make_prices
+
+
+def reference_estimators(df, window=20, ewma_lambda=0.94):
+    """Referenz: Formeln direkt mit pandas pro Ticker."""
+    k = 0.34 / (1.34 + (window + 1) / (window - 1))
+    result = []
+    for ticker in df['Ticker'].unique():
+        t = df[df['Ticker'] == ticker].sort_values('Date').copy()
+        log_hl = np.log(t['High'] / t['Low'])
+        log_co = np.log(t['Close'] / t['Open'])
+        overnight = np.log(t['Open'] / t['Close'].shift(1))
+        rs = (np.log(t['High'] / t['Close']) * np.log(t['High'] / t['Open'])
+              + np.log(t['Low'] / t['Close']) * np.log(t['Low'] / t['Open']))
+        
+        t['Volatility_close'] = t['Daily_Return'].rolling(window).std()
+        t['Volatility_parkinson'] = np.sqrt((log_hl ** 2).rolling(window).mean() / (4 * np.log(2)))
+        gk = 0.5 * log_hl ** 2 - (2 * np.log(2) - 1) * log_co ** 2
+        t['Volatility_garman_klass'] = np.sqrt(gk.rolling(window).mean().clip(lower=0))
+        yz = (overnight.rolling(window).var() + k * log_co.rolling(window).var()
+              + (1 - k) * rs.rolling(window).mean())
+        t['Volatility_yang_zhang'] = np.sqrt(yz.clip(lower=0))
+        t['Volatility_ewma'] = np.sqrt((t['Daily_Return'] ** 2)
+                                       .ewm(alpha=1 - ewma_lambda, adjust=False, min_periods=window)
+                                       .mean())
+        result.append(t)
+    return pd.concat(result, ignore_index=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--tickers', type=int, default=500)
+    parser.add_argument('--years', type=int, default=10)
+    parser.add_argument('--window', type=int, default=20)
+    args = parser.parse_args()
+
+    df = make_prices(args.tickers, args.years * 252)
+    print(f"=== {args.tickers} Ticker × {args.years} Jahre ({len(df):,} Zeilen) ===")
+
+    t0 = time.perf_counter()
+    reference = reference_estimators(df, args.window)
+    t_reference = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    result = volatility_estimators(df, window=args.window)
+    t_engine = time.perf_counter() - t0
+
+    print(f"  Referenz pro Ticker: {t_reference:7.2f}s")
+    print(f"  Ein Durchlauf:       {t_engine:7.2f}s ({t_reference / t_engine:.0f}x)")
+
+    for name in ESTIMATORS:
+        col = f'Volatility_{name}'
+        new = result[col].to_numpy(dtype=np.float64)
+        ref = reference[col].to_numpy(dtype=np.float64)
+        same_nan = np.array_equal(np.isnan(new), np.isnan(ref))
+        diff = np.nanmax(np.abs(new - ref) / np.maximum(np.abs(ref), 1e-12))
+        print(f"  {name:13s}: max. rel. Abweichung {diff:.1e}, NaN-Muster gleich: {same_nan}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""
+Benchmark: Gepoolter HTTP-Client mit bedingten Anfragen gegen einen lokalen Stub-Server.
+
+Der Stub-Server (tests/http_stub.py, auch von den Tests verwendet) liefert
+einen RSS-Feed mit ETag/Last-Modified (optional gzip) und zählt Verbindungen,
+Antworten (200/304) und übertragene Body-Bytes.
+Verglichen werden einzelne requests.get-Aufrufe (neue Verbindung, voller Feed,
+Parsen bei jedem Abruf) mit dem HttpClient.
+
+Aufruf (aus dem Projektverzeichnis):
+    python benchmarks/bench_http.py [--requests 50] [--items 50]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, 'tests'))
+
+import feedparser
+import requests
+
+from data.http_client import HttpClient
+from data.news_fetcher import _parse_google_feed
+from http_stub import StubServer, make_feed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--requests', type=int, default=50)
+    parser.add_argument('--items', type=int, default=50)
+    args = parser.parse_args()
+
+    with StubServer(make_feed(args.items)) as stub:
+        # Vorher: neue Verbindung pro Abruf, immer voller Feed, immer parsen
+        t0 = time.perf_counter()
+        for _ in range(args.requests):
+            response = requests.get(stub.url, headers={'Accept-Encoding': 'identity'}, timeout=10)
+            feedparser.parse(response.content)
+        before = dict(stub.counters, seconds=time.perf_counter() - t0)
+
+        # Nachher: gepoolter Client mit bedingten Anfragen
+        stub.reset()
+        with tempfile.TemporaryDirectory() as tmp:
+            client = HttpClient(meta_path=os.path.join(tmp, 'meta.sqlite'))
+            t0 = time.perf_counter()
+            for _ in range(args.requests):
+                entries = client.get_cached(stub.url, _parse_google_feed)
+            after = dict(stub.counters, seconds=time.perf_counter() - t0)
+            client.close()
+
+    print(f"=== {args.requests} Abrufe eines Feeds mit {args.items} Einträgen ({len(entries)} geparst) ===")
+    print(f"{'':12s} {'Verbindungen':>12s} {'200':>6s} {'304':>6s} {'Bytes':>10s} {'Zeit':>8s}")
+    for name, c in (('requests', before), ('HttpClient', after)):
+        print(f"{name:12s} {c['connections']:12d} {c['ok']:6d} {c['not_modified']:6d} "
+              f"{c['bytes']:10d} {c['seconds']:7.2f}s")
+
+
+if __name__ == "__main__":
+    main()
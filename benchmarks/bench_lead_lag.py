@@ -0,0 +1,85 @@
+"""
+Benchmark: Lead-Lag-Analyse (Schleife pro Ticker/Lag vs. vektorisiert/FFT).
+
+Vergleicht die bisherige Umsetzung (shift + dropna + pearsonr je Ticker und
+Lag) mit lead_lag_analysis() in den Varianten 'direct' und 'fft' und prüft
+die Abweichung von Korrelation und p-Wert.
+
+Aufruf (aus dem Projektverzeichnis):
+    python benchmarks/bench_lead_lag.py [--tickers 200] [--days 750] [--max-lag 5 30]
+"""
+import argparse
+import os
+import sys
+import time
+import warnings
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import numpy as np
+import pandas as pd
+
+from analysis.correlation import calculate_correlation, lead_lag_analysis
+
+
+def make_merged(n_tickers, n_days, seed=42):
+    """Synthetischer kombinierter DataFrame mit Lücken (fehlende Handelstage/Werte)."""
+    rng = np.random.default_rng(seed)
+    dates = pd.bdate_range('2020-01-01', periods=n_days).date
+    sentiment = rng.uniform(-1, 1, size=(n_tickers, n_days))
+    volatility = 0.02 + 0.005 * np.roll(sentiment, 2, axis=1) + rng.normal(0, 0.005, size=sentiment.shape)
+    sentiment[rng.random(sentiment.shape) < 0.05] = np.nan
+    df = pd.DataFrame({
+        'ticker': np.repeat([f"T{i:04d}" for i in range(n_tickers)], n_days),
+        'date': np.tile(dates, n_tickers),
+        'sentiment_score': sentiment.ravel(),
+        'Volatility': volatility.ravel(),
+    })
+    # Nicht jeder Ticker hat an jedem Tag Nachrichten
+    return df[rng.random(len(df)) < 0.8].reset_index(drop=True)
+
+
+def legacy_lead_lag(df, max_lag=5):
+    """Bisherige Umsetzung: (2·max_lag+1) × Ticker einzelne pandas-Aufrufe."""
+    results = []
+    for ticker in df['ticker'].unique():
+        ticker_df = df[df['ticker'] == ticker].sort_values('date').copy()
+        for lag in range(-max_lag, max_lag + 1):
+            ticker_df['Volatility_shifted'] = ticker_df['Volatility'].shift(-lag)
+            corr, p = calculate_correlation(ticker_df, 'sentiment_score', 'Volatility_shifted')
+            results.append({'ticker': ticker, 'lag': lag, 'correlation': corr, 'p_value': p})
+    return pd.DataFrame(results)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--tickers', type=int, default=200)
+    parser.add_argument('--days', type=int, default=750)
+    parser.add_argument('--max-lag', type=int, nargs='+', default=[5, 30])
+    args = parser.parse_args()
+
+    df = make_merged(args.tickers, args.days)
+    print(f"=== {args.tickers} Ticker × {args.days} Tage ({len(df):,} Zeilen) ===")
+
+    for max_lag in args.max_lag:
+        print(f"\nmax_lag = {max_lag}:")
+        t0 = time.perf_counter()
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore')
+            reference = legacy_lead_lag(df, max_lag)
+        t_legacy = time.perf_counter() - t0
+        print(f"  Schleife:   {t_legacy:7.2f}s")
+
+        for method in ('direct', 'fft'):
+            t0 = time.perf_counter()
+            result = lead_lag_analysis(df, max_lag, method=method)
+            elapsed = time.perf_counter() - t0
+            d_corr = np.nanmax(np.abs(result['correlation'] - reference['correlation']))
+            d_p = np.nanmax(np.abs(result['p_value'] - reference['p_value']))
+            print(f"  {method:10s}: {elapsed:7.3f}s ({t_legacy / elapsed:.0f}x), "
+                  f"max. Abweichung r {d_corr:.1e}, p {d_p:.1e}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""
+Benchmark: Fast-Duplikat-Clustering (MinHash/LSH) auf großen Archiven.
+
+Erzeugt synthetische Überschriften mit syndizierten Varianten (Publisher-
+Suffix, leichte Umformulierung) und misst Laufzeit und Reduktion für
+wachsende Archivgrößen. Annähernd lineares Wachstum der Laufzeit zeigt,
+dass kein paarweiser Vergleich stattfindet.
+
+Aufruf (aus dem Projektverzeichnis):
+    python benchmarks/bench_near_duplicates.py [--sizes 10000 50000 200000]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import pandas as pd
+
+from sentiment.near_duplicates import cluster_headlines
+
+SUBJECTS = ["stock", "shares", "the company", "investors", "analysts", "revenue", "profit"]
+VERBS = ["rises", "falls", "jumps", "slides", "surges", "drops", "beats estimates", "misses estimates"]
+REASONS = ["after earnings", "on guidance", "amid recession fears", "after product launch",
+           "on analyst upgrade", "after CEO comments", "on merger news", "amid rate worries"]
+SUFFIXES = ["", " - Reuters", " - Bloomberg", " | Yahoo Finance", " - MarketWatch", " - CNBC"]
+
+
+def make_archive(n, n_tickers=200, n_days=365, seed=42):
+    """Synthetisches Archiv: ca. 40% der Zeilen sind syndizierte Varianten."""
+    rng = random.Random(seed)
+    start = pd.Timestamp('2025-01-01')
+    rows = []
+    while len(rows) < n:
+        ticker = f"T{rng.randrange(n_tickers):03d}"
+        ts = start + pd.Timedelta(minutes=rng.randrange(n_days * 24 * 60))
+        base = (f"{ticker} {rng.choice(SUBJECTS)} {rng.choice(VERBS)} {rng.choice(REASONS)} "
+                f"in {rng.choice(['Q1', 'Q2', 'Q3', 'Q4'])} {rng.randrange(1000)}")
+        for _ in range(1 + (rng.random() < 0.3) * rng.randint(1, 3)):
+            rows.append({'ticker': ticker, 'timestamp': ts, 'title': base + rng.choice(SUFFIXES)})
+    return pd.DataFrame(rows[:n])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10_000, 50_000, 200_000])
+    args = parser.parse_args()
+
+    print(f"{'Zeilen':>8s} {'Cluster':>8s} {'Reduktion':>10s} {'Zeit':>8s} {'µs/Zeile':>9s}")
+    for n in args.sizes:
+        df = make_archive(n)
+        t0 = time.perf_counter()
+        clustered = cluster_headlines(df)
+        elapsed = time.perf_counter() - t0
+        n_clusters = clustered['cluster_id'].nunique()
+        print(f"{n:8d} {n_clusters:8d} {1 - n_clusters / n:10.1%} {elapsed:7.2f}s {elapsed / n * 1e6:9.1f}")
+
+
+if __name__ == "__main__":
+    main()
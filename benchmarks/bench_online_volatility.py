@@ -0,0 +1,81 @@
+"""
+Benchmark: Inkrementelle Volatilität (OnlineVolatility) vs. Neuberechnung.
+
+Simuliert laufende Kurs-Updates: Nach einer Historie von --history Tagen
+kommen --ticks neue Kurse je Ticker hinzu. Verglichen wird die komplette
+Neuberechnung von rolling(window).std() pro Tick mit dem O(1)-Update.
+
+Aufruf (aus dem Projektverzeichnis):
+    python benchmarks/bench_online_volatility.py [--tickers 2000] [--history 500] [--ticks 50]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import numpy as np
+
+from analysis.online_volatility import OnlineVolatility
+from analysis.volatility import calculate_volatility_by_ticker
+from synthetic import make_prices
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--tickers', type=int, default=2000)
+    parser.add_argument('--history', type=int, default=500)
+    parser.add_argument('--ticks', type=int, default=50)
+    parser.add_argument('--window', type=int, default=20)
+    args = parser.parse_args()
+
+    df = make_prices(args.tickers, args.history + args.ticks)
+    df['Daily_Return'] = df.groupby('Ticker')['Close'].pct_change()
+    dates = np.sort(df['Date'].unique())
+    history = df[df['Date'] < dates[args.history]]
+    wide = df.pivot(index='Date', columns='Ticker', values='Close').iloc[args.history:]
+    tickers = list(wide.columns)
+    print(f"=== {args.tickers} Ticker, Historie {args.history} Tage, {args.ticks} Ticks ===")
+
+    # Neuberechnung: nur einige Ticks messen und hochrechnen
+    n_full = min(args.ticks, 3)
+    t0 = time.perf_counter()
+    for i in range(n_full):
+        current = df[df['Date'] <= wide.index[i]]
+        calculate_volatility_by_ticker(current, window=args.window)
+    t_full = (time.perf_counter() - t0) / n_full
+
+    t0 = time.perf_counter()
+    state = OnlineVolatility.from_frame(history, window=args.window)
+    t_warm = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    for _, row in wide.iterrows():
+        latest = state.update_prices(tickers, row.to_numpy())
+    t_online = (time.perf_counter() - t0) / args.ticks
+
+    reference = calculate_volatility_by_ticker(df, window=args.window)
+    reference = reference[reference['Date'] == wide.index[-1]].set_index('Ticker')['Volatility']
+    diff = np.nanmax(np.abs(latest - reference.loc[tickers].to_numpy()) / reference.loc[tickers].to_numpy())
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'online_volatility.npz')
+        t0 = time.perf_counter()
+        state.save(path)
+        OnlineVolatility.load(path)
+        t_checkpoint = time.perf_counter() - t0
+        size = os.path.getsize(path)
+
+    print(f"  Neuberechnung pro Tick:  {t_full * 1000:9.2f} ms")
+    print(f"  Online-Update pro Tick:  {t_online * 1000:9.2f} ms ({t_full / t_online:.0f}x)")
+    print(f"  Initialisierung:         {t_warm * 1000:9.2f} ms")
+    print(f"  Checkpoint speichern+laden: {t_checkpoint * 1000:6.2f} ms ({size / 1024:.0f} KiB)")
+    print(f"  Max. rel. Abweichung zum letzten Tick: {diff:.1e}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""
+Benchmark: Serielle vs. überlappende (pipelined) Inferenz.
+
+Misst die Zeiten pro Stufe (Tokenisierung, Modell) und die erreichte
+Überlappung des Hintergrund-Tokenizers.
+
+Aufruf (aus dem Projektverzeichnis):
+    python benchmarks/bench_pipeline.py [--n 2000] [--model ProsusAI/finbert]
+"""
+import argparse
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import numpy as np
+
+from bench_batching import make_headlines
+from sentiment.finbert_analyzer import (
+    FinBertAnalyzer, MODEL_NAME, _iter_batch_probs, _iter_batch_probs_pipelined
+)
+
+
+def run(results):
+    """Sammelt alle Batch-Ergebnisse in einem Array."""
+    return np.concatenate([probs for probs, error in results])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--n', type=int, default=2000)
+    parser.add_argument('--batch-size', type=int, default=32)
+    parser.add_argument('--model', default=MODEL_NAME)
+    args = parser.parse_args()
+
+    analyzer = FinBertAnalyzer(model_name=args.model).load()
+    texts = make_headlines(args.n)
+    batches = [texts[i:i + args.batch_size] for i in range(0, len(texts), args.batch_size)]
+
+    # Serielle Stufenzeiten
+    t_tok = t_fwd = 0.0
+    t0 = time.perf_counter()
+    for batch in batches:
+        t1 = time.perf_counter()
+        inputs = analyzer.encode(batch)
+        t2 = time.perf_counter()
+        analyzer.forward(inputs)
+        t3 = time.perf_counter()
+        t_tok += t2 - t1
+        t_fwd += t3 - t2
+    serial_wall = time.perf_counter() - t0
+
+    timings = {}
+    t0 = time.perf_counter()
+    pipelined = run(_iter_batch_probs_pipelined(analyzer, iter(batches), timings))
+    pipelined_wall = time.perf_counter() - t0
+
+    serial = run(_iter_batch_probs(analyzer, batches))
+
+    print("=== Stufenzeiten ===")
+    print(f"  seriell:   Tokenisierung {t_tok:6.2f}s | Modell {t_fwd:6.2f}s | Gesamt {serial_wall:6.2f}s")
+    print(f"  pipelined: Tokenisierung {timings['tokenize']:6.2f}s | Modell {timings['forward']:6.2f}s | "
+          f"Gesamt {pipelined_wall:6.2f}s")
+    overlap = (timings['tokenize'] + timings['forward']) / pipelined_wall
+    print(f"\n  Überlappung: {overlap:.2f}x | Speedup: {serial_wall / pipelined_wall:.2f}x")
+    print(f"  Max. Abweichung: {np.abs(serial - pipelined).max():.2e}")
+
+
+if __name__ == "__main__":
+    main()
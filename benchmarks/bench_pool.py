@@ -0,0 +1,50 @@
+"""
+Benchmark: Durchsatz (Artikel/s) der Multi-Prozess-Inferenz je Worker-Anzahl.
+
+Aufruf (aus dem Projektverzeichnis):
+    python benchmarks/bench_pool.py [--n 2000] [--workers 1 2 4] [--model ProsusAI/finbert]
+"""
+import argparse
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import pandas as pd
+
+from bench_batching import make_headlines
+from sentiment.finbert_analyzer import FinBertAnalyzer, MODEL_NAME, analyze_dataframe
+
+
+def main():
+    cpu_count = os.cpu_count() or 1
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--n', type=int, default=2000)
+    parser.add_argument('--workers', type=int, nargs='+',
+                        default=sorted({1, 2, 4, cpu_count} & set(range(1, cpu_count + 1))))
+    parser.add_argument('--batching', default='bucket', choices=['fixed', 'bucket'])
+    parser.add_argument('--model', default=MODEL_NAME)
+    args = parser.parse_args()
+
+    analyzer = FinBertAnalyzer(model_name=args.model, device='cpu').load()
+    df = pd.DataFrame({'title': make_headlines(args.n)})
+
+    rows = []
+    for n_workers in args.workers:
+        t0 = time.perf_counter()
+        analyze_dataframe(df, analyzer=analyzer, use_cache=False,
+                          batching=args.batching, n_workers=n_workers)
+        elapsed = time.perf_counter() - t0
+        rows.append({'workers': n_workers, 'seconds': elapsed, 'articles_per_s': args.n / elapsed})
+
+    result = pd.DataFrame(rows)
+    result['speedup'] = result['articles_per_s'] / result['articles_per_s'].iloc[0]
+    print("\n=== Durchsatz pro Worker-Anzahl ===")
+    print(result.round(2).to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
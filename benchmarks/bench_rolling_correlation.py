@@ -0,0 +1,62 @@
+"""
+Benchmark: Rolling-Korrelation pro Ticker (pandas groupby/rolling vs. laufende Summen).
+
+Aufruf (aus dem Projektverzeichnis):
+    python benchmarks/bench_rolling_correlation.py [--tickers 500] [--days 750] [--window 30 120]
+"""
+import argparse
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import numpy as np
+
+from analysis.correlation import rolling_correlation
+from bench_lead_lag import make_merged
+
+
+def pandas_rolling_correlation(df, window, min_periods):
+    """Referenz: rolling().corr() je Ticker."""
+    df = df.sort_values(['ticker', 'date'])
+    return (df.groupby('ticker', sort=False)
+            .apply(lambda g: g['sentiment_score'].rolling(window, min_periods=min_periods).corr(g['Volatility']))
+            .reset_index(level=0, drop=True))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--tickers', type=int, default=500)
+    parser.add_argument('--days', type=int, default=750)
+    parser.add_argument('--window', type=int, nargs='+', default=[30, 120])
+    args = parser.parse_args()
+
+    df = make_merged(args.tickers, args.days)
+    print(f"=== {args.tickers} Ticker × {args.days} Tage ({len(df):,} Zeilen) ===")
+
+    for window in args.window:
+        min_periods = window // 3
+        t0 = time.perf_counter()
+        reference = pandas_rolling_correlation(df, window, min_periods)
+        t_pandas = time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        result = rolling_correlation(df, window=window, min_periods=min_periods)
+        t_engine = time.perf_counter() - t0
+
+        # Beide nach Ticker (hier alphabetisch = erstes Auftreten) und Datum sortiert
+        ref = reference.replace([np.inf, -np.inf], np.nan).to_numpy()
+        new = result['rolling_correlation'].to_numpy()
+        same_nan = np.array_equal(np.isnan(new), np.isnan(ref))
+        diff = np.nanmax(np.abs(new - ref))
+        print(f"\n  Fenster {window}:")
+        print(f"    pandas groupby/rolling: {t_pandas:7.3f}s")
+        print(f"    Laufende Summen:        {t_engine:7.3f}s ({t_pandas / t_engine:.0f}x)")
+        print(f"    Max. Abweichung {diff:.1e}, NaN-Muster gleich: {same_nan}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""
+Benchmark: Startzeit - Import-Latenz der Module und Latenz des ersten Scorings.
+
+Jeder Import wird in einem frischen Interpreter gemessen, damit kein Modul
+aus einem vorherigen Lauf im Cache liegt.
+
+Aufruf (aus dem Projektverzeichnis):
+    python benchmarks/bench_startup.py [--model ProsusAI/finbert] [--repeat 3]
+"""
+import argparse
+import os
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+MODULES = [
+    'analysis.correlation',
+    'analysis.volatility',
+    'sentiment.finbert_analyzer',
+    'visualizations.dashboard',
+    'main',
+]
+
+
+def measure_import(module, repeat=3):
+    """Misst die Importzeit eines Moduls (Minimum über mehrere frische Prozesse)."""
+    code = (
+        "import time; t = time.perf_counter(); "
+        f"import {module}; "
+        "print(time.perf_counter() - t)"
+    )
+    timings = []
+    for _ in range(repeat):
+        out = subprocess.run([sys.executable, '-c', code], cwd=ROOT,
+                             capture_output=True, text=True, check=True)
+        timings.append(float(out.stdout.strip().splitlines()[-1]))
+    return min(timings)
+
+
+def measure_first_score(model_name):
+    """Misst Laden des Modells und das erste Scoring getrennt."""
+    from sentiment.finbert_analyzer import FinBertAnalyzer
+
+    analyzer = FinBertAnalyzer(model_name=model_name)
+
+    t0 = time.perf_counter()
+    analyzer.load()
+    t1 = time.perf_counter()
+    analyzer.predict_proba(["Apple reports record quarterly revenue and profit"])
+    t2 = time.perf_counter()
+    analyzer.predict_proba(["Stock market crashes amid recession fears"])
+    t3 = time.perf_counter()
+    analyzer.close()
+
+    return {'load': t1 - t0, 'first_score': t2 - t1, 'second_score': t3 - t2}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--model', default=None, help="Modellname/-pfad (Standard: FinBERT)")
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--skip-model', action='store_true', help="Nur Importzeiten messen")
+    args = parser.parse_args()
+
+    print("=== Importzeiten (frischer Prozess) ===")
+    for module in MODULES:
+        print(f"  {module:32s} {measure_import(module, args.repeat) * 1000:8.1f} ms")
+
+    if args.skip_model:
+        return
+
+    from sentiment.finbert_analyzer import MODEL_NAME
+    timings = measure_first_score(args.model or MODEL_NAME)
+    print("\n=== Erstes Scoring ===")
+    print(f"  Modell laden:     {timings['load'] * 1000:8.1f} ms")
+    print(f"  Erstes Scoring:   {timings['first_score'] * 1000:8.1f} ms")
+    print(f"  Zweites Scoring:  {timings['second_score'] * 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""
+Benchmark: Rolling Volatility pro Ticker (Schleife vs. ein Durchlauf).
+
+Vergleicht die bisherige Umsetzung (Filter + Kopie pro Ticker) mit
+rolling_volatility() auf synthetischen Kursen und prüft die Abweichung.
+
+Aufruf (aus dem Projektverzeichnis):
+    python benchmarks/bench_volatility.py [--tickers 500] [--years 10]
+"""
+import argparse
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import numpy as np
+import pandas as pd
+
+from analysis.volatility import calculate_volatility_by_ticker, rolling_volatility
+from synthetic import make_prices
+
+
+def legacy_volatility_by_ticker(df, window=20):
+    """Bisherige Umsetzung: ein Filter, eine Kopie und ein rolling() pro Ticker."""
+    result = []
+    for ticker in df['Ticker'].unique():
+        ticker_df = df[df['Ticker'] == ticker].copy()
+        ticker_df = ticker_df.sort_values('Date')
+        ticker_df['Volatility'] = ticker_df['Daily_Return'].rolling(window=window).std()
+        result.append(ticker_df)
+    return pd.concat(result, ignore_index=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--tickers', type=int, default=500)
+    parser.add_argument('--years', type=int, default=10)
+    parser.add_argument('--windows', type=int, nargs='+', default=[5, 10, 20, 60])
+    args = parser.parse_args()
+
+    df = make_prices(args.tickers, args.years * 252)
+    print(f"=== {args.tickers} Ticker × {args.years} Jahre ({len(df):,} Zeilen) ===")
+
+    t0 = time.perf_counter()
+    legacy = {w: legacy_volatility_by_ticker(df, w)['Volatility'].to_numpy() for w in args.windows}
+    t_legacy = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    result = rolling_volatility(df, windows=args.windows)
+    t_engine = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    calculate_volatility_by_ticker(df, window=20)
+    t_single = time.perf_counter() - t0
+
+    print(f"  Schleife pro Ticker ({len(args.windows)} Fenster): {t_legacy:7.2f}s")
+    print(f"  Ein Durchlauf       ({len(args.windows)} Fenster): {t_engine:7.2f}s "
+          f"({t_legacy / t_engine:.0f}x)")
+    print(f"  calculate_volatility_by_ticker (20):  {t_single:7.2f}s")
+
+    for w in args.windows:
+        new = result[f'Volatility_{w}'].to_numpy(dtype=np.float64)
+        same_nan = np.array_equal(np.isnan(new), np.isnan(legacy[w]))
+        diff = np.nanmax(np.abs(new - legacy[w]) / np.maximum(np.abs(legacy[w]), 1e-12))
+        print(f"  Fenster {w:3d}: max. rel. Abweichung {diff:.1e}, NaN-Muster gleich: {same_nan}")
+
+
+if __name__ == "__main__":
+    main()
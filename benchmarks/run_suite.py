@@ -0,0 +1,232 @@
+"""
+Benchmark-Suite: alle Hot Paths mit synthetischen Daten, offline.
+
+Erzeugt Kurse und Überschriften in wählbarer Größe (Ticker × Tage ×
+Artikel pro Tag), ersetzt FinBERT durch den deterministischen StubAnalyzer
+und misst jeden Schritt der Pipeline einzeln:
+
+    news_to_dataframe         Nachbearbeitung von fetch_all_news
+    collapse_near_duplicates  Fast-Duplikate vor der Inferenz
+    analyze_dataframe         Sentiment (Stub-Modell, ohne Cache)
+    aggregate_daily_sentiment
+    calculate_volatility_by_ticker
+    merge_sentiment_volatility
+    compute_ticker_stats
+    lead_lag_analysis
+    resample_by_ticker
+    run_plots                 Einzel-Plots + Heatmap + Dashboard
+    run_plots_unchanged       dasselbe mit unveränderten Daten (Figuren übersprungen)
+
+Die Ergebnisse (Median/Minimum je Schritt, Zeilen, Hash der Ausgabe) werden
+als JSON geschrieben und optional mit einer früheren Baseline verglichen.
+Ein Schritt gilt als Regression, wenn seine schnellste Wiederholung um mehr
+als --threshold (relativ) und --min-delta (absolut) langsamer ist; der Exit-Code ist dann 1.
+Abweichende Ausgabe-Hashes werden gemeldet (Ergebnisse haben sich geändert).
+
+Aufruf (aus dem Projektverzeichnis):
+    python benchmarks/run_suite.py --tickers 50 --days 250 --articles-per-day 4
+    python benchmarks/run_suite.py --output benchmarks/baseline.json        # Baseline anlegen
+    python benchmarks/run_suite.py --baseline benchmarks/baseline.json      # vergleichen
+    python benchmarks/run_suite.py --only lead_lag_analysis,run_plots
+"""
+import argparse
+import datetime
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import numpy as np
+import pandas as pd
+
+from synthetic import make_news_items, make_prices
+from stub_model import StubAnalyzer
+from analysis.correlation import compute_ticker_stats, lead_lag_analysis, merge_sentiment_volatility
+from analysis.resampling import resample_by_ticker
+from analysis.volatility import calculate_volatility_by_ticker
+from data.news_fetcher import news_to_dataframe
+from pipeline.runner import hash_frame
+from sentiment.finbert_analyzer import aggregate_daily_sentiment, analyze_dataframe
+from sentiment.near_duplicates import collapse_near_duplicates
+
+DEFAULT_OUTPUT = os.path.join(ROOT, '.cache', 'benchmarks', 'latest.json')
+
+
+class Suite:
+    """Führt die Schritte nacheinander aus; die Ausgabe eines Schritts ist Eingabe der folgenden."""
+
+    def __init__(self, args):
+        self.args = args
+        self.only = set(args.only.split(',')) if args.only else None
+        self.results = {}
+
+    def measure(self, name, func):
+        """Führt func repeat-mal aus (Ausgabe bleibt stumm) und speichert die Zeiten."""
+        timed = self.only is None or name in self.only
+        runs = []
+        result = None
+        for _ in range(self.args.repeat if timed else 1):
+            with open(os.devnull, 'w') as devnull:
+                stdout, sys.stdout = sys.stdout, devnull
+                try:
+                    start = time.perf_counter()
+                    result = func()
+                    runs.append(time.perf_counter() - start)
+                finally:
+                    sys.stdout = stdout
+        if timed:
+            entry = {'median_s': statistics.median(runs), 'min_s': min(runs),
+                     'runs': [round(r, 6) for r in runs]}
+            if isinstance(result, pd.DataFrame):
+                entry['rows'] = len(result)
+                entry['output_hash'] = hash_frame(result)
+            self.results[name] = entry
+            print(f"  {name:<32}{entry['median_s']:>10.4f}s  (min {entry['min_s']:.4f}s)"
+                  + (f"  {entry['rows']} Zeilen" if 'rows' in entry else ""))
+        return result
+
+    def run(self):
+        a = self.args
+        prices = make_prices(a.tickers, a.days, seed=a.seed)
+        items = make_news_items(prices, articles_per_day=a.articles_per_day, seed=a.seed)
+        print(f"Daten: {a.tickers} Ticker × {a.days} Tage, {len(items)} Artikel, "
+              f"{a.repeat} Wiederholungen\n")
+        analyzer = StubAnalyzer().load()
+
+        news = self.measure('news_to_dataframe', lambda: news_to_dataframe(items))
+        collapsed = self.measure('collapse_near_duplicates', lambda: collapse_near_duplicates(news))
+        scored = self.measure('analyze_dataframe', lambda: analyze_dataframe(
+            collapsed, analyzer=analyzer, use_cache=False, batching='bucket', pipeline=True))
+        daily = self.measure('aggregate_daily_sentiment',
+                             lambda: aggregate_daily_sentiment(scored.copy()))
+        volatility = self.measure('calculate_volatility_by_ticker',
+                                  lambda: calculate_volatility_by_ticker(prices, window=a.window))
+        merged = self.measure('merge_sentiment_volatility',
+                              lambda: merge_sentiment_volatility(daily, volatility))
+        ticker_stats = self.measure('compute_ticker_stats', lambda: compute_ticker_stats(merged))
+        lead_lag = self.measure('lead_lag_analysis', lambda: lead_lag_analysis(merged, max_lag=a.max_lag))
+        self.measure('resample_by_ticker', lambda: resample_by_ticker(
+            merged, n_resamples=a.resamples, block_size=a.window, n_workers=1))
+
+        if 'run_plots' in (self.only or {'run_plots'}):
+            from pipeline.stages import run_plots
+
+            plot_tickers = merged['ticker'].unique()[:a.plot_tickers]
+            inputs = {'merge': {'merged': merged[merged['ticker'].isin(plot_tickers)]},
+                      'stats': {'ticker_stats': ticker_stats[ticker_stats['ticker'].isin(plot_tickers)],
+                                'lead_lag': lead_lag[lead_lag['ticker'].isin(plot_tickers)]}}
+            def render(plots_dir):
+                # Dateinamen ohne temporäres Verzeichnis, damit der Hash vergleichbar bleibt
+                return (run_plots(inputs, plots_dir=plots_dir, n_workers=a.workers)['files']
+                        .assign(path=lambda files: files['path'].map(os.path.basename)))
+
+            with tempfile.TemporaryDirectory() as tmp:
+                # Jede Wiederholung in ein neues Verzeichnis: alle Figuren werden gerendert
+                counter = iter(range(a.repeat + 1))
+                self.measure('run_plots', lambda: render(os.path.join(tmp, f"run{next(counter)}")))
+                # Erneuter Lauf ins selbe Verzeichnis: unveränderte Figuren werden übersprungen
+                self.measure('run_plots_unchanged', lambda: render(os.path.join(tmp, "run0")))
+        return self.results
+
+
+def _environment():
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT,
+                                capture_output=True, text=True, timeout=10).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        commit = None
+    return {
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'pandas': pd.__version__,
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'commit': commit,
+    }
+
+
+def compare(current, baseline, threshold, min_delta):
+    """
+    Vergleicht zwei Ergebnisse. Returns: Liste der Schritte mit Regression.
+    """
+    if current['scale'] != baseline.get('scale'):
+        print(f"\nWarnung: andere Datengröße als die Baseline ({baseline.get('scale')})")
+
+    print(f"\n{'Schritt (Minimum, s)':<32}{'Baseline':>10}{'Aktuell':>10}{'Faktor':>8}")
+    regressions = []
+    for name, entry in current['results'].items():
+        base = baseline.get('results', {}).get(name)
+        if base is None:
+            print(f"{name:<32}{'-':>10}{entry['min_s']:>10.4f}{'neu':>8}")
+            continue
+        # Minimum statt Median: am wenigsten von anderer Last auf dem Rechner gestört
+        ratio = entry['min_s'] / base['min_s'] if base['min_s'] > 0 else float('inf')
+        status = ''
+        if ratio > 1 + threshold and entry['min_s'] - base['min_s'] > min_delta:
+            status = '  REGRESSION'
+            regressions.append(name)
+        elif ratio < 1 - threshold and base['min_s'] - entry['min_s'] > min_delta:
+            status = '  schneller'
+        if base.get('output_hash') and entry.get('output_hash') != base['output_hash']:
+            status += '  (Ausgabe geändert)'
+        print(f"{name:<32}{base['min_s']:>10.4f}{entry['min_s']:>10.4f}{ratio:>7.2f}x{status}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--tickers', type=int, default=50)
+    parser.add_argument('--days', type=int, default=250)
+    parser.add_argument('--articles-per-day', type=float, default=4)
+    parser.add_argument('--window', type=int, default=20)
+    parser.add_argument('--max-lag', type=int, default=5)
+    parser.add_argument('--resamples', type=int, default=1000)
+    parser.add_argument('--plot-tickers', type=int, default=10,
+                        help="Anzahl Ticker für run_plots (Plots skalieren linear)")
+    parser.add_argument('--workers', type=int, default=None,
+                        help="Prozesse für run_plots (Standard: CPU-Kerne)")
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--only', help="Nur diese Schritte messen (kommagetrennt)")
+    parser.add_argument('--output', default=DEFAULT_OUTPUT, help="Ergebnisdatei (JSON)")
+    parser.add_argument('--baseline', help="Frühere Ergebnisdatei zum Vergleich")
+    parser.add_argument('--threshold', type=float, default=0.15,
+                        help="Relative Verlangsamung, ab der eine Regression gemeldet wird")
+    parser.add_argument('--min-delta', type=float, default=0.005,
+                        help="Absolute Verlangsamung in Sekunden, darunter nur Rauschen")
+    args = parser.parse_args()
+
+    results = Suite(args).run()
+    report = {
+        'created_at': datetime.datetime.now().isoformat(timespec='seconds'),
+        'scale': {'tickers': args.tickers, 'days': args.days, 'articles_per_day': args.articles_per_day,
+                  'window': args.window, 'max_lag': args.max_lag, 'resamples': args.resamples,
+                  'plot_tickers': args.plot_tickers, 'workers': args.workers, 'seed': args.seed},
+        'environment': _environment(),
+        'results': results,
+    }
+
+    regressions = []
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            regressions = compare(report, json.load(f), args.threshold, args.min_delta)
+
+    os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+    print(f"\nErgebnisse: {args.output}")
+
+    if regressions:
+        print(f"Regressionen: {', '.join(regressions)}")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
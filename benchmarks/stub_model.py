@@ -0,0 +1,98 @@
+"""
+Kleiner deterministischer Ersatz für FinBERT (ohne Download, ohne torch).
+
+StubAnalyzer ist ein FinBertAnalyzer, dessen Tokenizer und Backend durch
+NumPy-Varianten ersetzt sind: Wörter werden per CRC32 auf ein festes
+Vokabular abgebildet, die Logits sind der Mittelwert fester Zufallsvektoren
+der Tokens. Dadurch laufen analyze_dataframe, Batching und Cache-Schlüssel
+unverändert, nur die Modellzeit entfällt. Gleiche Texte ergeben auf jedem
+Rechner dieselben Scores.
+"""
+import os
+import sys
+import zlib
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from sentiment.finbert_analyzer import FinBertAnalyzer
+
+VOCAB_SIZE = 4096
+CLS, SEP, PAD = 1, 2, 0
+# Einige Wörter mit eindeutiger Richtung, damit die Scores nicht reines Rauschen sind
+LEXICON = {'rises': 2, 'jumps': 2, 'surges': 2, 'beats': 2, 'upgrade': 2, 'record': 2,
+           'falls': 0, 'slides': 0, 'drops': 0, 'misses': 0, 'fears': 0, 'worries': 0}
+
+
+def _word_id(word):
+    return 3 + zlib.crc32(word.encode('utf-8')) % (VOCAB_SIZE - 3)
+
+
+class _StubTokenizer:
+    """Whitespace-Tokenizer mit der Aufrufschnittstelle der Hugging-Face-Tokenizer."""
+
+    def __call__(self, texts, return_tensors=None, truncation=True, max_length=512, padding=False):
+        ids = []
+        for text in texts:
+            tokens = [_word_id(w) for w in str(text).lower().split()]
+            if truncation:
+                tokens = tokens[:max_length - 2]
+            ids.append([CLS, *tokens, SEP])
+        if not padding:
+            return {'input_ids': ids}
+        width = max((len(row) for row in ids), default=0)
+        input_ids = np.full((len(ids), width), PAD, dtype=np.int64)
+        for i, row in enumerate(ids):
+            input_ids[i, :len(row)] = row
+        return {'input_ids': input_ids, 'attention_mask': (input_ids != PAD).astype(np.int64)}
+
+
+class _StubBackend:
+    """Logits = Mittelwert fester Token-Vektoren (3 Klassen: negative, neutral, positive)."""
+
+    name = 'stub'
+    device = 'cpu'
+    tensor_type = 'np'
+
+    def __init__(self, seed=0):
+        weights = np.random.default_rng(seed).normal(0.0, 1.0, size=(VOCAB_SIZE, 3))
+        for word, label in LEXICON.items():
+            weights[_word_id(word)] = 0.0
+            weights[_word_id(word), label] = 8.0
+        weights[[PAD, CLS, SEP]] = 0.0
+        self.weights = weights
+
+    def load(self):
+        return self
+
+    def prepare(self, inputs):
+        return inputs
+
+    def predict_logits(self, inputs):
+        ids = inputs['input_ids']
+        mask = inputs['attention_mask'][..., None]
+        total = (self.weights[ids] * mask).sum(axis=1)
+        return total / np.maximum(mask.sum(axis=1), 1)
+
+    def close(self):
+        pass
+
+
+class StubAnalyzer(FinBertAnalyzer):
+    """FinBertAnalyzer mit Stub-Tokenizer und -Backend (Backend-Name 'stub')."""
+
+    def __init__(self, max_length=512, seed=0):
+        super().__init__(model_name='stub/finbert', max_length=max_length, backend='stub')
+        self.seed = seed
+
+    def load(self):
+        if self.backend is None:
+            with self._lock:
+                if self.backend is None:
+                    self.tokenizer = _StubTokenizer()
+                    self.device = 'cpu'
+                    self.backend = _StubBackend(self.seed)
+        return self
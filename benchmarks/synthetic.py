@@ -0,0 +1,96 @@
+"""
+Synthetische Eingabedaten für die Benchmarks (ohne Netzwerk).
+
+Skaliert über Ticker × Handelstage × Artikel pro Tag:
+
+    prices = make_prices(n_tickers, n_days)            # wie fetch_all_stocks
+    items = make_news_items(prices, articles_per_day)  # wie die Fetcher (Liste von dicts)
+
+Die Überschriften enthalten syndizierte Varianten (gleiche Meldung mit
+anderem Quellen-Suffix) und exakte Duplikate über mehrere Quellen, damit
+Deduplizierung und Near-Duplicate-Erkennung realistisch viel zu tun haben.
+"""
+import numpy as np
+import pandas as pd
+
+SOURCES = ['yahoo', 'google', 'finnhub', 'newsapi']
+SUBJECTS = ["stock", "shares", "the company", "investors", "analysts", "revenue", "profit"]
+VERBS = ["rises", "falls", "jumps", "slides", "surges", "drops", "beats estimates", "misses estimates"]
+REASONS = ["after earnings", "on guidance", "amid recession fears", "after product launch",
+           "on analyst upgrade", "after CEO comments", "on merger news", "amid rate worries"]
+SUFFIXES = ["", " - Reuters", " - Bloomberg", " | Yahoo Finance", " - MarketWatch", " - CNBC"]
+
+
+def make_prices(n_tickers, n_days, seed=42):
+    """Synthetische Tageskurse (Random Walk, OHLC) für n_tickers × n_days."""
+    rng = np.random.default_rng(seed)
+    dates = pd.bdate_range('2015-01-01', periods=n_days)
+    returns = rng.normal(0, 0.02, size=(n_tickers, n_days))
+    returns[:, 0] = np.nan
+    close = 100 * np.cumprod(1 + np.nan_to_num(returns), axis=1)
+    open_ = close * (1 + rng.normal(0, 0.005, size=close.shape))
+    high = np.maximum(open_, close) * (1 + np.abs(rng.normal(0, 0.01, size=close.shape)))
+    low = np.minimum(open_, close) * (1 - np.abs(rng.normal(0, 0.01, size=close.shape)))
+    return pd.DataFrame({
+        'Date': np.tile(dates, n_tickers),
+        'Ticker': np.repeat([f"T{i:04d}" for i in range(n_tickers)], n_days),
+        'Open': open_.ravel(),
+        'High': high.ravel(),
+        'Low': low.ravel(),
+        'Close': close.ravel(),
+        'Daily_Return': returns.ravel(),
+    })
+
+
+def make_news_items(prices, articles_per_day=4, syndicated=0.3, seed=42):
+    """
+    Rohe Nachrichten wie von den Fetchern (vor news_to_dataframe).
+
+    Args:
+        prices: Kurse aus make_prices (Ticker und Handelstage)
+        articles_per_day: Mittlere Anzahl Meldungen pro Ticker und Tag (Poisson)
+        syndicated: Anteil der Meldungen, die zusätzlich als Variante erscheinen
+
+    Returns:
+        Liste von dicts mit title, link, publisher, timestamp, ticker, company, source
+    """
+    rng = np.random.default_rng(seed)
+    tickers = prices['Ticker'].unique()
+    dates = pd.DatetimeIndex(prices['Date'].unique())
+
+    counts = rng.poisson(articles_per_day, size=(len(tickers), len(dates)))
+    ticker_idx, date_idx = np.nonzero(counts)
+    repeat = counts[ticker_idx, date_idx]
+    ticker_idx = np.repeat(ticker_idx, repeat)
+    date_idx = np.repeat(date_idx, repeat)
+    n = len(ticker_idx)
+
+    minutes = rng.integers(0, 24 * 60, size=n)
+    timestamps = dates[date_idx] + pd.to_timedelta(minutes, unit='m')
+    subjects = rng.integers(len(SUBJECTS), size=n)
+    verbs = rng.integers(len(VERBS), size=n)
+    reasons = rng.integers(len(REASONS), size=n)
+    numbers = rng.integers(1000, size=n)
+    sources = rng.integers(len(SOURCES), size=n)
+    variants = rng.random(n) < syndicated
+
+    items = []
+    for i in range(n):
+        ticker = tickers[ticker_idx[i]]
+        title = (f"{ticker} {SUBJECTS[subjects[i]]} {VERBS[verbs[i]]} {REASONS[reasons[i]]} "
+                 f"in Q{timestamps[i].quarter} {numbers[i]}")
+        source = SOURCES[sources[i]]
+        ts = timestamps[i]
+        # Die Quellen liefern teils zeitzonenbehaftete, teils naive Zeitstempel
+        timestamp = ts.tz_localize('UTC').to_pydatetime() if source in ('yahoo', 'finnhub') else ts.to_pydatetime()
+        item = {'title': title, 'link': f"https://news.example/{ticker}/{i}",
+                'publisher': source, 'timestamp': timestamp,
+                'ticker': ticker, 'company': f"Company {ticker}", 'source': source}
+        items.append(item)
+        if variants[i]:
+            # Syndizierte Variante derselben Meldung bei einer anderen Quelle
+            other = SOURCES[(sources[i] + 1) % len(SOURCES)]
+            items.append(dict(item, title=title + SUFFIXES[1 + i % (len(SUFFIXES) - 1)],
+                              link=f"https://news.example/{ticker}/{i}/{other}",
+                              publisher=other, source=other))
+    return items
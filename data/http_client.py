@@ -0,0 +1,169 @@
+"""
+Gemeinsamer HTTP-Client für die Nachrichtenquellen.
+
+- Ein Session-Objekt mit Connection-Pool (Keep-Alive, gzip/deflate) statt
+  einer neuen Verbindung (inkl. TLS-Handshake) pro Anfrage
+- Bedingte Anfragen (ETag / If-Modified-Since): Die Validatoren und das
+  zuletzt geparste Ergebnis liegen in einem kleinen SQLite-Cache. Bei
+  304 Not Modified wird das gespeicherte Ergebnis ohne erneutes Parsen
+  zurückgegeben.
+"""
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+
+DEFAULT_META_PATH = os.getenv("HTTP_META_PATH", os.path.join(".cache", "http_meta.sqlite"))
+
+
+def _json_default(value):
+    if isinstance(value, datetime):
+        return {'__datetime__': value.isoformat()}
+    raise TypeError(f"Nicht serialisierbar: {type(value).__name__}")
+
+
+def _json_object_hook(obj):
+    if '__datetime__' in obj and len(obj) == 1:
+        return datetime.fromisoformat(obj['__datetime__'])
+    return obj
+
+
+class HttpClient:
+    """
+    HTTP-Client mit Connection-Pool und bedingten Anfragen.
+
+    Args:
+        meta_path: SQLite-Datei für ETag/Last-Modified und gespeicherte Ergebnisse
+                   (None = ohne bedingte Anfragen)
+        pool_maxsize: Maximale Anzahl offener Verbindungen pro Host
+        timeout: Timeout pro Anfrage in Sekunden
+        retries: Wiederholungen bei Verbindungsfehlern und 429/5xx
+    """
+
+    def __init__(self, meta_path=DEFAULT_META_PATH, pool_maxsize=32, timeout=10, retries=2):
+        self.timeout = timeout
+        self.session = requests.Session()
+        self.session.headers.update({'Accept-Encoding': 'gzip, deflate'})
+        retry = Retry(total=retries, backoff_factor=0.5,
+                      status_forcelist=(429, 500, 502, 503, 504), allowed_methods=('GET',))
+        adapter = HTTPAdapter(pool_connections=16, pool_maxsize=pool_maxsize, max_retries=retry)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+
+        self.stats = {'requests': 0, 'not_modified': 0, 'bytes': 0}
+        self._lock = threading.Lock()
+        self._conn = None
+        if meta_path:
+            directory = os.path.dirname(meta_path)
+            if directory and not os.path.exists(directory):
+                os.makedirs(directory)
+            self._conn = sqlite3.connect(meta_path, check_same_thread=False)
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS http_meta (
+                    key TEXT PRIMARY KEY,
+                    etag TEXT,
+                    last_modified TEXT,
+                    result TEXT NOT NULL,
+                    updated_at REAL NOT NULL
+                )
+            """)
+            self._conn.commit()
+
+    def _count(self, response):
+        # Übertragene (ggf. komprimierte) Bytes laut Header, sonst Inhaltslänge
+        size = response.headers.get('Content-Length')
+        with self._lock:
+            self.stats['requests'] += 1
+            self.stats['bytes'] += int(size) if size and size.isdigit() else len(response.content)
+            if response.status_code == 304:
+                self.stats['not_modified'] += 1
+
+    def get(self, url, params=None, headers=None):
+        """Einfacher GET über den Connection-Pool."""
+        response = self.session.get(url, params=params, headers=headers, timeout=self.timeout)
+        self._count(response)
+        return response
+
+    @staticmethod
+    def _key(url, params):
+        raw = url + '?' + json.dumps(params or {}, sort_keys=True)
+        return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+    def get_cached(self, url, parse, params=None):
+        """
+        Bedingter GET: parst die Antwort nur, wenn sie sich geändert hat.
+
+        Args:
+            url: Adresse
+            parse: Funktion response -> JSON-serialisierbares Ergebnis (datetime erlaubt)
+            params: Query-Parameter
+
+        Returns:
+            Geparstes Ergebnis (bei 304 das gespeicherte Ergebnis)
+        """
+        if self._conn is None:
+            response = self.get(url, params=params)
+            response.raise_for_status()
+            return parse(response)
+
+        key = self._key(url, params)
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT etag, last_modified, result FROM http_meta WHERE key = ?", (key,)
+            ).fetchone()
+
+        headers = {}
+        if row:
+            etag, last_modified, _ = row
+            if etag:
+                headers['If-None-Match'] = etag
+            if last_modified:
+                headers['If-Modified-Since'] = last_modified
+
+        response = self.get(url, params=params, headers=headers)
+        if response.status_code == 304 and row:
+            return json.loads(row[2], object_hook=_json_object_hook)
+
+        response.raise_for_status()
+        result = parse(response)
+
+        etag = response.headers.get('ETag')
+        last_modified = response.headers.get('Last-Modified')
+        if etag or last_modified:
+            payload = json.dumps(result, default=_json_default)
+            with self._lock:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO http_meta VALUES (?, ?, ?, ?, ?)",
+                    (key, etag, last_modified, payload, time.time())
+                )
+                self._conn.commit()
+        return result
+
+    def close(self):
+        self.session.close()
+        if self._conn is not None:
+            with self._lock:
+                self._conn.close()
+                self._conn = None
+
+
+_default_client = None
+_default_lock = threading.Lock()
+
+
+def get_client():
+    """Gibt den prozessweiten HTTP-Client zurück (wird bei Bedarf erstellt)."""
+    global _default_client
+    if _default_client is None:
+        with _default_lock:
+            if _default_client is None:
+                _default_client = HttpClient()
+    return _default_client
@@ -0,0 +1,225 @@
+"""
+Persistentes Nachrichten-Archiv (SQLite, nur anhängend).
+
+Jeder Artikel wird unter einem stabilen Schlüssel gespeichert (Hash der
+kanonischen URL, ersatzweise Ticker + normalisierter Titel). Beim
+Aktualisieren fragen die Fetcher pro (Ticker, Quelle) nur Artikel ab der
+zuletzt gesehenen Veröffentlichung an (Hochwassermarke), die Pipeline liest
+anschließend aus dem Archiv. Der Aufwand wächst so mit den neuen Artikeln,
+nicht mit der gesamten Historie.
+"""
+import hashlib
+import os
+import sqlite3
+import threading
+from datetime import datetime, timezone
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+import pandas as pd
+
+try:
+    from data.news_fetcher import COMPANIES, news_to_dataframe
+except ImportError:
+    from news_fetcher import COMPANIES, news_to_dataframe
+
+
+DEFAULT_ARCHIVE_PATH = os.getenv("NEWS_ARCHIVE_PATH", os.path.join(".cache", "news_archive.sqlite"))
+
+# Tracking-Parameter, die denselben Artikel unter verschiedenen URLs erscheinen lassen
+_TRACKING_PARAMS = {'guccounter', 'guce_referrer', 'guce_referrer_sig', 'ncid', 'cmpid',
+                    'ref', 'src', 'fbclid', 'gclid', 'mc_cid', 'mc_eid'}
+
+COLUMNS = ['ticker', 'company', 'title', 'publisher', 'link', 'timestamp', 'source']
+
+
+def canonical_url(url):
+    """Kanonische URL: ohne Tracking-Parameter und Fragment, Host klein geschrieben."""
+    parts = urlsplit(url.strip())
+    query = [(k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
+             if not k.lower().startswith('utm_') and k.lower() not in _TRACKING_PARAMS]
+    path = parts.path.rstrip('/') or '/'
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), path, urlencode(sorted(query)), ''))
+
+
+def article_key(link, ticker, title):
+    """Stabiler Artikel-Schlüssel: kanonische URL, ersatzweise Ticker + Titel."""
+    if isinstance(link, str) and link.strip():
+        raw = 'url:' + canonical_url(link)
+    else:
+        norm_title = ' '.join(str(title).lower().split())
+        raw = f"title:{ticker}\x00{norm_title}"
+    return hashlib.sha1(raw.encode('utf-8')).hexdigest()
+
+
+class NewsArchive:
+    """
+    Nur anhängendes Artikel-Archiv.
+
+    Args:
+        path: Pfad zur SQLite-Datei
+    """
+
+    def __init__(self, path=DEFAULT_ARCHIVE_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(path)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory)
+
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS articles (
+                key TEXT NOT NULL,
+                ticker TEXT NOT NULL,
+                company TEXT,
+                title TEXT,
+                publisher TEXT,
+                link TEXT,
+                timestamp TEXT NOT NULL,
+                source TEXT NOT NULL,
+                fetched_at TEXT NOT NULL,
+                PRIMARY KEY (ticker, key)
+            )
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_articles_source ON articles(ticker, source, timestamp)")
+        # Verbrauchte Tageskontingente der Quellen (überdauert Neustarts)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS quota_usage (
+                source TEXT NOT NULL,
+                day TEXT NOT NULL,
+                used INTEGER NOT NULL,
+                PRIMARY KEY (source, day)
+            )
+        """)
+        self._conn.commit()
+
+    def append(self, df):
+        """
+        Hängt Artikel an (bereits bekannte Schlüssel werden ignoriert).
+
+        Args:
+            df: DataFrame wie aus fetch_all_news (Timestamps UTC, naiv)
+
+        Returns:
+            Anzahl neuer Artikel
+        """
+        if df.empty:
+            return 0
+
+        fetched_at = datetime.now(timezone.utc).replace(tzinfo=None).isoformat(timespec='seconds')
+        rows = []
+        for item in df[COLUMNS].itertuples(index=False):
+            key = article_key(item.link, item.ticker, item.title)
+            rows.append((key, item.ticker, item.company, item.title, item.publisher, item.link,
+                         pd.Timestamp(item.timestamp).isoformat(), item.source, fetched_at))
+
+        with self._lock:
+            before = self._conn.total_changes
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO articles VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", rows
+            )
+            self._conn.commit()
+            return self._conn.total_changes - before
+
+    def watermarks(self, tickers=None):
+        """
+        Hochwassermarken: neuester Artikel pro (Ticker, Quelle).
+
+        Zeitstempel in der Zukunft (z.B. aus älteren Läufen mit lokaler Zeit
+        statt UTC) werden ignoriert, damit sie keine Artikel überspringen lassen.
+        """
+        now = datetime.now(timezone.utc).replace(tzinfo=None).isoformat()
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT ticker, source, MAX(timestamp) FROM articles WHERE timestamp <= ? "
+                "GROUP BY ticker, source", (now,)
+            ).fetchall()
+        return {
+            (ticker, source): datetime.fromisoformat(ts)
+            for ticker, source, ts in rows
+            if tickers is None or ticker in tickers
+        }
+
+    def quota_used(self, source, day):
+        """Anzahl Anfragen an source am UTC-Tag day ('YYYY-MM-DD')."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT used FROM quota_usage WHERE source = ? AND day = ?", (source, day)
+            ).fetchone()
+        return row[0] if row else 0
+
+    def consume_quota(self, source, day, n=1):
+        """Verbucht n Anfragen an source am UTC-Tag day."""
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO quota_usage VALUES (?, ?, ?) "
+                "ON CONFLICT(source, day) DO UPDATE SET used = used + excluded.used",
+                (source, day, n)
+            )
+            self._conn.commit()
+
+    def update(self, tickers=None, newsapi_key=None, finnhub_key=None, on_request=None):
+        """
+        Holt nur Artikel ab den Hochwassermarken und hängt neue an.
+
+        Args:
+            on_request: Optionale Funktion (quelle, sekunden, ok) pro Abruf
+                        (siehe fetch_all_news_async)
+
+        Returns:
+            Anzahl neuer Artikel
+        """
+        try:
+            from data.news_engine import fetch_all_news_async, run_sync
+        except ImportError:
+            from news_engine import fetch_all_news_async, run_sync
+
+        if tickers is None:
+            tickers = list(COMPANIES.keys())
+
+        since = self.watermarks(tickers)
+        df = run_sync(fetch_all_news_async(tickers, newsapi_key, finnhub_key, since=since,
+                                           on_request=on_request, quota=self))
+        added = self.append(df)
+        print(f"Archiv: {added} neue Artikel ({len(df)} abgerufen, {len(self)} gesamt)")
+        return added
+
+    def load(self, tickers=None, since=None):
+        """
+        Liest Artikel aus dem Archiv.
+
+        Args:
+            tickers: Nur diese Ticker (Standard: alle)
+            since: Nur Artikel ab diesem Zeitpunkt
+
+        Returns:
+            DataFrame wie fetch_all_news
+        """
+        query = f"SELECT {', '.join(COLUMNS)} FROM articles"
+        conditions = []
+        params = []
+        if tickers is not None:
+            tickers = list(tickers)
+            conditions.append(f"ticker IN ({','.join('?' * len(tickers))})")
+            params.extend(tickers)
+        if since is not None:
+            conditions.append("timestamp >= ?")
+            params.append(pd.Timestamp(since).isoformat())
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+        # Feste Reihenfolge auch bei gleichen Zeitpunkten
+        query += " ORDER BY timestamp DESC, source, link, ticker, title"
+
+        with self._lock:
+            df = pd.read_sql_query(query, self._conn, params=params)
+        return news_to_dataframe(df.to_dict('records'))
+
+    def __len__(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM articles").fetchone()[0]
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,260 @@
+"""
+Asynchrone Nachrichten-Ingestion.
+
+Jeder (Ticker, Quelle)-Abruf läuft als eigene Aufgabe, sodass die Laufzeit
+nicht mehr die Summe der Quellen-Latenzen ist. Pro Quelle begrenzen ein
+Semaphor die gleichzeitigen Anfragen und ein Token-Bucket die Anfragerate
+(passend zum Kontingent des Anbieters). Die bestehenden (synchronen)
+Fetcher laufen dabei in einem gemeinsamen Thread-Pool.
+
+Quellen mit Tageskontingent (NewsAPI) warten nicht auf neue Tokens: ist das
+Kontingent des Tages (UTC) verbraucht, werden die übrigen Abrufe mit einer
+Warnung übersprungen und im nächsten Lauf ab der Hochwassermarke
+nachgeholt. Der Verbrauch wird über ein Quota-Objekt (z.B. NewsArchive)
+gespeichert und gilt damit auch über Neustarts hinweg. Ebenso wird ein
+Abruf übersprungen, wenn der Token-Bucket länger als max_wait warten müsste.
+"""
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+
+try:
+    from data.news_fetcher import (
+        COMPANIES, fetch_yahoo_news, fetch_newsapi, fetch_finnhub, fetch_google_news, news_to_dataframe
+    )
+except ImportError:
+    from news_fetcher import (
+        COMPANIES, fetch_yahoo_news, fetch_newsapi, fetch_finnhub, fetch_google_news, news_to_dataframe
+    )
+
+
+# Limits pro Quelle: gleichzeitige Anfragen, Rate (Anfragen/Sekunde), Burst,
+# optional Tageskontingent (Anfragen pro UTC-Tag)
+SOURCE_LIMITS = {
+    'yahoo': {'concurrency': 8, 'rate': 2.0, 'burst': 10},
+    # Free Tier: 100 Anfragen pro Tag
+    'newsapi': {'concurrency': 2, 'rate': 1.0, 'burst': 5, 'daily_quota': 100},
+    # Free Tier: 60 Anfragen pro Minute
+    'finnhub': {'concurrency': 4, 'rate': 1.0, 'burst': 30},
+    'google': {'concurrency': 4, 'rate': 2.0, 'burst': 10},
+}
+
+SOURCE_LABELS = {'yahoo': 'Yahoo', 'newsapi': 'NewsAPI', 'finnhub': 'Finnhub', 'google': 'Google'}
+
+# Längste Wartezeit auf einen Token, danach wird der Abruf übersprungen (Sekunden)
+DEFAULT_MAX_WAIT = 60.0
+
+
+class TokenBucket:
+    """
+    Asynchroner Token-Bucket.
+
+    Args:
+        rate: Nachfüllrate in Tokens pro Sekunde
+        capacity: Maximale Anzahl Tokens (Burst)
+    """
+
+    def __init__(self, rate, capacity):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    async def acquire(self, max_wait=None):
+        """
+        Wartet, bis ein Token verfügbar ist, und verbraucht es.
+
+        Returns:
+            False (ohne zu warten), wenn der nächste Token erst nach mehr als
+            max_wait Sekunden verfügbar wäre, sonst True
+        """
+        async with self._lock:
+            self._refill()
+            while self.tokens < 1:
+                wait = (1 - self.tokens) / self.rate
+                if max_wait is not None and wait > max_wait:
+                    return False
+                await asyncio.sleep(wait)
+                self._refill()
+            self.tokens -= 1
+            return True
+
+
+def _has_key(api_key):
+    return bool(api_key) and api_key != "dein_api_key_hier"
+
+
+def _fetch_source(source, ticker, company_name, newsapi_key, finnhub_key, since=None):
+    """
+    Ruft eine Quelle für einen Ticker ab (synchron, läuft im Thread-Pool).
+
+    Fehler werden weitergereicht (nicht als leere Liste), damit sie gezählt
+    und pro Ticker/Quelle gemeldet werden können.
+    """
+    if source == 'yahoo':
+        items = fetch_yahoo_news(ticker, since=since, raise_errors=True)
+    elif source == 'newsapi':
+        items = fetch_newsapi(company_name.split()[0], newsapi_key, days_back=365, since=since,
+                              raise_errors=True)
+    elif source == 'finnhub':
+        items = fetch_finnhub(ticker, finnhub_key, days_back=365, since=since, raise_errors=True)
+    else:
+        items = fetch_google_news(company_name, ticker, days_back=365, since=since, raise_errors=True)
+
+    for item in items:
+        item['ticker'] = ticker
+        item['company'] = company_name
+        item['source'] = source
+    return items
+
+
+def _timed_fetch(on_request, source, *args):
+    """_fetch_source mit Latenzmessung; meldet (Quelle, Sekunden, ok) an on_request."""
+    start = time.perf_counter()
+    try:
+        items = _fetch_source(source, *args)
+    except Exception:
+        on_request(source, time.perf_counter() - start, False)
+        raise
+    on_request(source, time.perf_counter() - start, True)
+    return items
+
+
+def _quota_tickers(tickers, allowed, day):
+    """
+    Ticker, die heute eine Quelle mit Tageskontingent abfragen dürfen.
+
+    Der Startpunkt rotiert mit dem Datum, damit bei großen Universen nicht
+    immer dieselben Ticker zum Zug kommen.
+    """
+    if allowed >= len(tickers):
+        return list(tickers)
+    offset = (datetime.fromisoformat(day).toordinal() * allowed) % len(tickers)
+    rotated = list(tickers[offset:]) + list(tickers[:offset])
+    return rotated[:allowed]
+
+
+async def fetch_all_news_async(tickers=None, newsapi_key=None, finnhub_key=None,
+                               limits=None, max_threads=32, since=None, on_request=None,
+                               quota=None):
+    """
+    Holt Nachrichten für alle Ticker aus allen Quellen gleichzeitig.
+
+    Args:
+        tickers: Liste der Ticker (Standard: COMPANIES)
+        newsapi_key: NewsAPI API-Key (optional)
+        finnhub_key: Finnhub API-Key (optional)
+        limits: Limits pro Quelle (Standard: SOURCE_LIMITS), überschreibt einzelne Quellen
+        max_threads: Größe des Thread-Pools für die blockierenden Fetcher
+        since: Optionale Hochwassermarken {(ticker, quelle): datetime (UTC, naiv)};
+               es werden nur neuere Artikel angefragt
+        on_request: Optionale Funktion (quelle, sekunden, ok), wird nach jedem
+                    Abruf aufgerufen (Laufbericht, siehe pipeline.metrics)
+        quota: Optionaler Speicher für den Verbrauch von Tageskontingenten mit
+               quota_used(quelle, tag) und consume_quota(quelle, tag)
+               (z.B. NewsArchive); ohne ihn gilt das Kontingent nur pro Aufruf
+
+    Returns:
+        DataFrame wie fetch_all_news
+    """
+    if tickers is None:
+        tickers = list(COMPANIES.keys())
+
+    source_limits = {name: dict(values) for name, values in SOURCE_LIMITS.items()}
+    for name, values in (limits or {}).items():
+        source_limits.setdefault(name, {}).update(values)
+
+    sources = ['yahoo', 'google']
+    if _has_key(newsapi_key):
+        sources.append('newsapi')
+    if _has_key(finnhub_key):
+        sources.append('finnhub')
+
+    # Tageskontingente: übrige Abrufe werden auf den nächsten Lauf verschoben
+    day = datetime.now(timezone.utc).date().isoformat()
+    planned = {}
+    deferred = dict.fromkeys(sources, 0)
+    errors = dict.fromkeys(sources, 0)
+    for s in sources:
+        daily = source_limits[s].get('daily_quota')
+        if daily is None:
+            planned[s] = list(tickers)
+            continue
+        used = quota.quota_used(s, day) if quota is not None else 0
+        planned[s] = _quota_tickers(list(tickers), max(0, daily - used), day)
+        deferred[s] = len(tickers) - len(planned[s])
+
+    semaphores = {s: asyncio.Semaphore(source_limits[s]['concurrency']) for s in sources}
+    buckets = {s: TokenBucket(source_limits[s]['rate'], source_limits[s]['burst']) for s in sources}
+    max_wait = {s: source_limits[s].get('max_wait', DEFAULT_MAX_WAIT) for s in sources}
+    loop = asyncio.get_running_loop()
+
+    async def run(executor, source, ticker):
+        company_name = COMPANIES.get(ticker, ticker)
+        async with semaphores[source]:
+            if not await buckets[source].acquire(max_wait[source]):
+                deferred[source] += 1
+                return ticker, source, []
+            if quota is not None and 'daily_quota' in source_limits[source]:
+                quota.consume_quota(source, day)
+            args = (source, ticker, company_name, newsapi_key, finnhub_key,
+                    (since or {}).get((ticker, source)))
+            try:
+                if on_request is None:
+                    items = await loop.run_in_executor(executor, _fetch_source, *args)
+                else:
+                    # Gemessen im Worker-Thread: ohne Wartezeit auf Semaphor/Token-Bucket
+                    items = await loop.run_in_executor(executor, _timed_fetch, on_request, *args)
+            except Exception as e:
+                print(f"✗ {ticker} ({SOURCE_LABELS[source]}): Fehler - {e}")
+                errors[source] += 1
+                return ticker, source, []
+        return ticker, source, items
+
+    all_news = []
+    counts = {ticker: dict.fromkeys(SOURCE_LABELS, 0) for ticker in tickers}
+    with ThreadPoolExecutor(max_workers=max_threads) as executor:
+        tasks = [run(executor, source, ticker) for source in sources for ticker in planned[source]]
+        for result in await asyncio.gather(*tasks, return_exceptions=True):
+            if isinstance(result, Exception):
+                print(f"✗ Fehler - {result}")
+                continue
+            ticker, source, items = result
+            counts[ticker][source] = len(items)
+            all_news.extend(items)
+
+    for ticker in tickers:
+        c = counts[ticker]
+        print(f"✓ {ticker}: " + " | ".join(f"{SOURCE_LABELS[s]}={c[s]}" for s in SOURCE_LABELS))
+    for source, n in errors.items():
+        if n:
+            print(f"⚠ {SOURCE_LABELS[source]}: {n} fehlgeschlagene Abrufe")
+    for source, n in deferred.items():
+        if n:
+            print(f"⚠ {SOURCE_LABELS[source]}: Kontingent bzw. Rate erschöpft, {n} Abrufe "
+                  f"übersprungen (werden im nächsten Lauf nachgeholt)")
+
+    return news_to_dataframe(all_news)
+
+
+def run_sync(coro):
+    """
+    Führt eine Coroutine aus und gibt ihr Ergebnis zurück.
+
+    asyncio.run() schlägt fehl, wenn im aktuellen Thread bereits eine
+    Event-Loop läuft (z.B. in Jupyter). Dann läuft die Coroutine mit einer
+    eigenen Loop in einem separaten Thread; der Aufrufer wartet darauf.
+    """
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coro)
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        return executor.submit(asyncio.run, coro).result()
@@ -1,18 +1,43 @@
-import yfinance as yf
 import pandas as pd
-import time
-import requests
 import feedparser
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 from concurrent.futures import ThreadPoolExecutor, as_completed
 try:
     from data.stock_fetcher import COMPANIES
+    from data.http_client import get_client
 except ImportError:
     from stock_fetcher import COMPANIES
+    from http_client import get_client
 
 
-def fetch_yahoo_news(ticker):
-    """Holt Nachrichten von Yahoo Finance für einen Ticker."""
+def _to_utc(ts):
+    """Zeitstempel als UTC mit Zeitzone (naive Werte gelten bereits als UTC)."""
+    if ts.tzinfo is None:
+        return ts.replace(tzinfo=timezone.utc)
+    return ts.astimezone(timezone.utc)
+
+
+def _to_utc_naive(ts):
+    """Zeitstempel als UTC ohne Zeitzone (naive Werte gelten bereits als UTC)."""
+    if ts.tzinfo is not None:
+        ts = ts.astimezone(timezone.utc).replace(tzinfo=None)
+    return ts
+
+
+def _is_older(ts, since):
+    """True, wenn ts vor der Hochwassermarke since (UTC, naiv) liegt."""
+    return since is not None and _to_utc_naive(ts) < since
+
+
+def fetch_yahoo_news(ticker, since=None, raise_errors=False):
+    """
+    Holt Nachrichten von Yahoo Finance für einen Ticker (optional nur ab since).
+
+    Wie bei allen Fetchern: mit raise_errors=True werden Fehler weitergereicht
+    statt ausgegeben und als leere Liste zurückgegeben.
+    """
+    import yfinance as yf
+
     stock = yf.Ticker(ticker)
     news_list = []
     
@@ -25,15 +50,18 @@ def fetch_yahoo_news(ticker):
             # Neues Format: {'id': '...', 'content': {...}}
             content = item.get('content', {})
             
-            # Zeitstempel aus pubDate (ISO-String)
+            # Zeitstempel aus pubDate (ISO-String); Artikel ohne lesbares Datum
+            # werden verworfen (sonst verschieben sie die Hochwassermarke)
             pub_date_str = content.get('pubDate')
-            if pub_date_str:
-                try:
-                    ts = datetime.fromisoformat(pub_date_str.replace('Z', '+00:00'))
-                except:
-                    ts = datetime.now()
-            else:
-                ts = datetime.now()
+            if not pub_date_str:
+                continue
+            try:
+                ts = _to_utc(datetime.fromisoformat(pub_date_str.replace('Z', '+00:00')))
+            except (AttributeError, ValueError):
+                continue
+            
+            if _is_older(ts, since):
+                continue
 
             news_item = {
                 'ticker': ticker,
@@ -45,12 +73,14 @@ def fetch_yahoo_news(ticker):
             }
             news_list.append(news_item)
     except Exception as e:
+        if raise_errors:
+            raise
         print(f"Fehler bei {ticker}: {e}")
     
     return news_list
 
 
-def fetch_newsapi(company_name, api_key, days_back=30):
+def fetch_newsapi(company_name, api_key, days_back=30, since=None, raise_errors=False):
     """
     Holt Nachrichten von NewsAPI.org
     
@@ -58,14 +88,19 @@ def fetch_newsapi(company_name, api_key, days_back=30):
         company_name: Unternehmensname zum Suchen
         api_key: NewsAPI API-Key
         days_back: Tage in die Vergangenheit (max 30 für Free Tier)
+        since: Nur Artikel ab diesem Zeitpunkt (UTC, naiv) anfragen
+        raise_errors: Fehler weiterreichen statt leerer Liste
     """
     if not api_key or api_key == "dein_api_key_hier":
         return []
     
     base_url = "https://newsapi.org/v2/everything"
     
-    from_date = (datetime.now() - timedelta(days=min(days_back, 29))).strftime('%Y-%m-%d')
-    to_date = datetime.now().strftime('%Y-%m-%d')
+    now = datetime.now(timezone.utc)
+    from_date = (now - timedelta(days=min(days_back, 29))).strftime('%Y-%m-%d')
+    if since is not None and since.strftime('%Y-%m-%d') > from_date:
+        from_date = since.strftime('%Y-%m-%dT%H:%M:%S')
+    to_date = now.strftime('%Y-%m-%d')
     
     params = {
         'q': company_name,
@@ -80,38 +115,50 @@ def fetch_newsapi(company_name, api_key, days_back=30):
     news_list = []
     
     try:
-        response = requests.get(base_url, params=params, timeout=10)
-        data = response.json()
-        
-        if data.get('status') == 'ok':
-            for article in data.get('articles', []):
-                try:
-                    ts = datetime.fromisoformat(
-                        article.get('publishedAt', '').replace('Z', '+00:00')
-                    )
-                except:
-                    continue
-                
-                news_item = {
-                    'title': article.get('title', ''),
-                    'publisher': article.get('source', {}).get('name', ''),
-                    'link': article.get('url', ''),
-                    'timestamp': ts,
-                }
-                news_list.append(news_item)
+        news_list = get_client().get_cached(base_url, _parse_newsapi, params=params)
     except Exception as e:
+        if raise_errors:
+            raise
         print(f"  NewsAPI Fehler: {e}")
     
     return news_list
 
 
-def fetch_finnhub(ticker, api_key, days_back=365):
-    """Holt Nachrichten von Finnhub.io"""
+def _parse_newsapi(response):
+    """Wandelt eine NewsAPI-Antwort in Artikel um."""
+    news_list = []
+    data = response.json()
+    
+    if data.get('status') == 'ok':
+        for article in data.get('articles', []):
+            try:
+                ts = datetime.fromisoformat(
+                    article.get('publishedAt', '').replace('Z', '+00:00')
+                )
+            except:
+                continue
+            
+            news_item = {
+                'title': article.get('title', ''),
+                'publisher': article.get('source', {}).get('name', ''),
+                'link': article.get('url', ''),
+                'timestamp': ts,
+            }
+            news_list.append(news_item)
+    
+    return news_list
+
+
+def fetch_finnhub(ticker, api_key, days_back=365, since=None, raise_errors=False):
+    """Holt Nachrichten von Finnhub.io (optional nur ab since)"""
     if not api_key or api_key == "dein_api_key_hier":
         return []
     
-    from_date = (datetime.now() - timedelta(days=days_back)).strftime('%Y-%m-%d')
-    to_date = datetime.now().strftime('%Y-%m-%d')
+    now = datetime.now(timezone.utc)
+    from_date = (now - timedelta(days=days_back)).strftime('%Y-%m-%d')
+    if since is not None:
+        from_date = max(from_date, since.strftime('%Y-%m-%d'))
+    to_date = now.strftime('%Y-%m-%d')
     
     url = f"https://finnhub.io/api/v1/company-news"
     params = {
@@ -124,60 +171,92 @@ def fetch_finnhub(ticker, api_key, days_back=365):
     news_list = []
     
     try:
-        response = requests.get(url, params=params, timeout=10)
-        data = response.json()
-        
-        for article in data:
-            try:
-                ts = datetime.fromtimestamp(article.get('datetime', 0))
-            except:
-                continue
-            
-            news_item = {
-                'title': article.get('headline', ''),
-                'publisher': article.get('source', ''),
-                'link': article.get('url', ''),
-                'timestamp': ts,
-            }
-            news_list.append(news_item)
+        news_list = get_client().get_cached(url, _parse_finnhub, params=params)
     except Exception as e:
+        if raise_errors:
+            raise
         print(f"  Finnhub Fehler: {e}")
     
     return news_list
 
 
-def fetch_google_news(company_name, ticker, days_back=365):
-    """Holt Nachrichten von Google News RSS"""
+def _parse_finnhub(response):
+    """Wandelt eine Finnhub-Antwort in Artikel um."""
+    news_list = []
+    
+    for article in response.json():
+        # Unix-Zeit (UTC); fehlt sie, wird der Artikel verworfen
+        if not article.get('datetime'):
+            continue
+        try:
+            ts = datetime.fromtimestamp(article['datetime'], tz=timezone.utc)
+        except (TypeError, ValueError, OverflowError, OSError):
+            continue
+        
+        news_item = {
+            'title': article.get('headline', ''),
+            'publisher': article.get('source', ''),
+            'link': article.get('url', ''),
+            'timestamp': ts,
+        }
+        news_list.append(news_item)
+    
+    return news_list
+
+
+def fetch_google_news(company_name, ticker, days_back=365, since=None, raise_errors=False):
+    """Holt Nachrichten von Google News RSS (optional nur ab since)"""
     query = company_name.replace(' ', '+')
     url = f"https://news.google.com/rss/search?q={query}+stock&hl=en-US&gl=US&ceid=US:en"
     
     news_list = []
     
     try:
-        feed = feedparser.parse(url)
-        cutoff_date = datetime.now() - timedelta(days=days_back)
+        # Feed nur bei Änderungen neu parsen (ETag/If-Modified-Since)
+        entries = get_client().get_cached(url, _parse_google_feed)
+        cutoff_date = datetime.now(timezone.utc) - timedelta(days=days_back)
         
-        for entry in feed.entries[:50]:  # Limit to 50 articles
-            try:
-                ts = datetime(*entry.published_parsed[:6])
-                if ts < cutoff_date:
-                    continue
-            except:
-                ts = datetime.now()
+        for entry in entries:
+            # Einträge ohne lesbares Datum verwerfen
+            if entry['timestamp'] is None:
+                continue
+            ts = _to_utc(entry['timestamp'])
+            if ts < cutoff_date or _is_older(ts, since):
+                continue
             
-            news_item = {
-                'title': entry.get('title', ''),
-                'publisher': entry.get('source', {}).get('title', 'Google News'),
-                'link': entry.get('link', ''),
-                'timestamp': ts,
-            }
+            news_item = dict(entry)
+            news_item['timestamp'] = ts
             news_list.append(news_item)
     except Exception as e:
+        if raise_errors:
+            raise
         print(f"  Google News Fehler: {e}")
     
     return news_list
 
 
+def _parse_google_feed(response):
+    """Parst einen Google-News-RSS-Feed (Zeitstempel in UTC, None, falls nicht lesbar)."""
+    feed = feedparser.parse(response.content)
+    entries = []
+    
+    for entry in feed.entries[:50]:  # Limit to 50 articles
+        try:
+            # feedparser liefert published_parsed bereits in UTC
+            ts = datetime(*entry.published_parsed[:6], tzinfo=timezone.utc)
+        except:
+            ts = None
+        
+        entries.append({
+            'title': entry.get('title', ''),
+            'publisher': entry.get('source', {}).get('title', 'Google News'),
+            'link': entry.get('link', ''),
+            'timestamp': ts,
+        })
+    
+    return entries
+
+
 def fetch_ticker_news(ticker, company_name, newsapi_key, finnhub_key):
     """Holt Nachrichten für einen Ticker aus allen Quellen (parallel ausführbar)."""
     ticker_news = []
@@ -224,11 +303,25 @@ def fetch_ticker_news(ticker, company_name, newsapi_key, finnhub_key):
     return ticker, ticker_news, (yahoo_count, newsapi_count, finnhub_count, google_count)
 
 
-def fetch_all_news(tickers=None, newsapi_key=None, finnhub_key=None):
-    """Holt Nachrichten für alle Unternehmen aus ALLEN Quellen (parallel)."""
+def fetch_all_news(tickers=None, newsapi_key=None, finnhub_key=None, engine='async'):
+    """
+    Holt Nachrichten für alle Unternehmen aus ALLEN Quellen (parallel).
+    
+    Args:
+        engine: 'async' (alle Ticker×Quellen gleichzeitig, mit Limits pro Quelle)
+                oder 'threads' (ein Thread pro Ticker, Quellen nacheinander)
+    """
     if tickers is None:
         tickers = list(COMPANIES.keys())
     
+    if engine == 'async':
+        try:
+            from data.news_engine import fetch_all_news_async, run_sync
+        except ImportError:
+            from news_engine import fetch_all_news_async, run_sync
+        # run_sync: funktioniert auch innerhalb einer laufenden Event-Loop (Jupyter)
+        return run_sync(fetch_all_news_async(tickers, newsapi_key, finnhub_key))
+    
     all_news = []
     
     # Parallel alle Tickers abfragen (10 Threads = 1 pro Ticker)
@@ -251,6 +344,11 @@ def fetch_all_news(tickers=None, newsapi_key=None, finnhub_key=None):
             except Exception as e:
                 print(f"✗ {ticker}: Fehler - {e}")
     
+    return news_to_dataframe(all_news)
+
+
+def news_to_dataframe(all_news):
+    """Wandelt gesammelte Artikel in einen bereinigten DataFrame um."""
     # Zu DataFrame konvertieren
     df = pd.DataFrame(all_news)
     
@@ -259,9 +357,14 @@ def fetch_all_news(tickers=None, newsapi_key=None, finnhub_key=None):
         df['timestamp'] = pd.to_datetime(df['timestamp'], utc=True).dt.tz_localize(None)
         df['date'] = df['timestamp'].dt.date
         df = df.dropna(subset=['date'])
+        # Stabil sortieren (neueste zuerst, bei gleichem Zeitpunkt nach Quelle, Link,
+        # Ticker, Titel), damit Reihenfolge und behaltene Duplikate nicht von der
+        # Reihenfolge der Abrufe abhängen
+        keys = [c for c in ('timestamp', 'source', 'link', 'ticker', 'title') if c in df.columns]
+        df = df.sort_values(keys, ascending=[False] + [True] * (len(keys) - 1),
+                            kind='mergesort', na_position='last')
         # Duplikate entfernen (gleicher Titel am selben Tag)
-        df = df.drop_duplicates(subset=['ticker', 'title', 'date'], keep='first')
-        df = df.sort_values('timestamp', ascending=False)
+        df = df.drop_duplicates(subset=['ticker', 'title', 'date'], keep='first').reset_index(drop=True)
     
     return df
 
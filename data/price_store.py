@@ -0,0 +1,237 @@
+"""
+Lokaler Kursdaten-Speicher (Parquet).
+
+Hält die OHLCV-Historie pro Ticker in einer eigenen Parquet-Datei. Beim
+Aktualisieren wird nur der fehlende Zeitraum nachgeladen, parallel über alle
+Ticker mit begrenzter Thread-Anzahl. Im Offline-Modus wird ausschließlich
+aus dem Speicher gelesen.
+"""
+import json
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import numpy as np
+import pandas as pd
+
+
+DEFAULT_STORE_DIR = os.getenv("PRICE_STORE_DIR", os.path.join(".cache", "prices"))
+
+# yfinance-Perioden als Zeitabstand
+_PERIODS = {
+    'd': lambda n: pd.DateOffset(days=n),
+    'wk': lambda n: pd.DateOffset(weeks=n),
+    'mo': lambda n: pd.DateOffset(months=n),
+    'y': lambda n: pd.DateOffset(years=n),
+}
+
+
+def period_start(period, now=None):
+    """
+    Erster Tag eines yfinance-Zeitraums ('5d', '3mo', '1y', 'ytd', 'max').
+
+    Returns:
+        pd.Timestamp (tz-naiv, normalisiert) oder None für 'max'
+    """
+    now = pd.Timestamp(now or pd.Timestamp.now()).normalize()
+    if period == 'max':
+        return None
+    if period == 'ytd':
+        return pd.Timestamp(year=now.year, month=1, day=1)
+    for suffix in ('wk', 'mo', 'd', 'y'):
+        if period.endswith(suffix) and period[:-len(suffix)].isdigit():
+            return now - _PERIODS[suffix](int(period[:-len(suffix)]))
+    raise ValueError(f"Unbekannter Zeitraum: {period}")
+
+
+# Spalten mit Kapitalmaßnahmen in der yfinance-Historie
+_EVENT_COLUMNS = ('Dividends', 'Stock Splits')
+
+
+def _naive_dates(series):
+    """Datumsangaben ohne Zeitzone (für Vergleiche zwischen Tickern/Börsen)."""
+    dates = pd.to_datetime(series)
+    if dates.dt.tz is not None:
+        dates = dates.dt.tz_localize(None)
+    return dates.dt.normalize()
+
+
+def _adjustment_changed(stored, recent, anchor, last):
+    """
+    Prüft, ob die neu geladenen Kurse auf einer anderen Adjustierungsbasis liegen.
+
+    yfinance adjustiert die gesamte Historie bei Splits und Dividenden. Der
+    vollständige Tag anchor liegt in beiden Daten; weicht sein Schlusskurs
+    ab oder enthalten die neuen Tage (nach last) eine Kapitalmaßnahme, sind
+    die gespeicherten älteren Kurse veraltet.
+    """
+    if recent.empty:
+        return False
+    recent_days = _naive_dates(recent['Date']).to_numpy()
+    events = [c for c in _EVENT_COLUMNS if c in recent.columns]
+    if events and (recent.loc[recent_days > last, events].fillna(0) != 0).any().any():
+        return True
+
+    old = stored.loc[(_naive_dates(stored['Date']) == anchor).to_numpy(), 'Close']
+    new = recent.loc[recent_days == anchor, 'Close']
+    if old.empty or new.empty:
+        return False
+    return not np.isclose(old.iloc[-1], new.iloc[-1], rtol=1e-6, atol=0.0)
+
+
+class PriceStore:
+    """
+    Parquet-Speicher für Kursdaten.
+
+    Args:
+        root: Verzeichnis mit einer Parquet-Datei pro Ticker
+        max_workers: Maximale Anzahl paralleler Downloads
+    """
+
+    def __init__(self, root=DEFAULT_STORE_DIR, max_workers=8):
+        self.root = root
+        self.max_workers = max_workers
+        self._index_lock = threading.Lock()
+        if not os.path.exists(root):
+            os.makedirs(root)
+        self._index_path = os.path.join(root, 'index.json')
+        self._index = self._read_index()
+
+    def _read_index(self):
+        if os.path.exists(self._index_path):
+            with open(self._index_path, encoding='utf-8') as f:
+                return json.load(f)
+        return {}
+
+    def _write_index(self):
+        tmp = self._index_path + '.tmp'
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(self._index, f, indent=2, sort_keys=True)
+        os.replace(tmp, self._index_path)
+
+    def path(self, ticker):
+        safe = str(ticker).replace('/', '_').replace('\\', '_')
+        return os.path.join(self.root, f"{safe}.parquet")
+
+    def load(self, ticker):
+        """Gespeicherte Historie eines Tickers (leer, falls nicht vorhanden)."""
+        path = self.path(ticker)
+        if not os.path.exists(path):
+            return pd.DataFrame()
+        return pd.read_parquet(path)
+
+    def save(self, ticker, df):
+        """Schreibt die Historie eines Tickers atomar."""
+        path = self.path(ticker)
+        df.to_parquet(path + '.tmp', index=False)
+        os.replace(path + '.tmp', path)
+
+    def _download(self, ticker, start=None, end=None, period=None):
+        import yfinance as yf
+
+        stock = yf.Ticker(ticker)
+        if period is not None:
+            df = stock.history(period=period)
+        else:
+            df = stock.history(start=start, end=end)
+        return df.reset_index()  # Datum als Spalte
+
+    def update_ticker(self, ticker, period="1y", today=None):
+        """
+        Lädt nur den fehlenden Zeitraum eines Tickers nach (ab dem letzten
+        gespeicherten Tag, der dabei aktualisiert wird). Haben sich die Kurse
+        durch einen Split oder eine Dividende neu adjustiert, wird der
+        gesamte gespeicherte Zeitraum neu geladen.
+
+        Returns:
+            Anzahl neu gespeicherter Tage
+        """
+        today = pd.Timestamp(today or pd.Timestamp.now()).normalize()
+        wanted_start = period_start(period, today)
+        stored = self.load(ticker)
+        previous = len(stored)
+        meta = self._index.get(ticker, {})
+
+        if stored.empty:
+            new_parts = [self._download(ticker, period=period)]
+            covered_from = wanted_start
+        else:
+            dates = _naive_dates(stored['Date'])
+            first, last = dates.min(), dates.max()
+            covered = meta.get('covered_from', first)
+            covered_from = None if covered == 'max' else pd.Timestamp(covered)
+            new_parts = []
+
+            # Ältere Daten nachladen, falls der Zeitraum vergrößert wurde
+            if covered_from is not None and (wanted_start is None or wanted_start < covered_from):
+                start = None if wanted_start is None else wanted_start.strftime('%Y-%m-%d')
+                if start is None:
+                    new_parts.append(self._download(ticker, period='max'))
+                else:
+                    new_parts.append(self._download(ticker, start=start, end=first.strftime('%Y-%m-%d')))
+                covered_from = wanted_start
+
+            # Neue Tage ab dem vorletzten gespeicherten Tag: ein während der
+            # Handelszeit gespeicherter, unvollständiger letzter Tag wird durch
+            # den neu geladenen ersetzt (drop_duplicates keep='last'); der
+            # vollständige Tag davor dient zum Vergleich der Adjustierung
+            unique_days = dates.drop_duplicates().sort_values()
+            anchor = unique_days.iloc[-2] if len(unique_days) > 1 else last
+            end = (today + pd.Timedelta(days=1)).strftime('%Y-%m-%d')
+            recent = self._download(ticker, start=anchor.strftime('%Y-%m-%d'), end=end)
+
+            if _adjustment_changed(stored, recent, anchor, last):
+                print(f"  {ticker}: Kurse neu adjustiert (Split/Dividende), lade gesamten Zeitraum neu")
+                if covered_from is None:
+                    full = self._download(ticker, period='max')
+                else:
+                    full = self._download(ticker, start=covered_from.strftime('%Y-%m-%d'), end=end)
+                stored = pd.DataFrame()
+                new_parts = [full]
+            else:
+                new_parts.append(recent)
+
+        new_parts = [part for part in new_parts if not part.empty]
+        added = 0
+        if new_parts:
+            combined = pd.concat([stored] + new_parts, ignore_index=True) if not stored.empty \
+                else pd.concat(new_parts, ignore_index=True)
+            combined = combined.assign(_day=_naive_dates(combined['Date']))
+            combined = combined.drop_duplicates(subset='_day', keep='last').sort_values('_day')
+            added = len(combined) - previous
+            self.save(ticker, combined.drop(columns='_day').reset_index(drop=True))
+
+        with self._index_lock:
+            self._index[ticker] = {
+                'covered_from': 'max' if covered_from is None else covered_from.strftime('%Y-%m-%d'),
+                'updated_at': pd.Timestamp.now().isoformat(timespec='seconds'),
+            }
+        return added
+
+    def refresh(self, tickers, period="1y"):
+        """Aktualisiert mehrere Ticker parallel (max_workers Threads)."""
+        results = {}
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = {executor.submit(self.update_ticker, ticker, period): ticker for ticker in tickers}
+            for future in as_completed(futures):
+                ticker = futures[future]
+                try:
+                    results[ticker] = future.result()
+                    print(f"✓ {ticker}: +{results[ticker]} Tage")
+                except Exception as e:
+                    results[ticker] = None
+                    print(f"✗ {ticker}: Fehler - {e}")
+
+        with self._index_lock:
+            self._write_index()
+        return results
+
+    def get(self, ticker, period="1y", today=None):
+        """Historie eines Tickers für den gewünschten Zeitraum (nur aus dem Speicher)."""
+        df = self.load(ticker)
+        if df.empty:
+            return df
+        start = period_start(period, today)
+        if start is not None:
+            df = df[_naive_dates(df['Date']) >= start]
+        return df.reset_index(drop=True)
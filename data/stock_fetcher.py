@@ -1,5 +1,8 @@
-import yfinance as yf
 import pandas as pd
+try:
+    from data.price_store import PriceStore
+except ImportError:
+    from price_store import PriceStore
 
 # Die 10 Unternehmen
 COMPANIES = {
@@ -16,28 +19,64 @@ COMPANIES = {
 }
 
 
+def _prepare_stock_frame(df, ticker):
+    """Ergänzt Ticker, Unternehmen und Tagesrendite."""
+    df = df.copy()
+    df['Ticker'] = ticker
+    df['Company'] = COMPANIES.get(ticker, ticker)
+    df['Daily_Return'] = df['Close'].pct_change()
+    return df
+
+
 def fetch_stock_data(ticker, period="1y"):
     """Holt Kursdaten für einen Ticker."""
+    import yfinance as yf
+
     stock = yf.Ticker(ticker)
     df = stock.history(period=period)
     df = df.reset_index()  # Datum als Spalte
-    df['Ticker'] = ticker
-    df['Company'] = COMPANIES.get(ticker, ticker)
-    df['Daily_Return'] = df['Close'].pct_change()
-    return df
+    return _prepare_stock_frame(df, ticker)
 
 
-def fetch_all_stocks(tickers=None, period="1y"):
-    """Holt Daten für alle (oder ausgewählte) Unternehmen."""
+def fetch_all_stocks(tickers=None, period="1y", store=None, offline=False):
+    """
+    Holt Daten für alle (oder ausgewählte) Unternehmen.
+    
+    Args:
+        tickers: Liste der Ticker (Standard: COMPANIES)
+        period: Zeitraum ('1y', '6mo', ...)
+        store: PriceStore (Standard: lokaler Parquet-Speicher);
+               False = ohne Speicher direkt von Yahoo laden
+        offline: Nur aus dem lokalen Speicher lesen (kein Download)
+    """
     if tickers is None:
         tickers = list(COMPANIES.keys())
     
+    if store is False:
+        all_data = []
+        for ticker in tickers:
+            print(f"Lade {ticker}...")
+            df = fetch_stock_data(ticker, period)
+            all_data.append(df)
+        return pd.concat(all_data, ignore_index=True)
+    
+    if store is None:
+        store = PriceStore()
+    
+    # Nur fehlende Tage parallel nachladen
+    if not offline:
+        store.refresh(tickers, period)
+    
     all_data = []
     for ticker in tickers:
-        print(f"Lade {ticker}...")
-        df = fetch_stock_data(ticker, period)
-        all_data.append(df)
+        df = store.get(ticker, period)
+        if df.empty:
+            print(f"  Keine gespeicherten Kurse für {ticker}")
+            continue
+        all_data.append(_prepare_stock_frame(df, ticker))
     
+    if not all_data:
+        return pd.DataFrame()
     return pd.concat(all_data, ignore_index=True)
 
 
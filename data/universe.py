@@ -0,0 +1,96 @@
+"""
+Ticker-Universum laden und auf Shards verteilen.
+
+Ein Universum ist eine Zuordnung Ticker → Unternehmensname. Unterstützte
+Dateiformate:
+
+    universe.csv / .txt   eine Zeile pro Ticker: "AAPL,Apple" (auch ; oder Tab,
+                          Name optional, Kopfzeile "ticker,company" erlaubt,
+                          Kommentare mit #)
+    universe.json         {"AAPL": "Apple", ...} oder ["AAPL", ...]
+"""
+import json
+import zlib
+
+try:
+    from data.stock_fetcher import COMPANIES
+except ImportError:
+    from stock_fetcher import COMPANIES
+
+
+DEFAULT_UNIVERSE = dict(COMPANIES)
+HEADER_NAMES = {'ticker', 'symbol'}
+
+
+def _split_line(line):
+    for sep in ('\t', ';', ','):
+        if sep in line:
+            ticker, name = line.split(sep, 1)
+            return ticker.strip(), name.strip().strip('"')
+    return line.strip(), ''
+
+
+def load_universe(path):
+    """
+    Liest eine Universe-Datei.
+
+    Returns:
+        dict {Ticker: Unternehmensname} in Dateireihenfolge
+    """
+    if path.lower().endswith('.json'):
+        with open(path, encoding='utf-8') as f:
+            data = json.load(f)
+        if isinstance(data, list):
+            data = {ticker: ticker for ticker in data}
+        universe = {str(t).strip().upper(): str(name).strip() or str(t).strip().upper()
+                    for t, name in data.items()}
+    else:
+        universe = {}
+        with open(path, encoding='utf-8-sig') as f:
+            for line in f:
+                line = line.split('#', 1)[0].strip()
+                if not line:
+                    continue
+                ticker, name = _split_line(line)
+                if not universe and ticker.lower() in HEADER_NAMES:
+                    continue
+                ticker = ticker.strip('"').upper()
+                universe[ticker] = name or ticker
+
+    if not universe:
+        raise ValueError(f"Universum ist leer: {path}")
+    return universe
+
+
+def parse_shard(text):
+    """'2/8' → (2, 8); Shards werden ab 0 gezählt (0 <= i < N)."""
+    try:
+        index, count = (int(part) for part in text.split('/'))
+    except ValueError:
+        raise ValueError(f"Ungültiger Shard '{text}' (erwartet i/N, z.B. 0/4)")
+    if count < 1 or not 0 <= index < count:
+        raise ValueError(f"Ungültiger Shard '{text}' (0 <= i < N)")
+    return index, count
+
+
+def shard_universe(universe, index, count):
+    """
+    Teilt das Universum in count Shards und gibt Shard index (ab 0) zurück.
+
+    Die Zuordnung hängt nur vom Ticker ab (CRC32), nicht von der Reihenfolge
+    oder Größe der Datei: ein Ticker bleibt im selben Shard, auch wenn andere
+    Ticker hinzukommen oder entfallen.
+    """
+    return {ticker: name for ticker, name in universe.items()
+            if zlib.crc32(ticker.encode('utf-8')) % count == index}
+
+
+def use_universe(universe):
+    """
+    Setzt das Universum für den gesamten Prozess.
+
+    Die Fetcher verwenden COMPANIES als Standard-Tickerliste und für die
+    Unternehmensnamen (Suchbegriffe der Nachrichtenquellen).
+    """
+    COMPANIES.clear()
+    COMPANIES.update(universe)
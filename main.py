@@ -7,220 +7,203 @@ Dieses Skript führt die gesamte Pipeline aus:
 3. Volatilitätsberechnung
 4. Korrelationsanalyse
 5. Visualisierung
+
+Jede Stufe legt ihr Ergebnis als Artefakt unter .cache/pipeline ab; Stufen
+mit unveränderten Eingaben werden beim nächsten Lauf übersprungen.
+
+Aufruf:
+    python main.py                      # unveränderte Stufen überspringen
+    python main.py --resume             # Downloads aus dem letzten Lauf übernehmen
+    python main.py --from-stage stats   # ab 'stats' neu berechnen
+    python main.py --force              # alles neu berechnen
+    python main.py --report             # Laufbericht (Zeit, Speicher, Durchsatz)
+    python main.py --profile sentiment  # + cProfile-Profil der Stufe
+
+Große Universen (Universe-Datei, auf Shards verteilt):
+    python main.py run --universe sp500.csv --shard 0/4 --workers 8
+    ...
+    python main.py run --universe sp500.csv --shard 3/4 --workers 8
+    python main.py merge shard-0-of-4 shard-1-of-4 shard-2-of-4 shard-3-of-4 \\
+        --universe sp500.csv --output results
 """
 
+import argparse
+import contextlib
 import os
-import pandas as pd
+import sys
 from dotenv import load_dotenv
 
 
-from data.stock_fetcher import fetch_all_stocks, COMPANIES
-from data.news_fetcher import fetch_all_news
-from sentiment.finbert_analyzer import analyze_dataframe, aggregate_daily_sentiment
-from analysis.volatility import calculate_volatility_by_ticker
-from analysis.correlation import (
-    merge_sentiment_volatility, 
-    calculate_all_correlations,
-    calculate_correlation,
-    print_correlation_summary,
-    lead_lag_analysis
-)
-from visualizations.plots import (
-    plot_sentiment_vs_volatility, 
-    plot_correlation_scatter,
-    plot_lead_lag_heatmap
-)
-from visualizations.dashboard import save_dashboard
+# Schwere Abhängigkeiten (torch/transformers, yfinance, plotly) werden erst
+# in der jeweiligen Stufe importiert, damit der Import schnell bleibt.
+from analysis.estimators import ESTIMATORS
+from data.universe import DEFAULT_UNIVERSE, load_universe, parse_shard, shard_universe, use_universe
+from pipeline.metrics import RunReport
+from pipeline.runner import DEFAULT_PIPELINE_DIR, PipelineStop
+from pipeline.stages import build_merge_pipeline, build_pipeline
 
 
 load_dotenv()
 NEWSAPI_KEY = os.getenv("NEWSAPI_KEY")  # Optional
 FINNHUB_KEY = os.getenv("FINNHUB_KEY")  # Optional
 
+STAGES = ['prices', 'news', 'sentiment', 'volatility', 'merge', 'stats', 'plots']
+COMMANDS = ('run', 'merge')
+REPORT_FILE = 'run_report.json'
+
+
+def _add_analysis_args(parser):
+    parser.add_argument('--universe', help="Universe-Datei (.csv/.txt/.json, Ticker → Unternehmen)")
+    parser.add_argument('--window', type=int, default=20, help="Volatilitäts-Fenster in Tagen")
+    parser.add_argument('--max-lag', type=int, default=5, help="Maximale Verschiebung (Lead-Lag)")
+    parser.add_argument('--workers', type=int, default=None,
+                        help="Prozesse für FinBERT, Resampling und Plots (Standard: CPU-Kerne)")
+    parser.add_argument('--resamples', type=int, default=10000,
+                        help="Permutationen/Bootstrap-Stichproben pro Ticker")
+    parser.add_argument('--seed', type=int, default=42, help="Seed der Resampling-Tests")
+    parser.add_argument('--output', help="Ausgabeverzeichnis (CSV, plots/)")
+    parser.add_argument('--resume', action='store_true',
+                        help="Kurse/Nachrichten nicht neu laden, letztes Artefakt verwenden")
+    parser.add_argument('--from-stage', choices=STAGES,
+                        help="Diese und alle folgenden Stufen neu berechnen")
+    parser.add_argument('--force', action='store_true', help="Alle Stufen neu berechnen")
+    parser.add_argument('--report', nargs='?', const=REPORT_FILE, metavar='PFAD',
+                        help=f"Laufbericht als JSON schreiben (Standard: <output>/{REPORT_FILE})")
+    parser.add_argument('--profile', choices=STAGES, metavar='STUFE',
+                        help="Stufe mit cProfile profilieren (schreibt auch den Laufbericht)")
+
+
+def _shard_arg(text):
+    try:
+        return parse_shard(text)
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(str(e))
+
+
+def parse_args(argv=None):
+    argv = list(sys.argv[1:] if argv is None else argv)
+    # Ohne Unterbefehl wie bisher: 'run'
+    if not argv or argv[0] not in COMMANDS + ('-h', '--help'):
+        argv.insert(0, 'run')
+
+    parser = argparse.ArgumentParser(description="Sentiment-Analyse und Aktienvolatilität")
+    commands = parser.add_subparsers(dest='command')
+
+    run = commands.add_parser('run', help="Pipeline ausführen (Standard)")
+    _add_analysis_args(run)
+    run.add_argument('--period', default='1y', help="Zeitraum der Kurse (yfinance, z.B. 6mo, 1y, 2y)")
+    run.add_argument('--estimator', default='Volatility', choices=['Volatility', *sorted(ESTIMATORS)],
+                     help="Volatilitätsschätzer (Standard: Spalte 'Volatility')")
+    run.add_argument('--shard', type=_shard_arg, metavar='i/N',
+                     help="Nur Shard i von N des Universums bearbeiten (ab 0, z.B. 0/4)")
+
+    merge = commands.add_parser('merge', help="Ergebnisse mehrerer Shard-Läufe zusammenführen")
+    merge.add_argument('shard_dirs', nargs='+', help="Ausgabeverzeichnisse der Shard-Läufe")
+    _add_analysis_args(merge)
+
+    args = parser.parse_args(argv)
+    args.shard = getattr(args, 'shard', None)
+    return args
+
+
+def _load_universe(args):
+    universe = load_universe(args.universe) if args.universe else dict(DEFAULT_UNIVERSE)
+    print(f"Universum: {len(universe)} Ticker" + (f" aus {args.universe}" if args.universe else ""))
+    return universe
+
+
+def build_from_args(args):
+    """Pipeline und Ausgabeverzeichnis für die Kommandozeilen-Argumente."""
+    universe = _load_universe(args)
+
+    if args.command == 'merge':
+        output_dir = args.output or '.'
+        pipeline = build_merge_pipeline(
+            args.shard_dirs,
+            tickers=list(universe) if args.universe else None,
+            window=args.window,
+            max_lag=args.max_lag,
+            output_dir=output_dir,
+            plots_dir=os.path.join(output_dir, 'plots'),
+            n_resamples=args.resamples,
+            seed=args.seed,
+            n_workers=args.workers,
+            root=os.path.join(DEFAULT_PIPELINE_DIR, 'merge'),
+        )
+        return pipeline, output_dir
+
+    root = None
+    output_dir = args.output or '.'
+    if args.shard:
+        index, count = args.shard
+        universe = shard_universe(universe, index, count)
+        name = f"shard-{index}-of-{count}"
+        print(f"Shard {index}/{count}: {len(universe)} Ticker")
+        # Eigene Artefakte pro Shard, damit sich Shards nicht gegenseitig verdrängen
+        root = os.path.join(DEFAULT_PIPELINE_DIR, name)
+        output_dir = args.output or name
+        if not universe:
+            raise PipelineStop(f"Shard {index}/{count} enthält keine Ticker")
+
+    # Fetcher verwenden COMPANIES für Tickerliste und Suchbegriffe
+    use_universe(universe)
+
+    pipeline = build_pipeline(
+        tickers=list(universe),
+        period=args.period,
+        window=args.window,
+        max_lag=args.max_lag,
+        estimator=args.estimator,
+        newsapi_key=NEWSAPI_KEY,
+        finnhub_key=FINNHUB_KEY,
+        output_dir=output_dir,
+        plots_dir=os.path.join(output_dir, 'plots'),
+        n_resamples=args.resamples,
+        seed=args.seed,
+        n_workers=args.workers,
+        root=root,
+    )
+    return pipeline, output_dir
+
+
+def main(argv=None):
+    args = parse_args(argv)
 
-def main():
     print("=" * 60)
     print("PROJEKT: SENTIMENT-ANALYSE UND AKTIENVOLATILITÄT")
     print("=" * 60)
-    
-    # 1. DATENAKQUISE
-    print("\n--- SCHRITT 1: Datenakquise ---")
-    
-    # Aktienkurse laden (letztes Jahr für mehr Datenpunkte)
-    print("Lade Aktienkurse...")
-    stock_df = fetch_all_stocks(period="1y")
-    print(f"Aktienkurse geladen: {len(stock_df)} Datensätze")
-    
-    # Nachrichten laden
-    print("\nLade Nachrichten...")
-    # Alle Quellen: Yahoo Finance + NewsAPI + Finnhub + Google News
-    news_df = fetch_all_news(newsapi_key=NEWSAPI_KEY, finnhub_key=FINNHUB_KEY)
-    print(f"Nachrichten geladen: {len(news_df)} Artikel")
-    if not news_df.empty:
-        null_ts = news_df['timestamp'].isna().sum()
-        print(f"  Davon ohne Timestamp: {null_ts}")
-        print("  Beispiele:")
-        for _, row in news_df.head(3).iterrows():
-            print(f"    {row['ticker']} | {row['timestamp']} | {row['title'][:60]}")
-    
-    if news_df.empty:
-        print("\n FEHLER: Keine Nachrichten gefunden!")
-        print("Mögliche Ursachen:")
-        print("  • Yahoo Finance API hat keine Daten zurückgegeben")
-        print("  • Keine API-Keys für NewsAPI/Finnhub konfiguriert")
-        print("  • Netzwerkprobleme")
-        print("\nTipp: Prüfe deine Internetverbindung oder konfiguriere .env mit API-Keys")
-        return
 
-    # 2. SENTIMENT-ANALYSE
-    print("\n--- SCHRITT 2: Sentiment-Analyse (FinBERT) ---")
-    news_df = analyze_dataframe(news_df)
-    
-    # Aggregieren auf Tagesbasis
-    sentiment_daily = aggregate_daily_sentiment(news_df)
-    print(f"Tägliche Sentiment-Werte: {len(sentiment_daily)}")
-
-    # 3. VOLATILITÄT BERECHNEN
-    print("\n--- SCHRITT 3: Volatilitätsberechnung ---")
-    stock_df = calculate_volatility_by_ticker(stock_df, window=20)
-    
-    # 4. DATEN ZUSAMMENFÜHREN
-    print("\n--- SCHRITT 4: Daten zusammenführen ---")
-    merged_df = merge_sentiment_volatility(sentiment_daily, stock_df)
-    print(f"Kombinierte Datensätze: {len(merged_df)}")
-    
-    # Datenpunkte pro Ticker anzeigen
-    print("\nDatensätze pro Ticker:")
-    for ticker in sorted(merged_df['ticker'].unique()):
-        count = len(merged_df[merged_df['ticker'] == ticker])
-        status =  "✓" if count >= 3 else "Nicht ausreichend Punkte"
-        print(f"  {status} {ticker}: {count} Datenpunkte")
-    
-    if len(merged_df) < 10:
-        print("Zu wenige gemeinsame Datenpunkte für eine Analyse!")
-        print("Tipp: Erhöhe den Zeitraum oder die Anzahl der Nachrichten.")
+    report = None
+    try:
+        pipeline, output_dir = build_from_args(args)
+        if args.report or args.profile:
+            path = args.report or REPORT_FILE
+            if path == REPORT_FILE:
+                path = os.path.join(output_dir, REPORT_FILE)
+            report = RunReport(path, profile=args.profile,
+                               meta={'command': args.command, 'argv': sys.argv[1:] if argv is None else argv})
+        with report or contextlib.nullcontext():
+            pipeline.run(resume=args.resume, from_stage=args.from_stage, force=args.force,
+                         report=report)
+    except PipelineStop as stop:
+        print(f"\n{stop}")
         return
+    finally:
+        if report is not None:
+            report.print_summary()
+            print(f"\nLaufbericht: {report.path}")
 
-    # 5. ANALYSE
-    print("\n--- SCHRITT 5: Analyse ---")
-    
-    # Gesamtkorrelation
-    results = calculate_all_correlations(merged_df)
-    print_correlation_summary(results)
-    
-    # Statistik pro Ticker
-    print("\n--- Statistik pro Ticker ---")
-    ticker_stats = []
-    for ticker in merged_df['ticker'].unique():
-        ticker_df = merged_df[merged_df['ticker'] == ticker]
-        corr, p = calculate_correlation(ticker_df, 'sentiment_score', 'Volatility')
-        print(f"{ticker}: Korrelation={corr:.3f}, n={len(ticker_df)} Datenpunkte")
-        
-        ticker_stats.append({
-            'Ticker': ticker,
-            'Korrelation_Sentiment_Volatility': corr,
-            'P_Value': p,
-            'Anzahl_Datenpunkte': len(ticker_df),
-            'Durchschnitt_Sentiment': ticker_df['sentiment_score'].mean(),
-            'Durchschnitt_Volatility': ticker_df['Volatility'].mean()
-        })
-    
-    # Lead-Lag Analyse
-    print("\nFühre Lead-Lag-Analyse durch...")
-    lead_lag_results = lead_lag_analysis(merged_df, max_lag=5)
-    
-    # CSV Export mit besserer Formatierung
-    print("\nExportiere Ergebnisse nach Excel...")
-    ticker_stats_df = pd.DataFrame(ticker_stats)
-    
-    # Zahlen auf 4 Dezimalstellen runden
-    ticker_stats_df['Korrelation_Sentiment_Volatility'] = ticker_stats_df['Korrelation_Sentiment_Volatility'].round(4)
-    ticker_stats_df['P_Value'] = ticker_stats_df['P_Value'].round(4)
-    ticker_stats_df['Durchschnitt_Sentiment'] = ticker_stats_df['Durchschnitt_Sentiment'].round(4)
-    ticker_stats_df['Durchschnitt_Volatility'] = ticker_stats_df['Durchschnitt_Volatility'].round(6)
-    
-    # Bessere Spaltennamen
-    ticker_stats_df.columns = ['Ticker', 'Korrelation', 'P-Wert', 'Datenpunkte', 'avg Sentiment', 'avg Volatility']
-    ticker_stats_df.to_csv('results_correlation_per_ticker.csv', index=False, sep=';', decimal=',')
-    
-    # Gesamtstatistik
-    overall_stats = pd.DataFrame([
-        {
-            'Analyse': 'Sentiment vs Volatility',
-            'Korrelation': round(results['sentiment_vs_volatility']['correlation'], 4),
-            'P-Wert': round(results['sentiment_vs_volatility']['p_value'], 4),
-            'Interpretation': 'Haupthypothese'
-        },
-        {
-            'Analyse': 'Sentiment vs Rendite',
-            'Korrelation': round(results['sentiment_vs_return']['correlation'], 4),
-            'P-Wert': round(results['sentiment_vs_return']['p_value'], 4),
-            'Interpretation': 'Vergleichswert'
-        },
-        {
-            'Analyse': '|Sentiment| vs Volatility',
-            'Korrelation': round(results['abs_sentiment_vs_volatility']['correlation'], 4),
-            'P-Wert': round(results['abs_sentiment_vs_volatility']['p_value'], 4),
-            'Interpretation': 'Extremwert-Analyse'
-        }
-    ])
-    overall_stats.to_csv('results_overall_correlations.csv', index=False, sep=';', decimal=',')
-    
-    print("  ✓ results_correlation_per_ticker.csv (Ticker-Statistik)")
-    print("  ✓ results_overall_correlations.csv (Gesamt-Korrelationen)")
-    
-    # 6. VISUALISIERUNG
-    print("\n--- SCHRITT 6: Visualisierung ---")
-    
-    # Ordner für Plots erstellen
-    if not os.path.exists('plots'):
-        os.makedirs('plots')
-    
-    # Plots für jeden Ticker
-    for ticker in merged_df['ticker'].unique():
-        # Ticker-Name bereinigen (Sonderzeichen entfernen)
-        safe_ticker = str(ticker).strip().replace('\r', '').replace('\n', '')
-        
-        # Zeitreihe
-        fig1 = plot_sentiment_vs_volatility(merged_df, ticker)
-        fig1.write_html(f"plots/{safe_ticker}_sentiment_volatility.html", include_plotlyjs='cdn')
-        
-        # Scatter
-        fig2 = plot_correlation_scatter(merged_df, ticker)
-        fig2.write_html(f"plots/{safe_ticker}_correlation.html", include_plotlyjs='cdn')
-    
-    # Heatmap für alle
-    fig3 = plot_lead_lag_heatmap(lead_lag_results)
-    fig3.write_html("plots/lead_lag_heatmap.html", include_plotlyjs='cdn')
-    
-    # Dashboard erstellen mit Statistiken
-    print("\nErstelle interaktives Dashboard...")
-    ticker_stats_dict = {}
-    for ticker in merged_df['ticker'].unique():
-        ticker_df = merged_df[merged_df['ticker'] == ticker]
-        corr, p = calculate_correlation(ticker_df, 'sentiment_score', 'Volatility')
-        ticker_stats_dict[ticker] = {
-            'correlation': corr,
-            'p_value': p,
-            'n_points': len(ticker_df),
-            'avg_sentiment': ticker_df['sentiment_score'].mean(),
-            'avg_volatility': ticker_df['Volatility'].mean()
-        }
-    
-    dashboard_path = save_dashboard(
-        list(merged_df['ticker'].unique()), 
-        ticker_stats=ticker_stats_dict
-    )
-    print(f"  ✓ {dashboard_path}")
-    
+    plots_dir = os.path.join(output_dir, 'plots')
     print("\n" + "="*60)
     print(" FERTIG! Alle Ergebnisse wurden erstellt.")
     print("="*60)
     print("\n DASHBOARD ÖFFNEN:")
-    print(f"   Öffne: plots/index.html")
+    print(f"   Öffne: {os.path.join(plots_dir, 'index.html')}")
     print("\n Weitere Dateien:")
-    print("   • plots/*.html - Einzelne Visualisierungen")
-    print("   • results_*.csv - Excel-Tabellen")
+    print(f"   • {os.path.join(plots_dir, '*.html')} - Einzelne Visualisierungen")
+    print(f"   • {os.path.join(output_dir, 'results_*.csv')} - Excel-Tabellen")
+    if args.command == 'run' and args.shard:
+        print(f"   • {os.path.join(output_dir, 'merged.parquet')} - Eingabe für 'main.py merge'")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,256 @@
+"""
+Laufbericht: Zeit, Speicher und Durchsatz pro Stufe.
+
+Der Runner misst für jede ausgeführte Stufe Wall- und CPU-Zeit (inkl.
+beendeter Kindprozesse), den Spitzen-Speicher (RSS) und die Zeilenzahl der
+Ein- und Ausgaben. Stufen melden zusätzlich eigene Zähler (z.B. bewertete
+Artikel → Artikel/s) und Latenzen einzelner Anfragen (pro Nachrichtenquelle)
+an den prozessweiten Collector:
+
+    metrics = get_metrics()
+    metrics.count('articles', len(news_df))
+    metrics.request('yahoo', seconds, ok=True)
+
+Solange kein Bericht angefordert ist, ist der Collector deaktiviert und
+jeder Aufruf kehrt nach einer Attributabfrage zurück.
+
+Der Bericht wird als JSON geschrieben; optional wird eine Stufe mit
+cProfile profiliert (.prof, auswertbar mit pstats oder snakeviz).
+"""
+import cProfile
+import datetime
+import json
+import os
+import threading
+import time
+
+import numpy as np
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+PERCENTILES = (50, 90, 99)
+
+
+class Metrics:
+    """Sammelt Zähler und Anfrage-Latenzen der laufenden Stufe (thread-sicher)."""
+
+    def __init__(self):
+        self.enabled = False
+        self._lock = threading.Lock()
+        self._counters = {}
+        self._requests = {}
+
+    def count(self, name, value=1):
+        """Erhöht einen Zähler (z.B. Anzahl verarbeiteter Artikel)."""
+        if not self.enabled:
+            return
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + value
+
+    def request(self, source, seconds, ok=True):
+        """Zeichnet die Dauer einer Anfrage an eine Quelle auf."""
+        if not self.enabled:
+            return
+        with self._lock:
+            self._requests.setdefault(source, []).append((seconds, ok))
+
+    def collect(self):
+        """Gibt (Zähler, Anfragen) seit dem letzten Aufruf zurück und setzt sie zurück."""
+        with self._lock:
+            counters, requests = self._counters, self._requests
+            self._counters, self._requests = {}, {}
+        return counters, requests
+
+
+_default_metrics = Metrics()
+
+
+def get_metrics():
+    """Gibt den prozessweiten Collector zurück."""
+    return _default_metrics
+
+
+def summarize_requests(samples):
+    """Anzahl, Fehler und Latenz-Perzentile (ms) einer Liste von (Sekunden, ok)."""
+    seconds = np.array([s for s, _ in samples], dtype=np.float64)
+    summary = {
+        'requests': len(samples),
+        'errors': sum(1 for _, ok in samples if not ok),
+        'total_s': round(float(seconds.sum()), 3),
+    }
+    if len(seconds):
+        for p, value in zip(PERCENTILES, np.percentile(seconds, PERCENTILES)):
+            summary[f'p{p}_ms'] = round(float(value) * 1000, 1)
+        summary['max_ms'] = round(float(seconds.max()) * 1000, 1)
+    return summary
+
+
+def _cpu_seconds():
+    """CPU-Zeit dieses Prozesses und aller beendeten Kindprozesse."""
+    t = os.times()
+    return t.user + t.system + t.children_user + t.children_system
+
+
+def _reset_peak_rss():
+    """Setzt den Spitzenwert (VmHWM) zurück (Linux); False wenn nicht möglich."""
+    try:
+        with open('/proc/self/clear_refs', 'w') as f:
+            f.write('5')
+        return True
+    except OSError:
+        return False
+
+
+def _peak_rss_mb():
+    """Spitzen-RSS in MB (Linux: seit dem letzten Zurücksetzen, sonst seit Prozessstart)."""
+    try:
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith('VmHWM:'):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux: KB, macOS: Bytes
+    return peak / (1024 * 1024) if peak > 1 << 32 else peak / 1024
+
+
+def _children_peak_rss_mb():
+    """Größter Spitzen-RSS eines beendeten Kindprozesses (z.B. Worker-Pools)."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+    return peak / (1024 * 1024) if peak > 1 << 32 else peak / 1024
+
+
+def _row_counts(outputs):
+    return {name: len(df) for name, df in outputs.items()}
+
+
+class RunReport:
+    """
+    Misst die Stufen eines Pipeline-Laufs und schreibt den JSON-Bericht.
+
+    Args:
+        path: Zieldatei des Berichts (JSON)
+        profile: Name der Stufe, die mit cProfile profiliert wird (optional)
+        profile_path: Zieldatei des Profils (Standard: neben dem Bericht,
+                      <bericht>.<stufe>.prof)
+        meta: Zusätzliche Angaben für den Bericht (z.B. Kommandozeile)
+    """
+
+    def __init__(self, path, profile=None, profile_path=None, meta=None):
+        self.path = path
+        self.profile = profile
+        self.profile_path = profile_path or (
+            f"{os.path.splitext(path)[0]}.{profile}.prof" if profile else None)
+        self.meta = dict(meta or {})
+        self.stages = []
+        self.started_at = datetime.datetime.now().isoformat(timespec='seconds')
+        self._start = time.perf_counter()
+        self._cpu_start = _cpu_seconds()
+        self.metrics = get_metrics()
+
+    def __enter__(self):
+        self.metrics.enabled = True
+        self.metrics.collect()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.metrics.enabled = False
+        self.write()
+        return False
+
+    def skipped(self, name, manifest):
+        self.stages.append({'stage': name, 'status': 'skipped',
+                            'fingerprint': manifest['fingerprint']})
+
+    def run_stage(self, name, fingerprint, inputs, call):
+        """Führt call() aus und misst Zeit, Speicher, Zeilen und Zähler."""
+        record = {'stage': name, 'status': 'failed', 'fingerprint': fingerprint,
+                  'rows_in': {f"{dep}.{output}": n
+                              for dep, outputs in inputs.items()
+                              for output, n in _row_counts(outputs).items()}}
+        self.stages.append(record)
+        self.metrics.collect()
+        rss_scope = 'stage' if _reset_peak_rss() else 'process'
+        profiler = cProfile.Profile() if name == self.profile else None
+
+        cpu_start = _cpu_seconds()
+        start = time.perf_counter()
+        try:
+            outputs = profiler.runcall(call) if profiler is not None else call()
+        except Exception as exc:
+            record['error'] = f"{type(exc).__name__}: {exc}"
+            raise
+        finally:
+            wall = time.perf_counter() - start
+            cpu = _cpu_seconds() - cpu_start
+            counters, requests = self.metrics.collect()
+            record.update({
+                'wall_s': round(wall, 3),
+                'cpu_s': round(cpu, 3),
+                'cpu_utilization': round(cpu / wall, 2) if wall > 0 else None,
+                'peak_rss_mb': _round(_peak_rss_mb()),
+                'peak_rss_scope': rss_scope,
+                'children_peak_rss_mb': _round(_children_peak_rss_mb()),
+                'counters': counters,
+                'rates': {f"{key}_per_s": round(value / wall, 2)
+                          for key, value in counters.items() if wall > 0},
+                'requests': {source: summarize_requests(samples)
+                             for source, samples in sorted(requests.items())},
+            })
+            if profiler is not None:
+                os.makedirs(os.path.dirname(os.path.abspath(self.profile_path)), exist_ok=True)
+                profiler.dump_stats(self.profile_path)
+                record['profile'] = self.profile_path
+
+        record['status'] = 'ran'
+        record['rows_out'] = _row_counts(outputs)
+        return outputs
+
+    def to_dict(self):
+        return {
+            'started_at': self.started_at,
+            'wall_s': round(time.perf_counter() - self._start, 3),
+            'cpu_s': round(_cpu_seconds() - self._cpu_start, 3),
+            'peak_rss_mb': _round(max((s['peak_rss_mb'] for s in self.stages
+                                       if s.get('peak_rss_mb') is not None), default=None)),
+            'meta': self.meta,
+            'stages': self.stages,
+        }
+
+    def write(self):
+        """Schreibt den Bericht atomar nach self.path."""
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+        tmp = self.path + '.tmp'
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(self.to_dict(), f, indent=2, default=str)
+        os.replace(tmp, self.path)
+
+    def print_summary(self):
+        """Kurze Tabelle der gemessenen Stufen auf der Konsole."""
+        print(f"\n{'Stufe':<12}{'Wall s':>9}{'CPU s':>9}{'RSS MB':>9}  Zeilen / Durchsatz")
+        for s in self.stages:
+            if s['status'] == 'skipped':
+                print(f"{s['stage']:<12}{'übersprungen':>27}")
+                continue
+            rows = sum((s.get('rows_out') or {}).values())
+            rates = ", ".join(f"{k}={v}" for k, v in s['rates'].items())
+            rss = s['peak_rss_mb']
+            print(f"{s['stage']:<12}{s['wall_s']:>9.2f}{s['cpu_s']:>9.2f}"
+                  f"{(f'{rss:.0f}' if rss is not None else '-'):>9}  {rows}" + (f" | {rates}" if rates else ""))
+            for source, r in s['requests'].items():
+                print(f"{'':<12}{source}: {r['requests']} Anfragen, {r['errors']} Fehler, "
+                      f"p50={r.get('p50_ms')}ms p90={r.get('p90_ms')}ms p99={r.get('p99_ms')}ms")
+
+
+def _round(value):
+    return round(value, 1) if value is not None else None
@@ -0,0 +1,311 @@
+"""
+Stufen-Runner mit Checkpoints auf der Festplatte.
+
+Jede Stufe schreibt ihre Ergebnisse (DataFrames) als Parquet-Dateien in ein
+Verzeichnis, dessen Name ein Fingerprint ihrer Eingaben ist:
+
+    .cache/pipeline/<stufe>/<fingerprint>/<ausgabe>.parquet
+    .cache/pipeline/<stufe>/<fingerprint>/manifest.json
+
+Der Fingerprint setzt sich zusammen aus Stufenname, Parametern, dem Inhalt
+der zugehörigen Quelldateien und dem Inhalts-Hash der Eingabe-Artefakte.
+Existiert ein Artefakt mit demselben Fingerprint bereits, wird die Stufe
+übersprungen. Da der Inhalts-Hash (nicht der Fingerprint) der Eingaben
+zählt, bleiben nachfolgende Stufen auch dann übersprungen, wenn eine
+Quellstufe neu lief, aber dieselben Daten geliefert hat.
+
+Quellstufen (Download) haben keine lokalen Eingaben; ihr Fingerprint
+enthält das aktuelle Datum, d.h. sie laufen höchstens einmal pro Tag. Mit
+resume/from_stage wird stattdessen das neueste Artefakt mit denselben
+Parametern (z.B. Ticker, Zeitraum) wiederverwendet.
+
+Mit einem RunReport (pipeline.metrics) werden Zeit, Speicher und Durchsatz
+jeder ausgeführten Stufe gemessen und als JSON-Bericht geschrieben.
+"""
+import datetime
+import hashlib
+import json
+import os
+import shutil
+import time
+
+import pandas as pd
+
+
+DEFAULT_PIPELINE_DIR = os.environ.get('PIPELINE_DIR', os.path.join('.cache', 'pipeline'))
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class PipelineStop(Exception):
+    """Bricht die Pipeline ab (z.B. zu wenige Daten); kein Programmfehler."""
+
+
+def hash_frame(df):
+    """Inhalts-Hash eines DataFrames (Spalten, Datentypen und Werte)."""
+    digest = hashlib.sha256()
+    digest.update(json.dumps([list(map(str, df.columns)), list(map(str, df.dtypes))]).encode())
+    if len(df):
+        digest.update(pd.util.hash_pandas_object(df, index=False).to_numpy().tobytes())
+    return digest.hexdigest()
+
+
+def hash_files(paths):
+    """Hash über den Inhalt von Quelldateien (relativ zum Projektverzeichnis)."""
+    digest = hashlib.sha256()
+    for path in sorted(paths):
+        digest.update(path.encode())
+        with open(os.path.join(PROJECT_ROOT, path), 'rb') as f:
+            digest.update(f.read())
+    return digest.hexdigest()
+
+
+class Stage:
+    """
+    Eine Stufe der Pipeline.
+
+    Args:
+        name: Eindeutiger Name (z.B. 'prices')
+        func: Funktion func(inputs, **params) -> dict {ausgabe: DataFrame};
+              inputs ist ein dict {abhängigkeit: {ausgabe: DataFrame}}.
+              Eine Ausgabe 'files' mit Spalte 'path' listet erzeugte Dateien,
+              die vor dem Überspringen auf Existenz geprüft werden.
+        deps: Namen der Stufen, deren Ausgaben benötigt werden
+        params: Parameter (JSON-serialisierbar), gehen in den Fingerprint ein
+        code: Quelldateien, deren Änderung die Stufe neu auslöst
+        source: True für Stufen ohne lokale Eingaben (Download)
+        options: Weitere Argumente für func, die weder in den Fingerprint noch
+                 ins Manifest eingehen (z.B. API-Keys)
+        title: Überschrift in der Konsolenausgabe
+    """
+
+    def __init__(self, name, func, deps=(), params=None, code=(), source=False, options=None,
+                 title=None):
+        self.name = name
+        self.title = title or name
+        self.func = func
+        self.deps = tuple(deps)
+        self.params = dict(params or {})
+        self.code = tuple(code)
+        self.source = source
+        self.options = dict(options or {})
+
+    def fingerprint(self, input_hashes):
+        payload = {
+            'stage': self.name,
+            'params': self.params,
+            'code': hash_files(self.code),
+            'inputs': input_hashes,
+        }
+        if self.source:
+            payload['date'] = datetime.date.today().isoformat()
+        encoded = json.dumps(payload, sort_keys=True, default=str).encode()
+        return hashlib.sha256(encoded).hexdigest()[:16]
+
+
+class Pipeline:
+    """
+    Führt Stufen in Reihenfolge aus und verwaltet deren Artefakte.
+
+    Args:
+        stages: Liste von Stage (Abhängigkeiten vor abhängigen Stufen)
+        root: Verzeichnis für Artefakte
+        keep: Anzahl aufbewahrter Artefakte pro Stufe
+    """
+
+    def __init__(self, stages, root=DEFAULT_PIPELINE_DIR, keep=3):
+        self.stages = list(stages)
+        self.by_name = {stage.name: stage for stage in self.stages}
+        self.root = root
+        self.keep = keep
+        for stage in self.stages:
+            unknown = [d for d in stage.deps if d not in self.by_name]
+            if unknown:
+                raise ValueError(f"Stufe {stage.name}: unbekannte Abhängigkeiten {unknown}")
+
+    @property
+    def names(self):
+        return [stage.name for stage in self.stages]
+
+    def downstream(self, name):
+        """Stufe name und alle (transitiv) davon abhängigen Stufen."""
+        result = {name}
+        for stage in self.stages:
+            if any(dep in result for dep in stage.deps):
+                result.add(stage.name)
+        return result
+
+    # --- Artefakte -------------------------------------------------------
+
+    def _stage_dir(self, name):
+        return os.path.join(self.root, name)
+
+    def _read_manifest(self, name, fingerprint):
+        path = os.path.join(self._stage_dir(name), fingerprint, 'manifest.json')
+        if not os.path.exists(path):
+            return None
+        with open(path, encoding='utf-8') as f:
+            return json.load(f)
+
+    def _latest_manifest(self, name, params=None):
+        """
+        Neuestes Artefakt einer Stufe; mit params nur eines mit genau diesen
+        Parametern (andere Ticker oder ein anderer Zeitraum passen nicht).
+        """
+        stage_dir = self._stage_dir(name)
+        path = os.path.join(stage_dir, 'latest.json')
+        if not os.path.exists(path):
+            return None
+        with open(path, encoding='utf-8') as f:
+            manifest = self._read_manifest(name, json.load(f)['fingerprint'])
+        if params is None:
+            return manifest
+
+        # Wie im Manifest gespeichert (JSON), damit Tupel/Listen gleich verglichen werden
+        wanted = json.loads(json.dumps(params, default=str))
+        if manifest is not None and manifest['params'] == wanted:
+            return manifest
+        entries = [e for e in os.scandir(stage_dir) if e.is_dir() and not e.name.endswith('.tmp')]
+        entries.sort(key=lambda e: e.stat().st_mtime, reverse=True)
+        for entry in entries:
+            manifest = self._read_manifest(name, entry.name)
+            if manifest is not None and manifest['params'] == wanted:
+                return manifest
+        return None
+
+    def _is_complete(self, manifest):
+        """Alle Parquet-Dateien und die von der Stufe erzeugten Dateien vorhanden?"""
+        directory = os.path.join(self._stage_dir(manifest['stage']), manifest['fingerprint'])
+        for output in manifest['outputs']:
+            if not os.path.exists(os.path.join(directory, f"{output}.parquet")):
+                return False
+        return all(os.path.exists(path) for path in manifest.get('files', []))
+
+    def _write(self, stage, fingerprint, outputs, input_hashes, duration):
+        """Schreibt Ausgaben + Manifest atomar (temporäres Verzeichnis + Umbenennen)."""
+        stage_dir = self._stage_dir(stage.name)
+        final = os.path.join(stage_dir, fingerprint)
+        tmp = final + '.tmp'
+        shutil.rmtree(tmp, ignore_errors=True)
+        os.makedirs(tmp)
+
+        hashes = {}
+        for output, df in outputs.items():
+            df.to_parquet(os.path.join(tmp, f"{output}.parquet"), index=False)
+            hashes[output] = hash_frame(df)
+
+        files = []
+        if 'files' in outputs and 'path' in outputs['files'].columns:
+            files = [str(p) for p in outputs['files']['path']]
+
+        manifest = {
+            'stage': stage.name,
+            'fingerprint': fingerprint,
+            'params': stage.params,
+            'inputs': input_hashes,
+            'outputs': sorted(outputs),
+            'output_hashes': hashes,
+            'data_hash': hashlib.sha256(json.dumps(hashes, sort_keys=True).encode()).hexdigest(),
+            'files': files,
+            'created_at': datetime.datetime.now().isoformat(timespec='seconds'),
+            'duration': round(duration, 3),
+        }
+        with open(os.path.join(tmp, 'manifest.json'), 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, indent=2, default=str)
+
+        shutil.rmtree(final, ignore_errors=True)
+        os.replace(tmp, final)
+        latest_tmp = os.path.join(stage_dir, 'latest.json.tmp')
+        with open(latest_tmp, 'w', encoding='utf-8') as f:
+            json.dump({'fingerprint': fingerprint}, f)
+        os.replace(latest_tmp, os.path.join(stage_dir, 'latest.json'))
+        self._prune(stage.name, keep_fingerprint=fingerprint)
+        return manifest
+
+    def _prune(self, name, keep_fingerprint):
+        """Entfernt ältere Artefakte einer Stufe (die neuesten keep bleiben)."""
+        stage_dir = self._stage_dir(name)
+        entries = [e for e in os.scandir(stage_dir) if e.is_dir() and not e.name.endswith('.tmp')]
+        entries.sort(key=lambda e: e.stat().st_mtime, reverse=True)
+        for entry in entries[self.keep:]:
+            if entry.name != keep_fingerprint:
+                shutil.rmtree(entry.path, ignore_errors=True)
+
+    def load(self, manifest):
+        """Lädt die Ausgaben eines Artefakts."""
+        directory = os.path.join(self._stage_dir(manifest['stage']), manifest['fingerprint'])
+        return {output: pd.read_parquet(os.path.join(directory, f"{output}.parquet"))
+                for output in manifest['outputs']}
+
+    # --- Ausführung ------------------------------------------------------
+
+    def run(self, resume=False, from_stage=None, force=False, until=None, report=None):
+        """
+        Führt die Pipeline aus.
+
+        Args:
+            resume: Quellstufen nicht neu laden, sondern ihr letztes Artefakt mit
+                denselben Parametern verwenden (ohne passendes Artefakt: neu laden)
+            from_stage: Diese und alle abhängigen Stufen neu berechnen
+                (vorgelagerte Quellstufen wie bei resume aus dem letzten Artefakt)
+            force: Alle Stufen neu berechnen
+            until: Nach dieser Stufe aufhören
+            report: RunReport (pipeline.metrics) zum Messen der Stufen (optional)
+
+        Returns:
+            dict {stufe: manifest} der ausgeführten bzw. übersprungenen Stufen
+        """
+        if from_stage is not None and from_stage not in self.by_name:
+            raise ValueError(f"Unbekannte Stufe: {from_stage} (verfügbar: {', '.join(self.names)})")
+        forced = set(self.names) if force else (self.downstream(from_stage) if from_stage else set())
+        if report is not None and report.profile and report.profile not in self.by_name:
+            raise ValueError(f"Unbekannte Stufe: {report.profile} (verfügbar: {', '.join(self.names)})")
+        reuse_sources = resume or from_stage is not None
+
+        manifests = {}
+        loaded = {}
+
+        def inputs_for(stage):
+            for dep in stage.deps:
+                if dep not in loaded:
+                    loaded[dep] = self.load(manifests[dep])
+            return {dep: loaded[dep] for dep in stage.deps}
+
+        for stage in self.stages:
+            input_hashes = {dep: manifests[dep]['data_hash'] for dep in stage.deps}
+            fingerprint = stage.fingerprint(input_hashes)
+
+            manifest = None
+            if stage.name not in forced:
+                if stage.source and reuse_sources:
+                    manifest = self._latest_manifest(stage.name, stage.params)
+                    if manifest is None:
+                        print(f"[{stage.name}] kein Artefakt mit diesen Parametern, lade neu")
+                if manifest is None:
+                    manifest = self._read_manifest(stage.name, fingerprint)
+                if manifest is not None and not self._is_complete(manifest):
+                    manifest = None
+
+            print(f"\n--- {stage.title} ---")
+            if manifest is not None:
+                print(f"[{stage.name}] unverändert, verwende Artefakt {manifest['fingerprint']} "
+                      f"({manifest['created_at']})")
+                if report is not None:
+                    report.skipped(stage.name, manifest)
+            else:
+                inputs = inputs_for(stage)
+                start = time.perf_counter()
+                if report is None:
+                    outputs = stage.func(inputs, **stage.params, **stage.options)
+                else:
+                    outputs = report.run_stage(stage.name, fingerprint, inputs,
+                                               lambda: stage.func(inputs, **stage.params, **stage.options))
+                duration = time.perf_counter() - start
+                manifest = self._write(stage, fingerprint, outputs, input_hashes, duration)
+                loaded[stage.name] = outputs
+                print(f"[{stage.name}] fertig in {duration:.1f}s → {manifest['fingerprint']}")
+
+            manifests[stage.name] = manifest
+            if stage.name == until:
+                break
+
+        return manifests
@@ -0,0 +1,363 @@
+"""
+Die Stufen der Analyse-Pipeline.
+
+    prices ─────────────► volatility ─┐
+    news ──► sentiment ───────────────┴─► merge ──► stats ──► plots
+
+Jede Stufe entspricht einem Schritt des bisherigen main(); Ergebnisse werden
+vom Runner als Parquet-Artefakte abgelegt (siehe pipeline.runner).
+
+Große Universen lassen sich auf Shards verteilen: jeder Shard-Lauf schreibt
+seine kombinierten Daten nach <output>/merged.parquet, build_merge_pipeline
+führt sie zusammen und berechnet daraus stats und plots.
+"""
+import os
+
+import pandas as pd
+
+try:
+    from pipeline.metrics import get_metrics
+    from pipeline.runner import Pipeline, PipelineStop, Stage, hash_files
+except ImportError:
+    from metrics import get_metrics
+    from runner import Pipeline, PipelineStop, Stage, hash_files
+
+
+# Kombinierte Daten eines Laufs (Eingabe für das Zusammenführen von Shards)
+MERGED_FILE = 'merged.parquet'
+
+
+def run_prices(inputs, tickers, period):
+    """Schritt 1a: Aktienkurse laden."""
+    from data.stock_fetcher import fetch_all_stocks
+
+    print("Lade Aktienkurse...")
+    stock_df = fetch_all_stocks(tickers=tickers, period=period)
+    print(f"Aktienkurse geladen: {len(stock_df)} Datensätze")
+    if stock_df.empty:
+        raise PipelineStop("Keine Aktienkurse geladen!")
+    return {'prices': stock_df}
+
+
+def run_news(inputs, tickers, sources, newsapi_key=None, finnhub_key=None):
+    """Schritt 1b: Neue Nachrichten abrufen, gesamtes lokales Archiv laden."""
+    from data.news_archive import NewsArchive
+
+    print("Lade Nachrichten...")
+    # Alle Quellen: Yahoo Finance + NewsAPI + Finnhub + Google News
+    # Nur neue Artikel abrufen, ausgewertet wird das gesamte lokale Archiv
+    archive = NewsArchive()
+    metrics = get_metrics()
+    archive.update(tickers=tickers, newsapi_key=newsapi_key, finnhub_key=finnhub_key,
+                   on_request=metrics.request if metrics.enabled else None)
+    news_df = archive.load(tickers=tickers)
+    print(f"Nachrichten geladen: {len(news_df)} Artikel")
+    if not news_df.empty:
+        null_ts = news_df['timestamp'].isna().sum()
+        print(f"  Davon ohne Timestamp: {null_ts}")
+        print("  Beispiele:")
+        for _, row in news_df.head(3).iterrows():
+            print(f"    {row['ticker']} | {row['timestamp']} | {row['title'][:60]}")
+
+    if news_df.empty:
+        print("\n FEHLER: Keine Nachrichten gefunden!")
+        print("Mögliche Ursachen:")
+        print("  • Yahoo Finance API hat keine Daten zurückgegeben")
+        print("  • Keine API-Keys für NewsAPI/Finnhub konfiguriert")
+        print("  • Netzwerkprobleme")
+        raise PipelineStop("Tipp: Prüfe deine Internetverbindung oder konfiguriere .env mit API-Keys")
+    return {'news': news_df}
+
+
+def run_sentiment(inputs, batching='bucket', pipeline=True, model=None, n_workers=1):
+    """
+    Schritt 2: Sentiment-Analyse (FinBERT) und Tagesaggregation.
+
+    model beschreibt den verwendeten Analyzer (Modell, Revision, Backend);
+    es geht nur in den Fingerprint ein, damit z.B. ein Wechsel von 'torch'
+    zu 'onnx-int8' (SENTIMENT_BACKEND) die Scores neu berechnet.
+    """
+    from sentiment.finbert_analyzer import analyze_dataframe, aggregate_daily_sentiment
+    from sentiment.near_duplicates import collapse_near_duplicates
+
+    news_df = inputs['news']['news']
+    metrics = get_metrics()
+    metrics.count('articles', len(news_df))
+    # Syndizierte Fast-Duplikate nur einmal bewerten (Clustergröße als Gewicht)
+    news_df = collapse_near_duplicates(news_df)
+    metrics.count('scored_articles', len(news_df))
+    news_df = analyze_dataframe(news_df, batching=batching, pipeline=pipeline, n_workers=n_workers)
+
+    # Aggregieren auf Tagesbasis
+    sentiment_daily = aggregate_daily_sentiment(news_df)
+    print(f"Tägliche Sentiment-Werte: {len(sentiment_daily)}")
+    return {'articles': news_df, 'daily': sentiment_daily}
+
+
+def run_volatility(inputs, window):
+    """Schritt 3: Volatilitätsberechnung."""
+    from analysis.volatility import calculate_volatility_by_ticker
+    from analysis.estimators import volatility_estimators
+
+    stock_df = calculate_volatility_by_ticker(inputs['prices']['prices'], window=window)
+    # Range-basierte Schätzer (Parkinson, Garman-Klass, Yang-Zhang, EWMA) zusätzlich
+    stock_df = volatility_estimators(stock_df, window=window)
+    return {'volatility': stock_df}
+
+
+def run_merge(inputs, estimator, rolling_window, rolling_min_periods, output_dir):
+    """Schritt 4: Daten zusammenführen."""
+    from analysis.correlation import merge_sentiment_volatility, rolling_correlation
+
+    merged_df = merge_sentiment_volatility(inputs['sentiment']['daily'],
+                                           inputs['volatility']['volatility'],
+                                           volatility=estimator)
+    # Zeitlich veränderliche Korrelation für die Zeitreihen-Plots
+    merged_df = rolling_correlation(merged_df, window=rolling_window, min_periods=rolling_min_periods)
+    print(f"Kombinierte Datensätze: {len(merged_df)}")
+
+    # Für das Zusammenführen von Shards (main.py merge)
+    merged_path = os.path.join(output_dir, MERGED_FILE)
+    os.makedirs(output_dir, exist_ok=True)
+    merged_df.to_parquet(merged_path, index=False)
+    return {'merged': merged_df, 'files': pd.DataFrame({'path': [merged_path]})}
+
+
+def run_stats(inputs, max_lag, n_resamples, block_size, seed, output_dir, n_workers=None):
+    """Schritt 5: Korrelationen, Statistik pro Ticker, Lead-Lag, CSV-Export."""
+    from analysis.correlation import (
+        calculate_all_correlations,
+        compute_ticker_stats,
+        lead_lag_analysis,
+        print_correlation_summary,
+    )
+    from analysis.resampling import resample_by_ticker
+
+    merged_df = inputs['merge']['merged']
+
+    # Statistik pro Ticker (ein Durchlauf; Grundlage für Konsole, CSV und Dashboard)
+    ticker_stats = compute_ticker_stats(merged_df)
+
+    # Datenpunkte pro Ticker anzeigen
+    print("\nDatensätze pro Ticker:")
+    for row in ticker_stats.sort_values('ticker').itertuples():
+        status =  "✓" if row.n_points >= 3 else "Nicht ausreichend Punkte"
+        print(f"  {status} {row.ticker}: {row.n_points} Datenpunkte")
+
+    if len(merged_df) < 10:
+        print("Zu wenige gemeinsame Datenpunkte für eine Analyse!")
+        raise PipelineStop("Tipp: Erhöhe den Zeitraum oder die Anzahl der Nachrichten.")
+
+    # Gesamtkorrelation
+    results = calculate_all_correlations(merged_df)
+    print_correlation_summary(results)
+
+    # Statistik pro Ticker
+    print("\n--- Statistik pro Ticker ---")
+    for row in ticker_stats.itertuples():
+        print(f"{row.ticker}: Korrelation={row.correlation:.3f}, n={row.n_points} Datenpunkte")
+
+    # Lead-Lag Analyse
+    print("\nFühre Lead-Lag-Analyse durch...")
+    lead_lag_results = lead_lag_analysis(merged_df, max_lag=max_lag)
+
+    # Resampling-Tests: robuster gegenüber der Autokorrelation der Rolling Volatility
+    print("Berechne Permutations-p-Werte und Bootstrap-Konfidenzintervalle...")
+    resampled = resample_by_ticker(merged_df, n_resamples=n_resamples, block_size=block_size,
+                                   seed=seed, n_workers=n_workers)
+
+    # CSV Export mit besserer Formatierung
+    print("\nExportiere Ergebnisse nach Excel...")
+    ticker_stats_df = ticker_stats[
+        ['ticker', 'correlation', 'p_value', 'n_points', 'avg_sentiment', 'avg_volatility']
+    ].round({'correlation': 4, 'p_value': 4, 'avg_sentiment': 4, 'avg_volatility': 6})
+
+    # Bessere Spaltennamen
+    ticker_stats_df.columns = ['Ticker', 'Korrelation', 'P-Wert', 'Datenpunkte', 'avg Sentiment', 'avg Volatility']
+    resampled_by_ticker = resampled.set_index('ticker')
+    ticker_stats_df['P-Wert (Permutation)'] = ticker_stats_df['Ticker'].map(resampled_by_ticker['p_permutation']).round(4)
+    ticker_stats_df['KI 95% unten'] = ticker_stats_df['Ticker'].map(resampled_by_ticker['ci_low']).round(4)
+    ticker_stats_df['KI 95% oben'] = ticker_stats_df['Ticker'].map(resampled_by_ticker['ci_high']).round(4)
+
+    os.makedirs(output_dir, exist_ok=True)
+    per_ticker_path = os.path.join(output_dir, 'results_correlation_per_ticker.csv')
+    ticker_stats_df.to_csv(per_ticker_path, index=False, sep=';', decimal=',')
+
+    # Gesamtstatistik
+    labels = [
+        ('sentiment_vs_volatility', 'Sentiment vs Volatility', 'Haupthypothese'),
+        ('sentiment_vs_return', 'Sentiment vs Rendite', 'Vergleichswert'),
+        ('abs_sentiment_vs_volatility', '|Sentiment| vs Volatility', 'Extremwert-Analyse'),
+    ]
+    overall_stats = pd.DataFrame([
+        {
+            'Analyse': label,
+            'Korrelation': round(results[key]['correlation'], 4),
+            'P-Wert': round(results[key]['p_value'], 4),
+            'Interpretation': interpretation
+        }
+        for key, label, interpretation in labels
+    ])
+    overall_path = os.path.join(output_dir, 'results_overall_correlations.csv')
+    overall_stats.to_csv(overall_path, index=False, sep=';', decimal=',')
+
+    print(f"  ✓ {per_ticker_path} (Ticker-Statistik)")
+    print(f"  ✓ {overall_path} (Gesamt-Korrelationen)")
+
+    return {
+        'ticker_stats': ticker_stats,
+        'overall': overall_stats,
+        'lead_lag': lead_lag_results,
+        'resampled': resampled,
+        'files': pd.DataFrame({'path': [per_ticker_path, overall_path]}),
+    }
+
+
+def run_plots(inputs, plots_dir, n_workers=None):
+    """Schritt 6: Visualisierung und Dashboard."""
+    from visualizations.render import render_plots
+    from visualizations.dashboard import save_dashboard
+
+    merged_df = inputs['merge']['merged']
+    ticker_stats = inputs['stats']['ticker_stats']
+    lead_lag_results = inputs['stats']['lead_lag']
+
+    # Plots pro Ticker + Heatmap (parallel, unveränderte Figuren werden übersprungen)
+    files, rendered = render_plots(merged_df, lead_lag_results, plots_dir, n_workers=n_workers)
+    print(f"Plots: {rendered} neu erstellt, {len(files) - 1 - rendered} unverändert")
+
+    # Dashboard erstellen mit Statistiken
+    print("\nErstelle interaktives Dashboard...")
+    dashboard_path = save_dashboard(
+        list(ticker_stats['ticker']),
+        ticker_stats=ticker_stats,
+        output_dir=plots_dir
+    )
+    files.append(dashboard_path)
+    print(f"  ✓ {dashboard_path}")
+    return {'files': pd.DataFrame({'path': files})}
+
+
+def build_pipeline(tickers, period='1y', window=20, max_lag=5, estimator='Volatility',
+                   newsapi_key=None, finnhub_key=None, output_dir='.', plots_dir='plots',
+                   n_resamples=10000, seed=42, n_workers=None, root=None):
+    """
+    Baut die Analyse-Pipeline.
+
+    Args:
+        tickers: Liste der Ticker
+        period: Zeitraum der Kursdaten ('1y', '6mo', ...)
+        window: Fenster der Rolling Volatility in Tagen
+        max_lag: Maximale Verzögerung der Lead-Lag-Analyse
+        estimator: Volatilitäts-Schätzer für die Analyse (siehe analysis.estimators)
+        newsapi_key, finnhub_key: Optionale API-Keys (gehen nicht in den Fingerprint ein)
+        output_dir: Verzeichnis für die CSV-Ergebnisse
+        plots_dir: Verzeichnis für Plots und Dashboard
+        n_resamples: Resamples für Permutations-/Bootstrap-Tests
+        seed: Seed der Resampling-Tests
+        n_workers: Prozesse für FinBERT, Resampling und Plots (Ergebnisse unabhängig davon)
+        root: Verzeichnis für Artefakte (Standard: .cache/pipeline)
+    """
+    from sentiment.finbert_analyzer import get_analyzer
+
+    tickers = list(tickers)
+    analyzer = get_analyzer()
+    model = {'name': analyzer.model_name, 'revision': analyzer.revision,
+             'backend': analyzer.backend_name}
+    stages = [
+        Stage('prices', run_prices, title='SCHRITT 1a: Aktienkurse',
+              params={'tickers': tickers, 'period': period},
+              code=['data/stock_fetcher.py', 'data/price_store.py'], source=True),
+        Stage('news', run_news, title='SCHRITT 1b: Nachrichten',
+              # Nur welche Quellen aktiv sind zählt; die Keys selbst landen nicht im Manifest
+              params={'tickers': tickers,
+                      'sources': {'newsapi': bool(newsapi_key), 'finnhub': bool(finnhub_key)}},
+              options={'newsapi_key': newsapi_key, 'finnhub_key': finnhub_key},
+              code=['data/news_archive.py', 'data/news_fetcher.py', 'data/news_engine.py'], source=True),
+        Stage('sentiment', run_sentiment, title='SCHRITT 2: Sentiment-Analyse (FinBERT)',
+              deps=['news'], params={'batching': 'bucket', 'pipeline': True, 'model': model},
+              options={'n_workers': n_workers or 1},
+              code=['sentiment/finbert_analyzer.py', 'sentiment/near_duplicates.py', 'sentiment/backends.py']),
+        Stage('volatility', run_volatility, title='SCHRITT 3: Volatilitätsberechnung',
+              deps=['prices'], params={'window': window},
+              code=['analysis/volatility.py', 'analysis/estimators.py']),
+        Stage('merge', run_merge, title='SCHRITT 4: Daten zusammenführen',
+              deps=['sentiment', 'volatility'],
+              params={'estimator': estimator, 'rolling_window': 30, 'rolling_min_periods': 10,
+                      'output_dir': output_dir},
+              code=['analysis/correlation.py']),
+        Stage('stats', run_stats, title='SCHRITT 5: Analyse', deps=['merge'],
+              params={'max_lag': max_lag, 'n_resamples': n_resamples, 'block_size': window,
+                      'seed': seed, 'output_dir': output_dir},
+              options={'n_workers': n_workers},
+              code=['analysis/correlation.py', 'analysis/resampling.py']),
+        Stage('plots', run_plots, title='SCHRITT 6: Visualisierung', deps=['merge', 'stats'],
+              params={'plots_dir': plots_dir},
+              options={'n_workers': n_workers},
+              code=['visualizations/plots.py', 'visualizations/render.py', 'visualizations/dashboard.py']),
+    ]
+    kwargs = {'root': root} if root else {}
+    return Pipeline(stages, **kwargs)
+
+
+def run_combine(inputs, shard_dirs, shard_hashes, tickers):
+    """Liest die kombinierten Daten aller Shards und fügt sie zusammen."""
+    frames = []
+    for directory in shard_dirs:
+        df = pd.read_parquet(os.path.join(directory, MERGED_FILE))
+        print(f"  ✓ {directory}: {df['ticker'].nunique()} Ticker, {len(df)} Datensätze")
+        frames.append(df)
+    merged_df = pd.concat(frames, ignore_index=True)
+
+    duplicated = merged_df.duplicated(['ticker', 'date']).sum()
+    if duplicated:
+        print(f"  Warnung: {duplicated} doppelte Zeilen (Ticker in mehreren Shards) entfernt")
+        merged_df = merged_df.drop_duplicates(['ticker', 'date'], keep='first')
+
+    # Reihenfolge wie im Universum (sonst Reihenfolge der Shards)
+    if tickers:
+        order = {ticker: i for i, ticker in enumerate(tickers)}
+        merged_df = (merged_df.assign(_order=merged_df['ticker'].map(order).fillna(len(order)))
+                     .sort_values(['_order', 'ticker', 'date'], kind='stable')
+                     .drop(columns='_order')
+                     .reset_index(drop=True))
+    print(f"Kombinierte Datensätze: {len(merged_df)} ({merged_df['ticker'].nunique()} Ticker)")
+    return {'merged': merged_df}
+
+
+def build_merge_pipeline(shard_dirs, tickers=None, window=20, max_lag=5, output_dir='.',
+                         plots_dir='plots', n_resamples=10000, seed=42, n_workers=None, root=None):
+    """
+    Baut die Pipeline zum Zusammenführen von Shard-Ergebnissen.
+
+    Liest merged.parquet aus jedem Shard-Verzeichnis und berechnet daraus
+    dieselben Ergebnistabellen und Plots wie ein Lauf über das gesamte
+    Universum (Stufen 'stats' und 'plots').
+
+    Args:
+        shard_dirs: Ausgabeverzeichnisse der Shard-Läufe
+        tickers: Reihenfolge der Ticker (z.B. aus der Universe-Datei, optional)
+        Weitere Argumente wie build_pipeline
+    """
+    shard_dirs = list(shard_dirs)
+    for directory in shard_dirs:
+        if not os.path.exists(os.path.join(directory, MERGED_FILE)):
+            raise FileNotFoundError(f"{MERGED_FILE} fehlt in {directory} (Shard-Lauf abgeschlossen?)")
+    shard_hashes = [hash_files([os.path.abspath(os.path.join(d, MERGED_FILE))]) for d in shard_dirs]
+
+    stages = [
+        Stage('merge', run_combine, title='SCHRITT 4: Shards zusammenführen',
+              params={'shard_dirs': shard_dirs, 'shard_hashes': shard_hashes,
+                      'tickers': list(tickers or [])}),
+        Stage('stats', run_stats, title='SCHRITT 5: Analyse', deps=['merge'],
+              params={'max_lag': max_lag, 'n_resamples': n_resamples, 'block_size': window,
+                      'seed': seed, 'output_dir': output_dir},
+              options={'n_workers': n_workers},
+              code=['analysis/correlation.py', 'analysis/resampling.py']),
+        Stage('plots', run_plots, title='SCHRITT 6: Visualisierung', deps=['merge', 'stats'],
+              params={'plots_dir': plots_dir},
+              options={'n_workers': n_workers},
+              code=['visualizations/plots.py', 'visualizations/render.py', 'visualizations/dashboard.py']),
+    ]
+    kwargs = {'root': root} if root else {}
+    return Pipeline(stages, **kwargs)
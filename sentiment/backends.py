@@ -0,0 +1,330 @@
+"""
+Inferenz-Backends für den Sentiment-Analyzer.
+
+- 'torch':      PyTorch fp32 (Standard, CPU oder GPU)
+- 'torch-int8': PyTorch mit dynamischer int8-Quantisierung der Linear-Layer (CPU)
+- 'onnx':       Exportiertes Modell in ONNX Runtime (CPU)
+- 'onnx-int8':  ONNX-Modell mit dynamischer int8-Quantisierung (CPU)
+
+Exportierte bzw. quantisierte Artefakte werden auf der Platte zwischengespeichert
+(bei lokalen Modellen im Unterordner 'optimized' des Modells).
+"""
+import os
+
+import numpy as np
+
+
+DEFAULT_ARTIFACT_DIR = os.getenv("SENTIMENT_ARTIFACT_DIR", os.path.join(".cache", "models"))
+
+# Fixture-Set für den Abgleich mit den fp32-Scores
+AGREEMENT_FIXTURES = [
+    "Apple reports record quarterly revenue and profit",
+    "Stock market crashes amid recession fears",
+    "Company announces regular quarterly dividend",
+    "Tesla shares plunge after disappointing delivery numbers",
+    "Microsoft beats earnings estimates on strong cloud growth",
+    "NVIDIA raises full-year guidance as data center demand surges",
+    "JPMorgan sets aside more money for potential loan losses",
+    "Amazon to cut thousands of jobs in cost-saving push",
+    "Visa volumes steady as consumer spending holds up",
+    "Johnson & Johnson faces new lawsuits over talc products",
+    "ExxonMobil profit falls as oil prices slide",
+    "Google unveils new AI model at developer conference",
+    "Analysts downgrade the stock citing valuation concerns",
+    "Shares were little changed in early trading",
+    "The board approved a share buyback program worth $10 billion",
+    "Regulators open investigation into accounting practices",
+    "Quarterly results were in line with expectations",
+    "Company misses revenue forecast and cuts outlook",
+    "Merger talks collapse, sending shares lower",
+    "Dividend increased by 8 percent, the tenth consecutive raise",
+]
+
+# Zulässige Abweichung eines Backends von fp32 auf dem Fixture-Set
+AGREEMENT_MAX_SCORE_DIFF = 0.05
+AGREEMENT_MIN_LABEL_AGREEMENT = 0.95
+
+
+def artifact_dir(model_name, revision=None, base_dir=None):
+    """Verzeichnis für exportierte/quantisierte Artefakte eines Modells."""
+    if os.path.isdir(model_name):
+        return os.path.join(model_name, 'optimized')
+    slug = model_name.replace('/', '--') + '@' + (revision or 'main')
+    return os.path.join(base_dir or DEFAULT_ARTIFACT_DIR, slug)
+
+
+def softmax(logits):
+    """Numerisch stabile Softmax über die letzte Achse."""
+    logits = logits - logits.max(axis=-1, keepdims=True)
+    exp = np.exp(logits)
+    return exp / exp.sum(axis=-1, keepdims=True)
+
+
+class TorchBackend:
+    """PyTorch fp32 (eager)."""
+
+    name = 'torch'
+    tensor_type = 'pt'
+    fork_safe = True
+
+    def __init__(self, model_name, revision=None, device=None, base_dir=None):
+        self.model_name = model_name
+        self.revision = revision
+        self.requested_device = device
+        self.base_dir = base_dir
+        self.device = None
+        self.model = None
+
+    def _load_fp32(self):
+        from transformers import AutoModelForSequenceClassification
+
+        model = AutoModelForSequenceClassification.from_pretrained(self.model_name, revision=self.revision)
+        model.eval()
+        return model
+
+    def _resolve_device(self):
+        import torch
+
+        if self.requested_device is not None:
+            return torch.device(self.requested_device)
+        return torch.device("cuda" if torch.cuda.is_available() else "cpu")
+
+    def artifact_path(self, filename):
+        directory = artifact_dir(self.model_name, self.revision, self.base_dir)
+        if not os.path.exists(directory):
+            os.makedirs(directory)
+        return os.path.join(directory, filename)
+
+    def load(self):
+        self.device = self._resolve_device()
+        self.model = self._load_fp32()
+        self.model.to(self.device)  # Modell auf GPU verschieben (falls verfügbar)
+        return self
+
+    def prepare(self, inputs):
+        """Bereitet die Tokenizer-Ausgabe für das Modell vor (Transfer auf das Device)."""
+        non_blocking = self.device.type == 'cuda'
+        if non_blocking:
+            inputs = {key: val.pin_memory() for key, val in inputs.items()}
+        return {key: val.to(self.device, non_blocking=non_blocking) for key, val in inputs.items()}
+
+    def predict_logits(self, inputs):
+        """Logits als NumPy-Array (n, 3) für die Tokenizer-Ausgabe."""
+        import torch
+
+        inputs = self.prepare(inputs)  # Auf GPU verschieben (no-op, falls schon dort)
+        with torch.no_grad():
+            outputs = self.model(**inputs)
+        return outputs.logits.float().cpu().numpy()
+
+    def close(self):
+        on_cuda = self.device is not None and self.device.type == "cuda"
+        self.model = None
+        self.device = None
+        if on_cuda:
+            import torch
+            torch.cuda.empty_cache()
+
+
+class QuantizedTorchBackend(TorchBackend):
+    """PyTorch mit dynamischer int8-Quantisierung (nur CPU)."""
+
+    name = 'torch-int8'
+    artifact = 'torch_int8_state_dict.pt'
+
+    def _resolve_device(self):
+        import torch
+
+        return torch.device('cpu')
+
+    def _skeleton(self):
+        """fp32-Architektur aus der Config, ohne Gewichte zu laden oder zu initialisieren."""
+        import torch
+        from transformers import AutoConfig, AutoModelForSequenceClassification
+        try:
+            from transformers.initialization import no_init_weights
+        except ImportError:
+            from transformers.modeling_utils import no_init_weights
+
+        config = AutoConfig.from_pretrained(self.model_name, revision=self.revision)
+        with no_init_weights():
+            model = AutoModelForSequenceClassification.from_config(config)
+        # Uninitialisierter Speicher: vor der Quantisierung definierte Werte setzen
+        for module in model.modules():
+            if isinstance(module, torch.nn.Linear):
+                module.weight.data.zero_()
+        model.eval()
+        return model
+
+    def _quantize(self, model):
+        import torch
+
+        return torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+
+    def load(self):
+        import torch
+
+        self.device = self._resolve_device()
+        path = self.artifact_path(self.artifact)
+        model = None
+        if os.path.exists(path):
+            # Gespeicherte int8-Gewichte in ein leeres quantisiertes Modell laden,
+            # ohne die fp32-Gewichte zu laden
+            try:
+                model = self._quantize(self._skeleton())
+                model.load_state_dict(torch.load(path, weights_only=True))
+            except Exception as e:
+                print(f"  Quantisiertes Modell unbrauchbar, wird neu erstellt: {e}")
+                model = None
+
+        if model is None:
+            model = self._quantize(self._load_fp32())
+            # Atomar schreiben, damit ein Abbruch kein kaputtes Artefakt hinterlässt
+            try:
+                torch.save(model.state_dict(), path + '.tmp')
+                os.replace(path + '.tmp', path)
+            except Exception as e:
+                print(f"  Quantisiertes Modell konnte nicht gespeichert werden: {e}")
+                if os.path.exists(path + '.tmp'):
+                    os.remove(path + '.tmp')
+
+        self.model = model
+        return self
+
+
+class OnnxBackend(TorchBackend):
+    """Exportiertes Modell in ONNX Runtime (nur CPU)."""
+
+    name = 'onnx'
+    tensor_type = 'np'
+    fork_safe = False
+    artifact = 'model.onnx'
+    quantize = False
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.session = None
+        self.input_names = None
+
+    def _resolve_device(self):
+        import torch
+
+        return torch.device('cpu')
+
+    def _export(self, path):
+        """Exportiert das fp32-Modell nach ONNX (dynamische Batch- und Sequenzlänge)."""
+        import torch
+
+        model = self._load_fp32()
+        seq = torch.ones((2, 8), dtype=torch.long)
+        dynamic = {0: 'batch', 1: 'sequence'}
+        torch.onnx.export(
+            model,
+            (seq, seq, torch.zeros_like(seq)),
+            path,
+            input_names=['input_ids', 'attention_mask', 'token_type_ids'],
+            output_names=['logits'],
+            dynamic_axes={'input_ids': dynamic, 'attention_mask': dynamic,
+                          'token_type_ids': dynamic, 'logits': {0: 'batch'}},
+            opset_version=17,
+            dynamo=False,
+        )
+
+    def load(self):
+        try:
+            import onnxruntime as ort
+        except ImportError:
+            raise ImportError("Backend 'onnx' benötigt onnxruntime (pip install onnx onnxruntime)")
+
+        self.device = self._resolve_device()
+        fp32_path = self.artifact_path(OnnxBackend.artifact)
+        if not os.path.exists(fp32_path):
+            self._export(fp32_path + '.tmp')
+            os.replace(fp32_path + '.tmp', fp32_path)
+
+        path = fp32_path
+        if self.quantize:
+            from onnxruntime.quantization import quantize_dynamic, QuantType
+
+            path = self.artifact_path(self.artifact)
+            if not os.path.exists(path):
+                quantize_dynamic(fp32_path, path + '.tmp', weight_type=QuantType.QInt8)
+                os.replace(path + '.tmp', path)
+
+        self.session = ort.InferenceSession(path, providers=['CPUExecutionProvider'])
+        self.input_names = [i.name for i in self.session.get_inputs()]
+        return self
+
+    def prepare(self, inputs):
+        return {name: np.asarray(inputs[name], dtype=np.int64)
+                for name in self.input_names if name in inputs}
+
+    def predict_logits(self, inputs):
+        return self.session.run(['logits'], self.prepare(inputs))[0]
+
+    def close(self):
+        self.session = None
+        self.device = None
+
+
+class QuantizedOnnxBackend(OnnxBackend):
+    """ONNX-Modell mit dynamischer int8-Quantisierung (nur CPU)."""
+
+    name = 'onnx-int8'
+    artifact = 'model.int8.onnx'
+    quantize = True
+
+
+BACKENDS = {
+    backend.name: backend
+    for backend in (TorchBackend, QuantizedTorchBackend, OnnxBackend, QuantizedOnnxBackend)
+}
+
+
+def make_backend(name, model_name, revision=None, device=None, base_dir=None):
+    """Erzeugt ein Backend über seinen Namen ('torch', 'torch-int8', 'onnx', 'onnx-int8')."""
+    if name not in BACKENDS:
+        raise ValueError(f"Unbekanntes Backend: {name} (verfügbar: {', '.join(BACKENDS)})")
+    return BACKENDS[name](model_name, revision=revision, device=device, base_dir=base_dir)
+
+
+def check_agreement(analyzer, reference, texts=None, max_score_diff=AGREEMENT_MAX_SCORE_DIFF,
+                    min_label_agreement=AGREEMENT_MIN_LABEL_AGREEMENT, strict=False):
+    """
+    Vergleicht die Wahrscheinlichkeiten eines Analyzers mit einer fp32-Referenz.
+
+    Args:
+        analyzer: FinBertAnalyzer mit dem zu prüfenden Backend
+        reference: FinBertAnalyzer mit Backend 'torch'
+        texts: Fixture-Texte (Standard: AGREEMENT_FIXTURES)
+        max_score_diff: Maximale Abweichung des Scores (positive - negative)
+        min_label_agreement: Mindestanteil übereinstimmender Labels
+        strict: Bei Überschreitung der Grenzen ValueError auslösen
+
+    Returns:
+        Dictionary mit maximaler/mittlerer Abweichung der Wahrscheinlichkeiten
+        und des Scores, dem Anteil übereinstimmender Labels und 'passed'
+        (beide Grenzen eingehalten)
+    """
+    texts = texts or AGREEMENT_FIXTURES
+    probs = np.asarray(analyzer.predict_proba(texts))
+    ref = np.asarray(reference.predict_proba(texts))
+    score_diff = np.abs((probs[:, 2] - probs[:, 0]) - (ref[:, 2] - ref[:, 0]))
+
+    result = {
+        'backend': analyzer.backend_name,
+        'n': len(texts),
+        'max_abs_prob_diff': float(np.abs(probs - ref).max()),
+        'mean_abs_prob_diff': float(np.abs(probs - ref).mean()),
+        'max_abs_score_diff': float(score_diff.max()),
+        'label_agreement': float((probs.argmax(axis=1) == ref.argmax(axis=1)).mean()),
+    }
+    result['passed'] = (result['max_abs_score_diff'] <= max_score_diff
+                        and result['label_agreement'] >= min_label_agreement)
+    if strict and not result['passed']:
+        raise ValueError(
+            f"Backend {result['backend']} weicht zu stark von fp32 ab: "
+            f"Score-Abweichung {result['max_abs_score_diff']:.4f} (max. {max_score_diff}), "
+            f"Label-Übereinstimmung {result['label_agreement']:.1%} (min. {min_label_agreement:.0%})"
+        )
+    return result
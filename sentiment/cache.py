@@ -0,0 +1,176 @@
+"""
+Persistenter Sentiment-Cache (SQLite).
+
+Speichert FinBERT-Wahrscheinlichkeiten [negative, neutral, positive] unter
+einem Hash aus normalisiertem Text, Modellname/-revision, max_length und Backend.
+Bei wiederholten Läufen müssen so nur neue Überschriften durch das Modell.
+"""
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+import unicodedata
+
+
+DEFAULT_CACHE_PATH = os.getenv("SENTIMENT_CACHE_PATH", os.path.join(".cache", "sentiment_cache.sqlite"))
+
+
+def normalize_text(text):
+    """Normalisiert einen Text für den Cache-Schlüssel (Unicode, Leerzeichen)."""
+    text = unicodedata.normalize('NFKC', str(text))
+    return ' '.join(text.split())
+
+
+def make_key(text, model_name, revision=None, max_length=512, backend='torch'):
+    """Erzeugt den inhaltsadressierten Cache-Schlüssel (SHA-256)."""
+    parts = [model_name, revision or 'main', str(max_length)]
+    if backend != 'torch':
+        # Quantisierte/exportierte Backends haben eigene Einträge
+        parts.append(backend)
+    raw = "\x00".join(parts + [normalize_text(text)])
+    return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+
+class SentimentCache:
+    """
+    SQLite-Cache für Sentiment-Wahrscheinlichkeiten.
+
+    Args:
+        path: Pfad zur SQLite-Datei
+        max_entries: Maximale Anzahl Einträge (älteste Zugriffe werden verdrängt)
+        max_age_days: Maximales Alter eines Eintrags in Tagen (None = unbegrenzt)
+    """
+
+    def __init__(self, path=DEFAULT_CACHE_PATH, max_entries=1_000_000, max_age_days=90):
+        self.path = path
+        self.max_entries = max_entries
+        self.max_age_days = max_age_days
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(path)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory)
+
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS sentiment (
+                key TEXT PRIMARY KEY,
+                negative REAL NOT NULL,
+                neutral REAL NOT NULL,
+                positive REAL NOT NULL,
+                created_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            )
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_sentiment_accessed ON sentiment(accessed_at)")
+        self._conn.commit()
+
+    def get_many(self, keys):
+        """
+        Sucht mehrere Schlüssel auf einmal.
+
+        Returns:
+            Dictionary key -> [negative, neutral, positive] (nur Treffer)
+        """
+        keys = list(dict.fromkeys(keys))
+        found = {}
+        now = time.time()
+        min_created = now - self.max_age_days * 86400 if self.max_age_days else 0.0
+
+        with self._lock:
+            # SQLite erlaubt nur begrenzt viele Parameter pro Abfrage
+            for i in range(0, len(keys), 500):
+                chunk = keys[i:i+500]
+                placeholders = ','.join('?' * len(chunk))
+                rows = self._conn.execute(
+                    f"SELECT key, negative, neutral, positive FROM sentiment "
+                    f"WHERE created_at >= ? AND key IN ({placeholders})",
+                    [min_created] + chunk
+                ).fetchall()
+                for key, negative, neutral, positive in rows:
+                    found[key] = [negative, neutral, positive]
+
+            if found:
+                self._conn.executemany("UPDATE sentiment SET accessed_at = ? WHERE key = ?",
+                                       [(now, key) for key in found])
+                self._conn.commit()
+
+            self.hits += len(found)
+            self.misses += len(keys) - len(found)
+
+        return found
+
+    def put_many(self, items):
+        """Speichert (key, [negative, neutral, positive]) Paare und verdrängt bei Bedarf."""
+        now = time.time()
+        rows = [(key, float(p[0]), float(p[1]), float(p[2]), now, now) for key, p in items]
+        if not rows:
+            return
+
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO sentiment VALUES (?, ?, ?, ?, ?, ?)", rows
+            )
+            self._conn.commit()
+        self.evict()
+
+    def evict(self):
+        """Entfernt abgelaufene Einträge und begrenzt die Cache-Größe."""
+        with self._lock:
+            if self.max_age_days:
+                cutoff = time.time() - self.max_age_days * 86400
+                self._conn.execute("DELETE FROM sentiment WHERE created_at < ?", (cutoff,))
+
+            if self.max_entries:
+                count = self._conn.execute("SELECT COUNT(*) FROM sentiment").fetchone()[0]
+                excess = count - self.max_entries
+                if excess > 0:
+                    self._conn.execute(
+                        "DELETE FROM sentiment WHERE key IN "
+                        "(SELECT key FROM sentiment ORDER BY accessed_at ASC LIMIT ?)",
+                        (excess,)
+                    )
+            self._conn.commit()
+
+    def clear(self):
+        """Leert den Cache vollständig."""
+        with self._lock:
+            self._conn.execute("DELETE FROM sentiment")
+            self._conn.commit()
+
+    def __len__(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM sentiment").fetchone()[0]
+
+    def stats(self):
+        """Gibt Treffer/Fehlschläge und Größe zurück."""
+        total = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / total if total else 0.0,
+            'entries': len(self),
+        }
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+_default_cache = None
+_default_lock = threading.Lock()
+
+
+def get_cache():
+    """Gibt den prozessweiten Sentiment-Cache zurück (wird bei Bedarf erstellt)."""
+    global _default_cache
+    if _default_cache is None:
+        with _default_lock:
+            if _default_cache is None:
+                _default_cache = SentimentCache()
+    return _default_cache
@@ -1,42 +1,300 @@
-from transformers import AutoTokenizer, AutoModelForSequenceClassification
-import torch
+import os
+import queue
+import threading
+import time
+
+import numpy as np
 import pandas as pd
+try:
+    from sentiment.cache import get_cache, make_key, normalize_text
+    from sentiment.backends import make_backend, softmax
+except ImportError:
+    from cache import get_cache, make_key, normalize_text
+    from backends import make_backend, softmax
 
 
 # FinBERT Modell und Tokenizer
 MODEL_NAME = "ProsusAI/finbert"
 
-# GPU-Unterstützung prüfen
-device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
-print(f"FinBERT läuft auf: {device}")
 
-tokenizer = AutoTokenizer.from_pretrained(MODEL_NAME)
-model = AutoModelForSequenceClassification.from_pretrained(MODEL_NAME)
-model.to(device)  # Modell auf GPU verschieben (falls verfügbar)
+class FinBertAnalyzer:
+    """
+    FinBERT-Wrapper mit verzögertem Laden (lazy loading).
+
+    Tokenizer und Modell werden erst beim ersten Scoring (oder explizit
+    über load()) geladen, damit ein Import des Moduls nichts kostet.
+    Laden und Inferenz sind über ein Lock gegen parallele Threads geschützt.
+
+    Args:
+        model_name: Name/Pfad des Hugging-Face-Modells
+        revision: Modell-Revision (Branch, Tag oder Commit; None = 'main')
+        device: 'cpu', 'cuda' oder None (automatisch)
+        max_length: Maximale Token-Länge pro Text
+        backend: Inferenz-Backend ('torch', 'torch-int8', 'onnx', 'onnx-int8')
+    """
+
+    def __init__(self, model_name=MODEL_NAME, revision=None, device=None, max_length=512,
+                 backend='torch'):
+        self.model_name = model_name
+        self.revision = revision
+        self.max_length = max_length
+        self.requested_device = device
+        self.backend_name = backend
+        self.device = None
+        self.tokenizer = None
+        self.backend = None
+        self._lock = threading.RLock()
+        self._tokenizer_lock = threading.Lock()
+
+    def __getstate__(self):
+        # Kopien (z. B. für Worker-Prozesse) enthalten nur die Einstellungen,
+        # das Modell wird dort bei Bedarf neu geladen
+        state = self.__dict__.copy()
+        state.update(device=None, tokenizer=None, backend=None)
+        del state['_lock'], state['_tokenizer_lock']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.RLock()
+        self._tokenizer_lock = threading.Lock()
+
+    @property
+    def is_loaded(self):
+        return self.backend is not None
+
+    def load(self):
+        """Lädt Tokenizer und Modell (nur beim ersten Aufruf)."""
+        if self.backend is not None:
+            return self
+
+        with self._lock:
+            if self.backend is not None:
+                return self
+
+            from transformers import AutoTokenizer
+
+            backend = make_backend(self.backend_name, self.model_name, self.revision,
+                                   self.requested_device)
+            tokenizer = AutoTokenizer.from_pretrained(self.model_name, revision=self.revision)
+            backend.load()
+            print(f"FinBERT läuft auf: {backend.device} (Backend: {backend.name})")
+
+            self.device = backend.device
+            self.tokenizer = tokenizer
+            self.backend = backend
+
+        return self
+
+    def close(self):
+        """Gibt Modell und Tokenizer wieder frei."""
+        with self._lock:
+            if self.backend is None:
+                return
+            self.backend.close()
+            self.backend = None
+            self.tokenizer = None
+            self.device = None
+
+    def encode(self, texts):
+        """Tokenisiert Texte für das aktive Backend (inkl. Device-Transfer)."""
+        self.load()
+        with self._tokenizer_lock:
+            inputs = self.tokenizer(texts, return_tensors=self.backend.tensor_type, truncation=True,
+                                    max_length=self.max_length, padding=True)
+        return self.backend.prepare(inputs)
+
+    def forward(self, inputs):
+        """Berechnet Logits (NumPy-Array) für vorbereitete Eingaben."""
+        self.load()
+        with self._lock:
+            return self.backend.predict_logits(inputs)
+
+    def predict_proba(self, texts):
+        """
+        Berechnet FinBERT-Wahrscheinlichkeiten für eine Liste von Texten.
+
+        Returns:
+            NumPy-Array (n, 3) mit [negative, neutral, positive] pro Text
+        """
+        # 1. Texte tokenisieren, 2. durch Modell schicken
+        logits = self.forward(self.encode(texts))
+
+        # 3. Softmax für Wahrscheinlichkeiten
+        # 4. FinBERT: [negative, neutral, positive]
+        return softmax(logits)
+
+    def token_lengths(self, texts):
+        """Anzahl Tokens pro Text (nach Truncation, inkl. Spezial-Tokens)."""
+        self.load()
+        texts = [text if isinstance(text, str) else '' for text in texts]
+        with self._tokenizer_lock:
+            encoded = self.tokenizer(texts, truncation=True, max_length=self.max_length)
+        return [len(ids) for ids in encoded['input_ids']]
+
+    def cache_key(self, text):
+        """Cache-Schlüssel für einen Text mit diesem Modell."""
+        return make_key(text, self.model_name, self.revision, self.max_length, self.backend_name)
+
+
+_default_analyzer = None
+_default_lock = threading.Lock()
+
+
+def get_analyzer():
+    """Gibt den prozessweiten FinBERT-Analyzer zurück (wird bei Bedarf erstellt)."""
+    global _default_analyzer
+    if _default_analyzer is None:
+        with _default_lock:
+            if _default_analyzer is None:
+                _default_analyzer = FinBertAnalyzer(backend=os.getenv("SENTIMENT_BACKEND", "torch"))
+    return _default_analyzer
+
+
+def make_token_batches(lengths, token_budget=4096, max_batch_size=256):
+    """
+    Bildet Batches nach Token-Budget statt fester Zeilenanzahl.
+
+    Die Texte werden nach Länge sortiert, sodass ähnlich lange Texte im
+    selben Batch landen. Ein Batch wird geschlossen, sobald
+    (Anzahl Texte × längster Text) das Token-Budget überschreiten würde.
+
+    Args:
+        lengths: Token-Länge pro Text
+        token_budget: Maximale Anzahl (gepaddeter) Tokens pro Batch
+        max_batch_size: Obergrenze für Texte pro Batch
+
+    Returns:
+        Liste von Index-Listen (Positionen in lengths)
+    """
+    order = sorted(range(len(lengths)), key=lambda i: lengths[i])
+    batches = []
+    current = []
+    for i in order:
+        # Sortiert aufsteigend: der neue Text ist der längste im Batch
+        padded = (len(current) + 1) * lengths[i]
+        if current and (padded > token_budget or len(current) >= max_batch_size):
+            batches.append(current)
+            current = []
+        current.append(i)
+    if current:
+        batches.append(current)
+    return batches
+
+
+def padding_waste(lengths, batches):
+    """Anteil der Padding-Tokens an allen verarbeiteten Tokens (0 = kein Padding)."""
+    padded = 0
+    real = 0
+    for batch in batches:
+        batch_lengths = [lengths[i] for i in batch]
+        padded += max(batch_lengths) * len(batch_lengths)
+        real += sum(batch_lengths)
+    return 1 - real / padded if padded else 0.0
+
+
+def _iter_batch_probs(analyzer, batches):
+    """Bewertet Batches nacheinander im aktuellen Prozess. Yields (probs, fehler)."""
+    for batch_texts in batches:
+        try:
+            yield analyzer.predict_proba(batch_texts), None
+        except Exception as e:
+            yield None, e
 
-def analyze_sentiment(text):
+
+def _iter_batch_probs_pipelined(analyzer, batches, timings=None, prefetch=2):
+    """
+    Bewertet Batches mit überlappender Tokenisierung.
+
+    Ein Hintergrund-Thread tokenisiert (und überträgt) Batch N+1, während
+    Batch N durch das Modell läuft. Yields (probs, fehler) pro Batch.
+    Fehler beim Tokenisieren betreffen nur ihren Batch; ein Fehler der
+    Batch-Quelle selbst wird im aufrufenden Thread ausgelöst.
+
+    Args:
+        timings: Optionales Dictionary, in das die Zeiten pro Stufe
+                 ('tokenize', 'forward') in Sekunden geschrieben werden
+        prefetch: Maximale Anzahl vorbereiteter Batches
+    """
+    timings = timings if timings is not None else {}
+    timings['tokenize'] = 0.0
+    timings['forward'] = 0.0
+    analyzer.load()
+
+    prepared = queue.Queue(maxsize=prefetch)
+    stop = threading.Event()
+    end = object()
+    failed = object()
+
+    def deliver(item):
+        while not stop.is_set():
+            try:
+                prepared.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def produce():
+        try:
+            for batch_texts in batches:
+                t0 = time.perf_counter()
+                try:
+                    item = (analyzer.encode(batch_texts), None)
+                except Exception as e:
+                    item = (None, e)
+                timings['tokenize'] += time.perf_counter() - t0
+                if not deliver(item):
+                    return
+        except Exception as e:
+            # Fehler der Batch-Quelle selbst: im aufrufenden Thread auslösen,
+            # sonst wartet dieser endlos auf das Ende-Signal
+            deliver((failed, e))
+            return
+        deliver(end)
+
+    producer = threading.Thread(target=produce, daemon=True)
+    producer.start()
+    try:
+        while True:
+            item = prepared.get()
+            if item is end:
+                break
+            inputs, error = item
+            if inputs is failed:
+                raise error
+            if error is not None:
+                yield None, error
+                continue
+
+            t0 = time.perf_counter()
+            try:
+                probs = softmax(analyzer.forward(inputs))
+            except Exception as e:
+                yield None, e
+                continue
+            finally:
+                timings['forward'] += time.perf_counter() - t0
+            yield probs, None
+    finally:
+        stop.set()
+
+
+def analyze_sentiment(text, analyzer=None):
     """Analysiert Sentiment eines Textes mit FinBERT."""
-    # 1. Text tokenisieren
-    inputs = tokenizer(text, return_tensors="pt", truncation=True, max_length=512)
-    inputs = {key: val.to(device) for key, val in inputs.items()}  # Auf GPU verschieben
-    
-    # 2. Durch Modell schicken
-    with torch.no_grad():
-        outputs = model(**inputs)
-    
-    # 3. Softmax für Wahrscheinlichkeiten
-    probs = torch.softmax(outputs.logits, dim=1)
-    
-    # 4. FinBERT: [negative, neutral, positive]
-    negative, neutral, positive = probs[0].tolist()
-    
-    # 5. Score berechnen: -1 bis +1
-    score = positive - negative
-    
+    analyzer = analyzer or get_analyzer()
+
+    negative, neutral, positive = analyzer.predict_proba([text])[0]
+
+    # Score berechnen: -1 bis +1
+    score = float(positive - negative)
+
     return score
 
 
-def analyze_dataframe(df, text_column='title', batch_size=16):
+def analyze_dataframe(df, text_column='title', batch_size=16, analyzer=None,
+                      use_cache=True, cache=None, batching='fixed', token_budget=4096,
+                      n_workers=1, dedupe=True, pipeline=False):
     """
     Analysiert Sentiment für alle Texte in einem DataFrame.
     
@@ -44,39 +302,129 @@ def analyze_dataframe(df, text_column='title', batch_size=16):
         df: DataFrame mit Texten
         text_column: Spalte mit den Texten
         batch_size: Anzahl Texte pro Batch (Standard: 16)
+        analyzer: FinBertAnalyzer (Standard: prozessweiter Analyzer)
+        use_cache: Persistenten Sentiment-Cache verwenden (False = Cache umgehen)
+        cache: SentimentCache (Standard: prozessweiter Cache)
+        batching: 'fixed' (batch_size Texte in DataFrame-Reihenfolge) oder
+                  'bucket' (nach Token-Länge sortiert, Batches nach token_budget)
+        token_budget: Maximale Anzahl gepaddeter Tokens pro Batch (nur 'bucket')
+        n_workers: Anzahl Inferenz-Prozesse (1 = im aktuellen Prozess)
+        dedupe: Jeden (normalisierten) Text nur einmal bewerten und das Ergebnis
+                auf alle Zeilen mit diesem Text übertragen
+        pipeline: Tokenisierung des nächsten Batches in einem Hintergrund-Thread
+                  mit der Modell-Ausführung überlappen (nur mit n_workers=1)
     """
-    print(f"Analysiere {len(df)} Texte mit FinBERT (Batch-Size: {batch_size})...")
+    analyzer = analyzer or get_analyzer()
+    if not use_cache:
+        cache = None
+    elif cache is None:
+        cache = get_cache()
     
-    scores = []
-    texts = df[text_column].tolist()
+    all_texts = df[text_column].tolist()
     
-    # Batch-Processing für bessere Performance
-    for i in range(0, len(texts), batch_size):
-        batch_texts = texts[i:i+batch_size]
-        print(f"  Fortschritt: {i}/{len(texts)}")
-        
+    # Gleiche Überschriften (mehrere Ticker/Quellen) nur einmal bewerten
+    if dedupe:
+        positions = {}
+        texts = []
+        inverse = []
+        for text in all_texts:
+            norm = normalize_text(text)
+            if norm not in positions:
+                positions[norm] = len(texts)
+                texts.append(text)
+            inverse.append(positions[norm])
+        if all_texts:
+            ratio = 1 - len(texts) / len(all_texts)
+            print(f"Eindeutige Texte: {len(texts)}/{len(all_texts)} (Duplikate: {ratio:.1%})")
+    else:
+        texts = all_texts
+        inverse = range(len(all_texts))
+    
+    # Wahrscheinlichkeiten [negative, neutral, positive]; NaN = (noch) nicht bewertet
+    probs = np.full((len(texts), 3), np.nan, dtype=np.float32)
+    
+    # Bereits bewertete Texte aus dem Cache holen
+    if cache is not None:
+        keys = [analyzer.cache_key(text) for text in texts]
+        cached = cache.get_many(keys)
+        for i, key in enumerate(keys):
+            if key in cached:
+                probs[i] = cached[key]
+    
+    missing = np.flatnonzero(np.isnan(probs[:, 0])).tolist()
+    if batching == 'bucket':
+        print(f"Analysiere {len(missing)} Texte mit FinBERT (Token-Budget: {token_budget})...")
+    else:
+        print(f"Analysiere {len(missing)} Texte mit FinBERT (Batch-Size: {batch_size})...")
+    if cache is not None:
+        print(f"  Aus Cache: {len(texts) - len(missing)}/{len(texts)}")
+    
+    # Batches als Listen von Zeilenpositionen bilden
+    if batching == 'bucket' and missing:
+        lengths = analyzer.token_lengths([texts[j] for j in missing])
+        batches = [[missing[k] for k in batch]
+                   for batch in make_token_batches(lengths, token_budget)]
+    elif batching in ('fixed', 'bucket'):
+        batches = [missing[i:i+batch_size] for i in range(0, len(missing), batch_size)]
+    else:
+        raise ValueError(f"Unbekannter Batching-Modus: {batching}")
+    
+    batch_texts = ([texts[j] for j in batch_idx] for batch_idx in batches)
+    timings = {}
+    pool = None
+    if n_workers > 1 and batches:
         try:
-            # Batch tokenisieren
-            inputs = tokenizer(batch_texts, return_tensors="pt", truncation=True, 
-                             max_length=512, padding=True)
-            inputs = {key: val.to(device) for key, val in inputs.items()}
-            
-            # Batch durch Modell
-            with torch.no_grad():
-                outputs = model(**inputs)
+            from sentiment.pool import InferencePool
+        except ImportError:
+            from pool import InferencePool
+        pool = InferencePool(analyzer, n_workers=n_workers).start()
+        print(f"  Inferenz-Pool: {pool.n_workers} Prozesse × {pool.threads_per_worker} Threads")
+        results = pool.imap(batch_texts)
+    elif pipeline:
+        results = _iter_batch_probs_pipelined(analyzer, batch_texts, timings)
+    else:
+        results = _iter_batch_probs(analyzer, batch_texts)
+    
+    done = 0
+    t_start = time.perf_counter()
+    
+    # Batch-Processing für bessere Performance
+    try:
+        for i, (batch_idx, (batch_probs, error)) in enumerate(zip(batches, results)):
+            print(f"  Fortschritt: {done}/{len(missing)}")
+            done += len(batch_idx)
             
-            probs = torch.softmax(outputs.logits, dim=1)
+            if error is not None:
+                # Bei Fehler: Neutral-Score für alle Texte im Batch (wird nicht gecacht)
+                print(f"  Fehler bei Batch {i}: {error}")
+                continue
             
-            # Scores für alle Texte im Batch berechnen
-            for prob in probs:
-                negative, neutral, positive = prob.tolist()
-                score = positive - negative
-                scores.append(score)
-                
-        except Exception as e:
-            print(f"  Fehler bei Batch {i}: {e}")
-            # Bei Fehler: Neutral-Score für alle Texte im Batch
-            scores.extend([0.0] * len(batch_texts))
+            probs[batch_idx] = batch_probs
+    except BaseException:
+        # Worker sofort beenden: close() würde auf offene Aufgaben warten
+        if pool is not None:
+            pool.terminate()
+            pool = None
+        raise
+    finally:
+        if pool is not None:
+            pool.close()
+    
+    if timings:
+        wall = time.perf_counter() - t_start
+        busy = timings['tokenize'] + timings['forward']
+        print(f"  Pipeline: Tokenisierung {timings['tokenize']:.2f}s | Modell {timings['forward']:.2f}s | "
+              f"Gesamt {wall:.2f}s (Überlappung: {busy / wall if wall else 0.0:.2f}x)")
+    
+    scored = ~np.isnan(probs[:, 0])
+    if cache is not None:
+        new_entries = [(keys[j], probs[j]) for j in missing if scored[j]]
+        if new_entries:
+            cache.put_many(new_entries)
+    
+    # Score berechnen: positive - negative (-1 bis +1), Fehler = neutral
+    scores = np.where(scored, probs[:, 2] - probs[:, 0], 0.0).astype(np.float64)
+    scores = scores[np.asarray(inverse, dtype=np.intp)]
     
     df = df.copy()
     df['sentiment_score'] = scores
@@ -86,9 +434,25 @@ def analyze_dataframe(df, text_column='title', batch_size=16):
 
 
 def aggregate_daily_sentiment(df):
-    """Aggregiert Sentiment pro Tag und Ticker."""
+    """
+    Aggregiert Sentiment pro Tag und Ticker.
+    
+    Enthält df eine Spalte 'weight' (Clustergröße aus collapse_near_duplicates),
+    wird der Tagesdurchschnitt damit gewichtet und news_count zählt alle
+    zusammengefassten Meldungen.
+    """
     df['date'] = pd.to_datetime(df['date'])
     
+    if 'weight' in df.columns:
+        weighted = df.assign(_weighted=df['sentiment_score'] * df['weight'])
+        daily = weighted.groupby(['ticker', 'date']).agg({
+            '_weighted': 'sum',
+            'weight': 'sum'
+        }).reset_index()
+        daily['sentiment_score'] = daily['_weighted'] / daily['weight']  # Gewichteter Durchschnitt
+        daily['news_count'] = daily['weight'].astype(int)  # Anzahl Artikel inkl. Fast-Duplikate
+        return daily[['ticker', 'date', 'sentiment_score', 'news_count']]
+    
     daily = df.groupby(['ticker', 'date']).agg({
         'sentiment_score': 'mean',  # Durchschnitt pro Tag
         'title': 'count'  # Anzahl Artikel
@@ -0,0 +1,167 @@
+"""
+Erkennung fast gleicher Überschriften (MinHash + Locality-Sensitive Hashing).
+
+Syndizierte Meldungen unterscheiden sich oft nur leicht ("Apple stock rises..."
+vs. "Apple shares rise... - Reuters"). Überschriften werden pro Ticker und
+Zeitfenster über MinHash-Signaturen aus Zeichen-Shingles in LSH-Buckets
+einsortiert. Nur Kandidaten im selben Bucket werden verglichen, der Aufwand
+wächst damit annähernd linear statt quadratisch.
+"""
+import re
+import zlib
+
+import numpy as np
+import pandas as pd
+
+
+# Publisher-Suffix wie " - Reuters" oder " | Yahoo Finance"
+_SUFFIX = re.compile(r"\s+[-–|]\s+[^-–|]{1,40}$")
+_NON_WORD = re.compile(r"[^\w\s]")
+
+_MERSENNE_PRIME = (1 << 61) - 1
+
+# Reihenfolge für die Wahl des Repräsentanten: früheste Meldung, dann Quelle, Link
+ORDER_COLUMNS = ['timestamp', 'source', 'link', 'ticker']
+
+
+def normalize_headline(title):
+    """Kleinschreibung, ohne Publisher-Suffix und Satzzeichen."""
+    text = _SUFFIX.sub('', str(title))
+    text = _NON_WORD.sub(' ', text.lower())
+    return ' '.join(text.split())
+
+
+def _shingles(text, k):
+    """Zeichen-k-Gramme als uint64-Hashes."""
+    if len(text) <= k:
+        grams = [text]
+    else:
+        grams = {text[i:i + k] for i in range(len(text) - k + 1)}
+    return np.fromiter((zlib.crc32(g.encode('utf-8')) for g in grams), dtype=np.uint64)
+
+
+class _UnionFind:
+    def __init__(self, n):
+        self.parent = np.arange(n)
+
+    def find(self, i):
+        root = i
+        while self.parent[root] != root:
+            root = self.parent[root]
+        while self.parent[i] != root:
+            self.parent[i], i = root, self.parent[i]
+        return root
+
+    def union(self, i, j):
+        ri, rj = self.find(i), self.find(j)
+        if ri != rj:
+            self.parent[max(ri, rj)] = min(ri, rj)
+
+
+def minhash_signatures(texts, num_perm=64, shingle_size=3, seed=42):
+    """
+    MinHash-Signaturen für eine Liste normalisierter Texte.
+
+    Returns:
+        uint64-Array (n, num_perm)
+    """
+    rng = np.random.default_rng(seed)
+    a = rng.integers(1, _MERSENNE_PRIME, size=num_perm, dtype=np.uint64)
+    b = rng.integers(0, _MERSENNE_PRIME, size=num_perm, dtype=np.uint64)
+
+    signatures = np.empty((len(texts), num_perm), dtype=np.uint64)
+    for i, text in enumerate(texts):
+        hashes = _shingles(text, shingle_size)
+        # (a * h + b) mod p, als uint64 mit Überlauf (ausreichend zufällig)
+        signatures[i] = ((np.outer(a, hashes) + b[:, None]) % _MERSENNE_PRIME).min(axis=1)
+    return signatures
+
+
+def _stable_order(df, text_column):
+    """Positionen von df, sortiert nach ORDER_COLUMNS und Text (unabhängig von der Zeilenfolge)."""
+    keys = [c for c in ORDER_COLUMNS if c in df.columns] + [text_column]
+    frame = df[keys].reset_index(drop=True)
+    return frame.sort_values(keys, kind='mergesort', na_position='last').index.to_numpy()
+
+
+def cluster_headlines(df, text_column='title', window='1D', threshold=0.65,
+                      num_perm=64, bands=16, shingle_size=3):
+    """
+    Clustert fast gleiche Überschriften pro Ticker und Zeitfenster.
+
+    Args:
+        df: DataFrame mit 'ticker', 'timestamp' und Textspalte
+        text_column: Spalte mit den Überschriften
+        window: Zeitfenster (pandas-Frequenz, z.B. '1D', '12h')
+        threshold: Minimale geschätzte Jaccard-Ähnlichkeit für ein Cluster
+        num_perm: Anzahl MinHash-Permutationen
+        bands: Anzahl LSH-Bänder (num_perm muss durch bands teilbar sein)
+        shingle_size: Länge der Zeichen-Shingles
+
+    Returns:
+        Kopie von df mit 'cluster_id' (Zeilennummer des Repräsentanten) und 'cluster_size'.
+        Repräsentant ist die früheste Meldung des Clusters (bei Gleichstand nach
+        Quelle, Link, Ticker, Titel); Cluster und Repräsentanten hängen nicht von
+        der Reihenfolge der Zeilen ab.
+    """
+    if num_perm % bands:
+        raise ValueError("num_perm muss durch bands teilbar sein")
+
+    df = df.copy()
+    n = len(df)
+    if n == 0:
+        df['cluster_id'] = pd.Series(dtype='int64')
+        df['cluster_size'] = pd.Series(dtype='int64')
+        return df
+
+    # In stabiler Reihenfolge clustern: der erste Eintrag (Wurzel) ist der Repräsentant
+    order = _stable_order(df, text_column)
+    ordered = df.iloc[order]
+    texts = [normalize_headline(t) for t in ordered[text_column].tolist()]
+    signatures = minhash_signatures(texts, num_perm, shingle_size)
+    windows = pd.to_datetime(ordered['timestamp']).dt.floor(window).astype('int64').to_numpy()
+    tickers = ordered['ticker'].astype(str).to_numpy()
+
+    uf = _UnionFind(n)
+    rows = num_perm // bands
+    for band in range(bands):
+        band_sig = signatures[:, band * rows:(band + 1) * rows]
+        buckets = {}
+        for i in range(n):
+            key = (tickers[i], windows[i], band_sig[i].tobytes())
+            first = buckets.setdefault(key, i)
+            if first == i or uf.find(first) == uf.find(i):
+                continue
+            # Kandidat gegen den ersten Eintrag des Buckets prüfen
+            similarity = np.mean(signatures[first] == signatures[i])
+            if similarity >= threshold:
+                uf.union(first, i)
+
+    # Wurzeln zurück auf Zeilennummern in df abbilden
+    roots = np.empty(n, dtype=np.int64)
+    roots[order] = order[[uf.find(i) for i in range(n)]]
+    df['cluster_id'] = roots
+    df['cluster_size'] = pd.Series(roots).map(pd.Series(roots).value_counts()).to_numpy()
+    return df
+
+
+def collapse_near_duplicates(df, text_column='title', **kwargs):
+    """
+    Behält pro Cluster nur einen Repräsentanten (die früheste Meldung).
+
+    Die Clustergröße wird als 'weight' übernommen, damit
+    aggregate_daily_sentiment die Meldung entsprechend gewichtet.
+
+    Returns:
+        DataFrame mit Repräsentanten und Spalte 'weight', in stabiler
+        Reihenfolge (unabhängig von der Zeilenfolge von df)
+    """
+    clustered = cluster_headlines(df, text_column=text_column, **kwargs)
+    positions = np.arange(len(clustered))
+    representatives = clustered[positions == clustered['cluster_id'].to_numpy()]
+    representatives = representatives.iloc[_stable_order(representatives, text_column)].reset_index(drop=True)
+    representatives['weight'] = representatives['cluster_size']
+    if len(df):
+        print(f"Fast-Duplikate: {len(df)} → {len(representatives)} Überschriften "
+              f"({1 - len(representatives) / len(df):.1%} weniger Inferenz)")
+    return representatives.drop(columns=['cluster_id', 'cluster_size'])
@@ -0,0 +1,140 @@
+"""
+Multi-Prozess-Inferenz für FinBERT auf CPU.
+
+Jeder Worker lädt das Modell genau einmal. Standard-Start-Modus ist
+'forkserver' (bzw. 'spawn'): ein fork nach dem Start der torch-Threadpools
+im Elternprozess kann in den Workern zu Deadlocks führen. Mit
+start_method='fork' wird das Modell vorher im Elternprozess geladen, sodass
+die Gewichte copy-on-write geteilt werden; das ist nur sicher, solange der
+Elternprozess noch keine Inferenz ausgeführt hat. Batches werden über die
+Task-Queue des Pools verteilt und in der ursprünglichen Reihenfolge
+zurückgegeben.
+"""
+import copy
+import multiprocessing
+import os
+
+
+# Analyzer des aktuellen Worker-Prozesses
+_worker_analyzer = None
+
+
+def _init_worker(analyzer, n_threads):
+    """Initialisiert einen Worker: Thread-Anzahl setzen, Modell (einmal) laden."""
+    global _worker_analyzer
+    import torch
+
+    torch.set_num_threads(n_threads)
+    if _worker_analyzer is None:
+        _worker_analyzer = analyzer
+    _worker_analyzer.load()
+
+
+def _score_batch(batch_texts):
+    """Bewertet einen Batch im Worker. Gibt (probs, fehler) zurück."""
+    try:
+        return _worker_analyzer.predict_proba(batch_texts), None
+    except Exception as e:
+        return None, f"{type(e).__name__}: {e}"
+
+
+class InferencePool:
+    """
+    Prozess-Pool für FinBERT-Inferenz.
+
+    Args:
+        analyzer: FinBertAnalyzer, dessen Einstellungen die Worker übernehmen
+        n_workers: Anzahl Worker-Prozesse (Standard: Anzahl CPU-Kerne)
+        threads_per_worker: torch-Threads pro Worker (Standard: Kerne / Worker)
+        start_method: 'forkserver', 'spawn' oder 'fork' (Standard: 'forkserver' falls verfügbar)
+    """
+
+    def __init__(self, analyzer, n_workers=None, threads_per_worker=None, start_method=None):
+        cpu_count = os.cpu_count() or 1
+        self.analyzer = analyzer
+        self.n_workers = n_workers or cpu_count
+        self.threads_per_worker = threads_per_worker or max(1, cpu_count // self.n_workers)
+        if start_method is None:
+            methods = multiprocessing.get_all_start_methods()
+            start_method = 'forkserver' if 'forkserver' in methods else 'spawn'
+        self.start_method = start_method
+        self._pool = None
+
+    def start(self):
+        """Startet die Worker-Prozesse."""
+        global _worker_analyzer
+        if self._pool is not None:
+            return self
+
+        # Tokenizer-Threads vertragen sich nicht mit fork
+        os.environ.setdefault('TOKENIZERS_PARALLELISM', 'false')
+
+        if self.start_method == 'fork' and self._parent_on_cpu() and self._backend_fork_safe():
+            # Modell im Elternprozess laden: Gewichte werden copy-on-write geteilt
+            self.analyzer.load()
+            _worker_analyzer = self.analyzer
+
+        # Ungeladene Kopie mit denselben Einstellungen (und derselben Klasse)
+        worker_analyzer = copy.copy(self.analyzer)
+        worker_analyzer.requested_device = 'cpu'
+        ctx = multiprocessing.get_context(self.start_method)
+        try:
+            self._pool = ctx.Pool(self.n_workers, initializer=_init_worker,
+                                  initargs=(worker_analyzer, self.threads_per_worker))
+        finally:
+            _worker_analyzer = None
+        return self
+
+    def _parent_on_cpu(self):
+        """Prüft, ob das Modell des Elternprozesses auf der CPU liegt (bzw. liegen wird)."""
+        if self.analyzer.is_loaded:
+            return getattr(self.analyzer.device, 'type', self.analyzer.device) == 'cpu'
+        if self.analyzer.requested_device is not None:
+            return self.analyzer.requested_device == 'cpu'
+        import torch
+        return not torch.cuda.is_available()
+
+    def _backend_fork_safe(self):
+        """ONNX-Runtime-Sessions dürfen nicht über fork geteilt werden."""
+        try:
+            from sentiment.backends import BACKENDS
+        except ImportError:
+            from backends import BACKENDS
+        backend = BACKENDS.get(self.analyzer.backend_name)
+        return backend is not None and backend.fork_safe
+
+    def imap(self, batches):
+        """
+        Verteilt Batches auf die Worker.
+
+        Args:
+            batches: Iterable von Text-Listen
+
+        Yields:
+            (probs, fehler) pro Batch in Eingabe-Reihenfolge
+        """
+        self.start()
+        return self._pool.imap(_score_batch, batches)
+
+    def close(self):
+        """Beendet alle Worker-Prozesse, nachdem sie ihre Aufgaben abgeschlossen haben."""
+        if self._pool is not None:
+            self._pool.close()
+            self._pool.join()
+            self._pool = None
+
+    def terminate(self):
+        """Beendet alle Worker-Prozesse sofort (nach Fehlern; close() könnte hängen)."""
+        if self._pool is not None:
+            self._pool.terminate()
+            self._pool.join()
+            self._pool = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self.terminate()
@@ -0,0 +1,155 @@
+"""
+Streaming-Scoring für Nachrichten.
+
+score_stream() verarbeitet beliebige Iteratoren (Archiv, Live-Feed) in
+Micro-Batches und gibt bewertete Datensätze zurück, sobald ihr Batch fertig
+ist. Es werden nie mehr als ca. zwei Batches gleichzeitig im Speicher gehalten.
+"""
+import queue
+import threading
+import time
+
+try:
+    from sentiment.finbert_analyzer import get_analyzer
+    from sentiment.cache import get_cache
+except ImportError:
+    from finbert_analyzer import get_analyzer
+    from cache import get_cache
+
+
+# Markierungen für das Ende bzw. einen Fehler der Quelle
+_END = object()
+_ERROR = object()
+
+
+def _score_batch(analyzer, texts, cache):
+    """Bewertet einen Micro-Batch (mit Cache). Gibt Scores pro Text zurück."""
+    probs = [None] * len(texts)
+    keys = None
+
+    if cache is not None:
+        keys = [analyzer.cache_key(text) for text in texts]
+        cached = cache.get_many(keys)
+        probs = [cached.get(key) for key in keys]
+
+    missing = [i for i, p in enumerate(probs) if p is None]
+    if missing:
+        try:
+            batch_probs = analyzer.predict_proba([texts[i] for i in missing])
+            for i, prob in zip(missing, batch_probs):
+                probs[i] = prob
+            if cache is not None:
+                cache.put_many([(keys[i], probs[i]) for i in missing])
+        except Exception as e:
+            # Bei Fehler: Neutral-Score für alle Texte im Batch (wird nicht gecacht)
+            print(f"  Fehler im Stream-Batch: {e}")
+
+    # Frische Werte sind float32, gecachte float: einheitlich als float rechnen
+    return [float(p[2]) - float(p[0]) if p is not None else 0.0 for p in probs]
+
+
+def _read_ahead(records, buffer, stop):
+    """Liest die Quelle in einem Hintergrund-Thread in eine begrenzte Queue."""
+    try:
+        for record in records:
+            while not stop.is_set():
+                try:
+                    buffer.put(record, timeout=0.1)
+                    break
+                except queue.Full:
+                    continue
+            if stop.is_set():
+                return
+        buffer.put(_END)
+    except Exception as e:
+        buffer.put((_ERROR, e))
+
+
+def _iter_batches(records, batch_size, flush_timeout):
+    """
+    Gruppiert Datensätze zu Micro-Batches.
+
+    Mit flush_timeout wird ein unvollständiger Batch spätestens nach
+    flush_timeout Sekunden (ab dem ersten Datensatz) ausgegeben.
+    """
+    if flush_timeout is None:
+        batch = []
+        for record in records:
+            batch.append(record)
+            if len(batch) >= batch_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+        return
+
+    buffer = queue.Queue(maxsize=batch_size)
+    stop = threading.Event()
+    reader = threading.Thread(target=_read_ahead, args=(records, buffer, stop), daemon=True)
+    reader.start()
+
+    batch = []
+    deadline = None
+    try:
+        while True:
+            timeout = None if deadline is None else max(0.0, deadline - time.monotonic())
+            try:
+                item = buffer.get(timeout=timeout)
+            except queue.Empty:
+                # Timeout: unvollständigen Batch ausgeben
+                yield batch
+                batch = []
+                deadline = None
+                continue
+
+            if item is _END:
+                break
+            if isinstance(item, tuple) and len(item) == 2 and item[0] is _ERROR:
+                raise item[1]
+
+            batch.append(item)
+            if deadline is None:
+                deadline = time.monotonic() + flush_timeout
+            if len(batch) >= batch_size:
+                yield batch
+                batch = []
+                deadline = None
+
+        if batch:
+            yield batch
+    finally:
+        stop.set()
+
+
+def score_stream(records, batch_size=16, text_key='title', analyzer=None,
+                 flush_timeout=None, use_cache=True, cache=None):
+    """
+    Bewertet einen Strom von Nachrichten und gibt sie batchweise zurück.
+
+    Args:
+        records: Iterable von Dictionaries (mit text_key) oder Strings
+        batch_size: Maximale Anzahl Texte pro Micro-Batch
+        text_key: Schlüssel mit dem Text im Datensatz
+        analyzer: FinBertAnalyzer (Standard: prozessweiter Analyzer)
+        flush_timeout: Sekunden, nach denen ein unvollständiger Batch bewertet
+                       wird (None = nur volle Batches bzw. Ende der Quelle)
+        use_cache: Persistenten Sentiment-Cache verwenden
+        cache: SentimentCache (Standard: prozessweiter Cache)
+
+    Yields:
+        Kopie jedes Datensatzes mit zusätzlichem 'sentiment_score'
+    """
+    analyzer = analyzer or get_analyzer()
+    if not use_cache:
+        cache = None
+    elif cache is None:
+        cache = get_cache()
+
+    for batch in _iter_batches(records, batch_size, flush_timeout):
+        batch = [{text_key: record} if isinstance(record, str) else dict(record)
+                 for record in batch]
+        scores = _score_batch(analyzer, [record[text_key] for record in batch], cache)
+
+        for record, score in zip(batch, scores):
+            record['sentiment_score'] = score
+            yield record
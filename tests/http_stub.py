@@ -0,0 +1,116 @@
+"""
+Lokaler HTTP-Stub-Server für HttpClient (Tests und benchmarks/bench_http.py).
+
+Liefert einen RSS-Feed mit ETag/Last-Modified (optional gzip), beantwortet
+bedingte Anfragen mit 304 und zählt Verbindungen, Antworten (200/304/Fehler)
+und übertragene Body-Bytes. Die Header jeder Anfrage werden mitgeschrieben;
+mit fail_next lassen sich vorübergehende Fehler (z.B. 503) erzeugen.
+"""
+import gzip
+import hashlib
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+def make_feed(n_items):
+    items = "".join(
+        f"<item><title>Apple stock headline {i}</title><link>https://example.com/{i}</link>"
+        f"<pubDate>Mon, 12 Oct 2026 10:{i % 60:02d}:00 GMT</pubDate>"
+        f"<source url='https://example.com'>Publisher {i % 7}</source></item>"
+        for i in range(n_items)
+    )
+    return f"<?xml version='1.0'?><rss version='2.0'><channel><title>Stub</title>{items}</channel></rss>".encode()
+
+
+class StubServer:
+    """
+    Lokaler HTTP-Server mit Zählern.
+
+    Args:
+        body: Antwort (Bytes)
+        etag: ETag-Header senden
+        last_modified: Last-Modified-Header senden
+    """
+
+    def __init__(self, body, etag=True, last_modified=True):
+        self.body = body
+        self.gzipped = gzip.compress(body)
+        self.etag = '"' + hashlib.md5(body).hexdigest() + '"' if etag else None
+        self.last_modified = 'Mon, 12 Oct 2026 12:00:00 GMT' if last_modified else None
+        self.requests = []        # Header jeder Anfrage
+        self.fail_next = []       # Statuscodes der nächsten Anfragen (z.B. [503, 503])
+        self._lock = threading.Lock()
+        self.reset()
+
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def setup(self):
+                super().setup()
+                with stub._lock:
+                    stub.counters['connections'] += 1
+
+            def log_message(self, *args):
+                pass
+
+            def _empty(self, status):
+                self.send_response(status)
+                if stub.etag and status == 304:
+                    self.send_header('ETag', stub.etag)
+                self.send_header('Content-Length', '0')
+                self.end_headers()
+
+            def do_GET(self):
+                with stub._lock:
+                    stub.requests.append(dict(self.headers))
+                    status = stub.fail_next.pop(0) if stub.fail_next else None
+                if status is not None:
+                    self._empty(status)
+                    with stub._lock:
+                        stub.counters['errors'] += 1
+                    return
+
+                if stub.etag and self.headers.get('If-None-Match') == stub.etag or (
+                        not stub.etag and stub.last_modified
+                        and self.headers.get('If-Modified-Since') == stub.last_modified):
+                    self._empty(304)
+                    with stub._lock:
+                        stub.counters['not_modified'] += 1
+                    return
+
+                body = stub.body
+                use_gzip = 'gzip' in self.headers.get('Accept-Encoding', '')
+                if use_gzip:
+                    body = stub.gzipped
+                self.send_response(200)
+                self.send_header('Content-Type', 'application/rss+xml')
+                if stub.etag:
+                    self.send_header('ETag', stub.etag)
+                if stub.last_modified:
+                    self.send_header('Last-Modified', stub.last_modified)
+                if use_gzip:
+                    self.send_header('Content-Encoding', 'gzip')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+                with stub._lock:
+                    stub.counters['ok'] += 1
+                    stub.counters['bytes'] += len(body)
+
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}/rss"
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    def reset(self):
+        self.counters = {'connections': 0, 'ok': 0, 'not_modified': 0, 'errors': 0, 'bytes': 0}
+        self.requests = []
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.server.shutdown()
+        self.server.server_close()
@@ -0,0 +1,51 @@
+"""
+check_agreement: Abgleich eines quantisierten Backends mit der fp32-Referenz
+anhand der Stub-Modelle (ohne Download).
+"""
+import numpy as np
+import pytest
+
+from stub_model import StubAnalyzer
+from sentiment.backends import AGREEMENT_FIXTURES, check_agreement
+
+
+class Int8StubAnalyzer(StubAnalyzer):
+    """Stub mit symmetrisch auf int8 quantisierten Gewichten."""
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.backend_name = 'stub-int8'
+
+    def load(self):
+        if self.backend is None:
+            super().load()
+            weights = self.backend.weights
+            scale = np.abs(weights).max() / 127
+            self.backend.weights = np.round(weights / scale).astype(np.int8) * scale
+        return self
+
+
+def test_int8_stub_agrees_with_fp32():
+    result = check_agreement(Int8StubAnalyzer(), StubAnalyzer(), strict=True)
+
+    assert result['backend'] == 'stub-int8'
+    assert result['n'] == len(AGREEMENT_FIXTURES)
+    assert 0 < result['max_abs_score_diff'] < 0.05
+    assert result['mean_abs_prob_diff'] <= result['max_abs_prob_diff']
+    assert result['label_agreement'] == 1.0
+    assert result['passed']
+
+
+def test_threshold_is_enforced():
+    # Anderes Modell (andere Gewichte): deutlich abweichende Scores
+    result = check_agreement(StubAnalyzer(seed=1), StubAnalyzer())
+    assert not result['passed']
+    with pytest.raises(ValueError, match='weicht zu stark von fp32 ab'):
+        check_agreement(StubAnalyzer(seed=1), StubAnalyzer(), strict=True)
+
+    # Die Grenzen sind einstellbar
+    quantized = check_agreement(Int8StubAnalyzer(), StubAnalyzer())
+    assert not check_agreement(Int8StubAnalyzer(), StubAnalyzer(),
+                               max_score_diff=quantized['max_abs_score_diff'] / 2)['passed']
+    assert check_agreement(StubAnalyzer(seed=1), StubAnalyzer(), max_score_diff=2.0,
+                           min_label_agreement=0.0)['passed']
@@ -0,0 +1,34 @@
+"""
+QuantizedTorchBackend: mit vorhandenem int8-Artefakt wird das fp32-Modell
+nicht mehr geladen, die Logits bleiben gleich.
+"""
+import numpy as np
+import pytest
+
+torch = pytest.importorskip('torch')
+transformers = pytest.importorskip('transformers')
+
+from sentiment.backends import QuantizedTorchBackend
+
+
+@pytest.fixture
+def tiny_model(tmp_path):
+    config = transformers.BertConfig(vocab_size=100, hidden_size=32, num_hidden_layers=2,
+                                     num_attention_heads=2, intermediate_size=64, num_labels=3)
+    torch.manual_seed(0)
+    transformers.BertForSequenceClassification(config).save_pretrained(tmp_path / 'model')
+    return str(tmp_path / 'model')
+
+
+def test_cached_int8_model_skips_fp32_weights(tiny_model, monkeypatch):
+    inputs = {'input_ids': torch.tensor([[1, 5, 7, 2], [1, 9, 2, 0]]),
+              'attention_mask': torch.tensor([[1, 1, 1, 1], [1, 1, 1, 0]])}
+    first = QuantizedTorchBackend(tiny_model).load()
+    expected = first.predict_logits(inputs)
+
+    def no_fp32(self):
+        raise AssertionError("fp32-Modell geladen")
+
+    monkeypatch.setattr(QuantizedTorchBackend, '_load_fp32', no_fp32)
+    cached = QuantizedTorchBackend(tiny_model).load()
+    np.testing.assert_allclose(cached.predict_logits(inputs), expected, rtol=1e-6, atol=1e-6)
@@ -0,0 +1,96 @@
+"""
+Korrelationen: vektorisierte Berechnung gegen die direkte Berechnung pro Ticker.
+"""
+import numpy as np
+import pandas as pd
+import pytest
+
+from analysis.correlation import (calculate_correlation, compute_ticker_stats,
+                                  lead_lag_analysis, rolling_correlation)
+
+
+def _merged(n_tickers=4, n_days=90, seed=0):
+    rng = np.random.default_rng(seed)
+    dates = pd.bdate_range('2024-01-01', periods=n_days)
+    frames = []
+    for i in range(n_tickers):
+        sentiment = rng.normal(0, 0.3, n_days)
+        volatility = 0.02 + 0.01 * np.roll(sentiment, 2) + rng.normal(0, 0.005, n_days)
+        sentiment[rng.random(n_days) < 0.1] = np.nan
+        frames.append(pd.DataFrame({'ticker': f"T{i}", 'date': dates,
+                                    'sentiment_score': sentiment, 'Volatility': volatility}))
+    return pd.concat(frames, ignore_index=True)
+
+
+def test_inf_does_not_leak_into_other_tickers():
+    df = _merged()
+    with_inf = df.copy()
+    with_inf.loc[(with_inf['ticker'] == 'T1') & (with_inf.index % 90 == 30), 'Volatility'] = np.inf
+    other = lambda result: result.loc[result['ticker'] != 'T1', 'rolling_correlation'].to_numpy()
+
+    np.testing.assert_allclose(other(rolling_correlation(with_inf, window=20)),
+                               other(rolling_correlation(df, window=20)), rtol=1e-6, atol=1e-9)
+    lead_lag = lead_lag_analysis(with_inf, max_lag=3)
+    np.testing.assert_allclose(lead_lag.loc[lead_lag['ticker'] != 'T1', 'correlation'],
+                               lead_lag_analysis(df, max_lag=3).loc[lambda d: d['ticker'] != 'T1',
+                                                                  'correlation'], rtol=1e-9)
+
+
+def _lead_lag_loop(df, max_lag):
+    """Frühere Berechnung: pro Ticker und Lag shift(-lag) und calculate_correlation."""
+    results = []
+    for ticker in df['ticker'].unique():
+        ticker_df = df[df['ticker'] == ticker].sort_values('date').copy()
+        for lag in range(-max_lag, max_lag + 1):
+            ticker_df['Volatility_shifted'] = ticker_df['Volatility'].shift(-lag)
+            corr, p = calculate_correlation(ticker_df, 'sentiment_score', 'Volatility_shifted')
+            results.append({'ticker': ticker, 'lag': lag, 'correlation': corr, 'p_value': p})
+    return pd.DataFrame(results)
+
+
+@pytest.mark.parametrize('method', ['direct', 'fft'])
+def test_lead_lag_matches_shift_loop(method):
+    df = _merged(n_tickers=5, n_days=120, seed=3)
+    # Ticker unterschiedlicher Länge: kürzere Reihen werden mit NaN aufgefüllt
+    df = df.drop(df.index[(df['ticker'] == 'T2') & (df.index % 120 >= 70)])
+    df = df.sample(frac=1.0, random_state=0)
+
+    expected = _lead_lag_loop(df, max_lag=10)
+    result = lead_lag_analysis(df, max_lag=10, method=method)
+
+    assert list(result['ticker']) == list(expected['ticker'])
+    assert list(result['lag']) == list(expected['lag'])
+    np.testing.assert_allclose(result['correlation'], expected['correlation'], rtol=1e-7, atol=1e-9)
+    np.testing.assert_allclose(result['p_value'], expected['p_value'], rtol=1e-6, atol=1e-9)
+
+
+@pytest.mark.parametrize('method', ['direct', 'fft'])
+def test_lead_lag_constant_group_is_uncorrelated(method):
+    df = _merged(n_tickers=3, n_days=60, seed=1)
+    df.loc[df['ticker'] == 'T1', 'Volatility'] = 0.1
+
+    result = lead_lag_analysis(df, max_lag=3, method=method)
+    constant = result[result['ticker'] == 'T1']
+    np.testing.assert_array_equal(constant['correlation'], 0.0)
+    np.testing.assert_array_equal(constant['p_value'], 1.0)
+
+    stats = compute_ticker_stats(df).set_index('ticker')
+    assert stats.loc['T1', 'correlation'] == 0.0
+    assert stats.loc['T1', 'p_value'] == 1.0
+    assert np.isfinite(stats.loc[['T0', 'T2'], 'correlation']).all()
+
+
+def test_rolling_correlation_matches_pandas():
+    df = _merged(n_tickers=4, n_days=100, seed=2).sample(frac=1.0, random_state=3)
+    df.loc[df['ticker'] == 'T3', 'Volatility'] = 0.1
+
+    result = rolling_correlation(df, window=20, min_periods=10).set_index(['ticker', 'date'])
+    expected = pd.concat([
+        t.set_index(['ticker', 'date'])['sentiment_score'].rolling(20, min_periods=10)
+         .corr(t.set_index(['ticker', 'date'])['Volatility'])
+        for _, t in df.sort_values('date').groupby('ticker')])
+
+    assert result.loc['T3', 'rolling_correlation'].isna().all()
+    others = expected.drop('T3', level='ticker')
+    np.testing.assert_allclose(result.loc[others.index, 'rolling_correlation'], others,
+                               rtol=1e-7, atol=1e-9)
@@ -0,0 +1,80 @@
+"""
+Volatilitäts-Schätzer gegen die Formeln direkt mit pandas pro Ticker, und
+die Auswahl des Schätzers über volatility= / estimator=.
+"""
+import numpy as np
+import pandas as pd
+import pytest
+
+from synthetic import make_prices
+from analysis.correlation import compute_ticker_stats, merge_sentiment_volatility
+from analysis.estimators import ESTIMATORS, volatility_column, volatility_estimators
+
+WINDOW = 20
+LAMBDA = 0.94
+
+
+def _reference(df):
+    k = 0.34 / (1.34 + (WINDOW + 1) / (WINDOW - 1))
+    frames = []
+    for _, t in df.groupby('Ticker', sort=False):
+        t = t.sort_values('Date').copy()
+        log_hl = np.log(t['High'] / t['Low'])
+        log_co = np.log(t['Close'] / t['Open'])
+        overnight = np.log(t['Open'] / t['Close'].shift(1))
+        rs = (np.log(t['High'] / t['Close']) * np.log(t['High'] / t['Open'])
+              + np.log(t['Low'] / t['Close']) * np.log(t['Low'] / t['Open']))
+        gk = 0.5 * log_hl ** 2 - (2 * np.log(2) - 1) * log_co ** 2
+        yz = (overnight.rolling(WINDOW).var() + k * log_co.rolling(WINDOW).var()
+              + (1 - k) * rs.rolling(WINDOW).mean())
+        frames.append(t.assign(
+            Volatility_close=t['Daily_Return'].rolling(WINDOW).std(),
+            Volatility_parkinson=np.sqrt((log_hl ** 2).rolling(WINDOW).mean() / (4 * np.log(2))),
+            Volatility_garman_klass=np.sqrt(gk.rolling(WINDOW).mean().clip(lower=0)),
+            Volatility_yang_zhang=np.sqrt(yz.clip(lower=0)),
+            Volatility_ewma=np.sqrt((t['Daily_Return'] ** 2)
+                                    .ewm(alpha=1 - LAMBDA, adjust=False, min_periods=WINDOW).mean()),
+        ))
+    return pd.concat(frames, ignore_index=True)
+
+
+@pytest.fixture(scope='module')
+def prices():
+    return make_prices(5, 200, seed=4).sample(frac=1.0, random_state=1)
+
+
+@pytest.mark.parametrize('name', ESTIMATORS)
+def test_estimator_matches_pandas_formula(prices, name):
+    expected = _reference(prices)
+    result = volatility_estimators(prices, window=WINDOW, estimators=[name], ewma_lambda=LAMBDA)
+    column = f'Volatility_{name}'
+    merged = expected[['Ticker', 'Date', column]].merge(
+        result[['Ticker', 'Date', column]], on=['Ticker', 'Date'], suffixes=('_expected', ''))
+    assert len(merged) == len(prices)
+    assert merged[column].notna().sum() > 0
+    np.testing.assert_allclose(merged[column], merged[f'{column}_expected'],
+                               rtol=1e-9, atol=1e-12, equal_nan=True)
+
+
+def test_volatility_column_dispatch():
+    assert volatility_column(None) == 'Volatility'
+    assert volatility_column('Volatility') == 'Volatility'
+    assert volatility_column('parkinson') == 'Volatility_parkinson'
+    assert volatility_column('Volatility_ewma') == 'Volatility_ewma'
+    with pytest.raises(ValueError, match='Unbekannter Volatilitäts-Schätzer'):
+        volatility_column('parkinsen')
+    with pytest.raises(ValueError):
+        volatility_estimators(make_prices(1, 30), estimators=['garman'])
+
+
+@pytest.mark.parametrize('estimator', ['parkinson', 'yang_zhang'])
+def test_estimator_selects_volatility_column(prices, estimator):
+    stock = volatility_estimators(prices.assign(Volatility=np.nan), window=WINDOW)
+    sentiment = (stock[['Ticker', 'Date']].rename(columns={'Ticker': 'ticker', 'Date': 'date'})
+                 .assign(sentiment_score=np.random.default_rng(0).normal(size=len(stock))))
+    merged = merge_sentiment_volatility(sentiment, stock, volatility=estimator)
+
+    column = f'Volatility_{estimator}'
+    np.testing.assert_array_equal(merged['Volatility'], merged[column])
+    pd.testing.assert_frame_equal(compute_ticker_stats(merged),
+                                  compute_ticker_stats(merged, volatility=estimator))
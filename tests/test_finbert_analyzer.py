@@ -0,0 +1,138 @@
+"""
+analyze_dataframe mit StubAnalyzer: Batching-Modi, Deduplizierung und
+Pipeline liefern dieselben Scores wie die einfache Berechnung.
+"""
+import threading
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from stub_model import StubAnalyzer
+from synthetic import make_news_items, make_prices
+from sentiment.finbert_analyzer import (_iter_batch_probs, _iter_batch_probs_pipelined,
+                                        analyze_dataframe, make_token_batches)
+
+
+class CountingAnalyzer(StubAnalyzer):
+    """StubAnalyzer, der jeden an das Modell übergebenen Text mitschreibt."""
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.seen = []
+
+    def predict_proba(self, texts):
+        self.seen.extend(texts)
+        return super().predict_proba(texts)
+
+
+class FailingTokenizerAnalyzer(StubAnalyzer):
+    """StubAnalyzer, dessen Tokenisierung bei Texten mit 'BOOM' fehlschlägt."""
+
+    def encode(self, texts):
+        if any('BOOM' in text for text in texts):
+            raise RuntimeError("Tokenizer-Fehler")
+        return super().encode(texts)
+
+
+def _consume(iterator, timeout=10):
+    """Liest einen Iterator in einem Thread aus; schlägt fehl, statt zu hängen."""
+    outcome = {}
+
+    def run():
+        try:
+            outcome['items'] = list(iterator)
+        except Exception as e:
+            outcome['error'] = e
+
+    thread = threading.Thread(target=run, daemon=True)
+    thread.start()
+    thread.join(timeout)
+    assert not thread.is_alive(), "Pipeline hängt"
+    return outcome
+
+
+@pytest.fixture(scope='module')
+def news():
+    items = make_news_items(make_prices(3, 20, seed=1), articles_per_day=2, seed=2)
+    df = pd.DataFrame(items)
+    # Unterschiedlich lange Texte, damit die Buckets sich von festen Batches unterscheiden
+    rng = np.random.default_rng(0)
+    repeat = rng.integers(1, 12, size=len(df))
+    df['title'] = [title + ' record' * r for title, r in zip(df['title'], repeat)]
+    return df
+
+
+def test_token_batches_cover_every_text_once_within_budget():
+    lengths = list(np.random.default_rng(1).integers(3, 120, size=500))
+    batches = make_token_batches(lengths, token_budget=1024, max_batch_size=32)
+
+    assert sorted(i for batch in batches for i in batch) == list(range(len(lengths)))
+    for batch in batches:
+        assert len(batch) <= 32
+        assert len(batch) == 1 or len(batch) * max(lengths[i] for i in batch) <= 1024
+
+
+def test_bucket_batching_matches_fixed_in_row_order(news):
+    fixed = analyze_dataframe(news, analyzer=StubAnalyzer(), use_cache=False, dedupe=False,
+                              batching='fixed', batch_size=16)
+    bucket = analyze_dataframe(news, analyzer=StubAnalyzer(), use_cache=False, dedupe=False,
+                               batching='bucket', token_budget=512)
+
+    pd.testing.assert_index_equal(bucket.index, news.index)
+    assert list(bucket['title']) == list(news['title'])
+    np.testing.assert_allclose(bucket['sentiment_score'], fixed['sentiment_score'],
+                               rtol=1e-6, atol=1e-6)
+    assert fixed['sentiment_score'].std() > 0
+
+
+def test_dedupe_scores_each_text_once(news):
+    # Dieselbe Meldung bei mehreren Tickern, teils mit abweichenden Leerzeichen
+    df = pd.concat([news, news.assign(ticker='OTHER'),
+                    news.iloc[:20].assign(title=lambda d: '  ' + d['title'].str.replace(' ', '  '))],
+                   ignore_index=True)
+    analyzer = CountingAnalyzer()
+    result = analyze_dataframe(df, analyzer=analyzer, use_cache=False, dedupe=True)
+
+    assert len(analyzer.seen) == news['title'].nunique()
+    assert len(set(analyzer.seen)) == len(analyzer.seen)
+
+    n = len(news)
+    scores = result['sentiment_score'].to_numpy()
+    np.testing.assert_array_equal(scores[n:2 * n], scores[:n])
+    np.testing.assert_array_equal(scores[2 * n:], scores[:20])
+
+    plain = analyze_dataframe(df, analyzer=StubAnalyzer(), use_cache=False, dedupe=False)
+    np.testing.assert_allclose(scores, plain['sentiment_score'], rtol=1e-6, atol=1e-6)
+
+
+@pytest.mark.parametrize('batching', ['fixed', 'bucket'])
+def test_pipeline_matches_sequential(news, batching):
+    kwargs = dict(use_cache=False, batching=batching, batch_size=8, token_budget=256)
+    sequential = analyze_dataframe(news, analyzer=StubAnalyzer(), pipeline=False, **kwargs)
+    pipelined = analyze_dataframe(news, analyzer=StubAnalyzer(), pipeline=True, **kwargs)
+    np.testing.assert_array_equal(pipelined['sentiment_score'], sequential['sentiment_score'])
+
+
+def test_pipeline_tokenizer_error_affects_only_its_batch():
+    batches = [['shares rise'], ['BOOM shares fall'], ['record quarter']]
+    analyzer = FailingTokenizerAnalyzer()
+    outcome = _consume(_iter_batch_probs_pipelined(analyzer, iter(batches), prefetch=1))
+    expected = list(_iter_batch_probs(analyzer, batches))
+
+    assert 'error' not in outcome
+    results = outcome['items']
+    assert len(results) == 3
+    assert results[1][0] is None and isinstance(results[1][1], RuntimeError)
+    for (probs, error), (expected_probs, _) in zip(results[::2], expected[::2]):
+        assert error is None
+        np.testing.assert_allclose(probs, expected_probs)
+
+
+def test_pipeline_source_error_propagates():
+    def batches():
+        yield ['shares rise']
+        raise ValueError("Quelle kaputt")
+
+    outcome = _consume(_iter_batch_probs_pipelined(StubAnalyzer(), batches(), prefetch=1))
+    assert isinstance(outcome.get('error'), ValueError)
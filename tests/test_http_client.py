@@ -0,0 +1,79 @@
+"""
+HttpClient.get_cached gegen einen lokalen Stub-Server: 304 mit gespeichertem
+Ergebnis, If-None-Match/If-Modified-Since, Wiederholungen und Connection-Pool.
+"""
+import pytest
+import requests
+
+from data.http_client import HttpClient
+from data.news_fetcher import _parse_google_feed
+from http_stub import StubServer, make_feed
+
+
+class CountingParser:
+    def __init__(self):
+        self.calls = 0
+
+    def __call__(self, response):
+        self.calls += 1
+        return _parse_google_feed(response)
+
+
+@pytest.fixture
+def client(tmp_path):
+    client = HttpClient(meta_path=str(tmp_path / 'meta.sqlite'), retries=2)
+    yield client
+    client.close()
+
+
+def test_etag_304_reuses_stored_result(client):
+    parse = CountingParser()
+    with StubServer(make_feed(5)) as stub:
+        first = client.get_cached(stub.url, parse)
+        second = client.get_cached(stub.url, parse)
+        third = client.get_cached(stub.url, parse)
+
+    assert len(first) == 5
+    assert second == first and third == first
+    assert parse.calls == 1
+    assert stub.counters['ok'] == 1 and stub.counters['not_modified'] == 2
+    assert 'If-None-Match' not in stub.requests[0]
+    assert stub.requests[1]['If-None-Match'] == stub.etag
+    assert stub.requests[1]['If-Modified-Since'] == stub.last_modified
+
+
+def test_last_modified_only(client):
+    parse = CountingParser()
+    with StubServer(make_feed(3), etag=False) as stub:
+        first = client.get_cached(stub.url, parse)
+        second = client.get_cached(stub.url, parse)
+
+    assert second == first
+    assert parse.calls == 1
+    assert 'If-None-Match' not in stub.requests[1]
+    assert stub.requests[1]['If-Modified-Since'] == stub.last_modified
+    assert stub.counters['not_modified'] == 1
+
+
+def test_retries_transient_errors(client):
+    with StubServer(make_feed(2)) as stub:
+        stub.fail_next = [503, 502]
+        assert len(client.get_cached(stub.url, CountingParser())) == 2
+        assert len(stub.requests) == 3
+        assert stub.counters['errors'] == 2
+
+        # Mehr Fehler als Wiederholungen: Fehler statt leerem Ergebnis
+        stub.reset()
+        stub.fail_next = [503, 503, 503]
+        with pytest.raises(requests.exceptions.RetryError):
+            client.get(stub.url + '?other')
+        assert len(stub.requests) == 3
+
+
+def test_connections_are_pooled(client):
+    with StubServer(make_feed(2)) as stub:
+        for _ in range(10):
+            client.get_cached(stub.url, CountingParser())
+    assert stub.counters['connections'] == 1
+    assert len(stub.requests) == 10
+    assert client.stats['not_modified'] == 9
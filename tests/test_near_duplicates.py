@@ -0,0 +1,36 @@
+import pandas as pd
+
+from synthetic import make_news_items, make_prices
+from data.news_fetcher import news_to_dataframe
+from sentiment.near_duplicates import collapse_near_duplicates
+
+
+def _archive():
+    return news_to_dataframe(make_news_items(make_prices(5, 60), articles_per_day=4))
+
+
+def test_collapse_is_independent_of_row_order():
+    df = _archive()
+    expected = collapse_near_duplicates(df)
+    assert len(expected) < len(df)
+    for seed in range(3):
+        shuffled = df.sample(frac=1, random_state=seed)
+        pd.testing.assert_frame_equal(collapse_near_duplicates(shuffled), expected)
+
+
+def test_representative_is_earliest_article():
+    ts = pd.Timestamp('2025-01-02 10:00')
+    df = pd.DataFrame({
+        'ticker': ['AAPL'] * 3,
+        'timestamp': [ts + pd.Timedelta(minutes=5), ts, ts],
+        'source': ['yahoo', 'google', 'finnhub'],
+        'link': ['https://a/1', 'https://b/1', 'https://c/1'],
+        'title': ['Apple stock rises after earnings - Reuters',
+                  'Apple stock rises after earnings',
+                  'Apple stock rises after earnings | Yahoo Finance'],
+    })
+    result = collapse_near_duplicates(df)
+    assert len(result) == 1
+    # Früheste Meldung, bei Gleichstand alphabetisch erste Quelle
+    assert result['source'].iloc[0] == 'finnhub'
+    assert result['weight'].iloc[0] == 3
@@ -0,0 +1,53 @@
+"""
+Fehlgeschlagene Abrufe werden im asynchronen Engine als Fehler gezählt
+(Laufbericht) statt als erfolgreiche Abrufe ohne Artikel. Der asynchrone
+Engine läuft auch innerhalb einer bereits laufenden Event-Loop.
+"""
+import asyncio
+
+import data.news_engine as news_engine
+import data.news_fetcher as news_fetcher
+from pipeline.metrics import summarize_requests
+
+FAST = {'rate': 1000.0, 'burst': 1000}
+
+
+class _FailingClient:
+    def get_cached(self, url, parse, params=None):
+        raise ConnectionError("Verbindung abgelehnt")
+
+
+def test_fetch_errors_are_counted(monkeypatch, capsys):
+    monkeypatch.setattr(news_fetcher, 'get_client', lambda: _FailingClient())
+    monkeypatch.setattr(news_engine, 'fetch_yahoo_news', lambda ticker, **kwargs: [])
+    samples = []
+    df = asyncio.run(news_engine.fetch_all_news_async(
+        ['AAA', 'BBB'], limits={'yahoo': FAST, 'google': FAST},
+        on_request=lambda source, seconds, ok: samples.append((source, seconds, ok))))
+
+    google = [(seconds, ok) for source, seconds, ok in samples if source == 'google']
+    assert summarize_requests(google)['errors'] == 2
+    assert df.empty
+    out = capsys.readouterr().out
+    assert "AAA (Google): Fehler - Verbindung abgelehnt" in out
+    assert "Google: 2 fehlgeschlagene Abrufe" in out
+
+
+def test_fetchers_still_return_empty_list_by_default(monkeypatch):
+    monkeypatch.setattr(news_fetcher, 'get_client', lambda: _FailingClient())
+    assert news_fetcher.fetch_google_news('Alpha Inc', 'AAA') == []
+    assert news_fetcher.fetch_finnhub('AAA', 'key') == []
+
+
+def test_async_engine_inside_running_loop(monkeypatch):
+    # Wie in Jupyter: fetch_all_news wird aus einer laufenden Event-Loop aufgerufen
+    item = {'title': 'AAA shares rise', 'link': 'https://news.example/AAA/1', 'publisher': 'Yahoo',
+            'timestamp': '2024-01-02 10:00', 'ticker': 'AAA', 'company': 'AAA', 'source': 'yahoo'}
+    monkeypatch.setattr(news_engine, 'fetch_yahoo_news', lambda ticker, **kwargs: [dict(item)])
+    monkeypatch.setattr(news_engine, 'fetch_google_news', lambda company, ticker, **kwargs: [])
+
+    async def notebook_cell():
+        return news_fetcher.fetch_all_news(['AAA'], engine='async')
+
+    df = asyncio.run(notebook_cell())
+    assert list(df['title']) == ['AAA shares rise']
@@ -0,0 +1,50 @@
+"""
+Tageskontingent der NewsAPI: übersprungen statt gewartet, Verbrauch bleibt
+über Neustarts (neue NewsArchive-Instanz) erhalten.
+"""
+import asyncio
+import time
+from datetime import datetime, timezone
+
+import data.news_engine as news_engine
+from data.news_archive import NewsArchive
+
+FAST = {'rate': 1000.0, 'burst': 1000}
+
+
+def _run(tickers, archive, limits=None):
+    limits = {'yahoo': FAST, 'google': FAST, **(limits or {})}
+    return asyncio.run(news_engine.fetch_all_news_async(
+        tickers, newsapi_key='key', limits=limits, quota=archive))
+
+
+def test_quota_is_skipped_and_persisted(tmp_path, monkeypatch):
+    calls = []
+    monkeypatch.setattr(news_engine, '_fetch_source',
+                        lambda source, ticker, *args, **kwargs: calls.append((source, ticker)) or [])
+    day = datetime.now(timezone.utc).date().isoformat()
+    tickers = [f"T{i}" for i in range(5)]
+    limits = {'newsapi': {'rate': 1000.0, 'burst': 1000, 'daily_quota': 3}}
+
+    start = time.perf_counter()
+    _run(tickers, NewsArchive(str(tmp_path / 'archive.sqlite')), limits)
+    assert time.perf_counter() - start < 5
+    assert sum(source == 'newsapi' for source, _ in calls) == 3
+
+    # Neuer Prozess: Kontingent des Tages ist weiterhin verbraucht
+    calls.clear()
+    archive = NewsArchive(str(tmp_path / 'archive.sqlite'))
+    assert archive.quota_used('newsapi', day) == 3
+    _run(tickers, archive, limits)
+    assert not [c for c in calls if c[0] == 'newsapi']
+    assert sum(source == 'yahoo' for source, _ in calls) == len(tickers)
+
+
+def test_slow_bucket_skips_instead_of_sleeping(tmp_path, monkeypatch):
+    calls = []
+    monkeypatch.setattr(news_engine, '_fetch_source',
+                        lambda source, ticker, *args, **kwargs: calls.append((source, ticker)) or [])
+    start = time.perf_counter()
+    _run(['A', 'B', 'C'], None, {'yahoo': {'rate': 1 / 3600, 'burst': 1}})
+    assert time.perf_counter() - start < 5
+    assert sum(source == 'yahoo' for source, _ in calls) == 1
@@ -0,0 +1,66 @@
+"""
+Artikel ohne lesbares Datum werden verworfen statt mit der lokalen Uhrzeit
+gespeichert; Zeitstempel sind UTC und verschieben die Hochwassermarke nicht.
+"""
+from datetime import datetime, timedelta, timezone
+
+import data.news_fetcher as news_fetcher
+from data.news_archive import NewsArchive
+from data.news_fetcher import news_to_dataframe
+
+
+class _Response:
+    def __init__(self, payload):
+        self.payload = payload
+
+    def json(self):
+        return self.payload
+
+
+class _Client:
+    def __init__(self, payload):
+        self.payload = payload
+
+    def get_cached(self, url, parse, params=None):
+        return parse(_Response(self.payload))
+
+
+def test_finnhub_drops_missing_dates_and_uses_utc(monkeypatch):
+    payload = [
+        {'headline': 'Mit Datum', 'source': 'X', 'url': 'https://a', 'datetime': 1700000000},
+        {'headline': 'Ohne Datum', 'source': 'X', 'url': 'https://b'},
+        {'headline': 'Datum 0', 'source': 'X', 'url': 'https://c', 'datetime': 0},
+    ]
+    monkeypatch.setattr(news_fetcher, 'get_client', lambda: _Client(payload))
+    items = news_fetcher.fetch_finnhub('AAA', 'key', days_back=36500)
+    assert [item['title'] for item in items] == ['Mit Datum']
+    assert items[0]['timestamp'] == datetime(2023, 11, 14, 22, 13, 20, tzinfo=timezone.utc)
+
+
+def test_google_drops_unparseable_dates(monkeypatch):
+    now = datetime.now(timezone.utc).replace(microsecond=0)
+    entries = [
+        {'title': 'Mit Datum', 'publisher': 'G', 'link': 'https://a', 'timestamp': now},
+        {'title': 'Ohne Datum', 'publisher': 'G', 'link': 'https://b', 'timestamp': None},
+        # Aus einem älteren HTTP-Cache: naiv, aber bereits UTC
+        {'title': 'Naiv', 'publisher': 'G', 'link': 'https://c', 'timestamp': now.replace(tzinfo=None)},
+    ]
+    monkeypatch.setattr(news_fetcher, 'get_client',
+                        lambda: type('C', (), {'get_cached': lambda self, url, parse: entries})())
+    items = news_fetcher.fetch_google_news('Alpha Inc', 'AAA')
+    assert [item['title'] for item in items] == ['Mit Datum', 'Naiv']
+    assert all(item['timestamp'] == now for item in items)
+
+
+def test_future_timestamps_do_not_raise_watermark(tmp_path):
+    archive = NewsArchive(str(tmp_path / 'archive.sqlite'))
+    past = datetime.now(timezone.utc) - timedelta(days=1)
+    items = [
+        {'ticker': 'AAA', 'company': 'A', 'title': 'Alt', 'publisher': 'P', 'link': 'https://a',
+         'timestamp': past, 'source': 'yahoo'},
+        {'ticker': 'AAA', 'company': 'A', 'title': 'Zukunft', 'publisher': 'P', 'link': 'https://b',
+         'timestamp': past + timedelta(days=3), 'source': 'yahoo'},
+    ]
+    archive.append(news_to_dataframe(items))
+    watermark = archive.watermarks()[('AAA', 'yahoo')]
+    assert watermark == past.replace(tzinfo=None)
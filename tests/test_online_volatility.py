@@ -0,0 +1,60 @@
+"""
+OnlineVolatility liefert nach dem Anhängen neuer Tage dieselben Werte wie
+die Batch-Berechnung rolling_volatility über die gesamte Historie.
+"""
+import numpy as np
+import pytest
+
+from synthetic import make_prices
+from analysis.online_volatility import OnlineVolatility
+from analysis.volatility import rolling_volatility
+
+WINDOW = 20
+
+
+def _batch(prices):
+    result = rolling_volatility(prices, windows=(WINDOW,), dtype=np.float64)
+    return result.pivot(index='Date', columns='Ticker', values=f'Volatility_{WINDOW}')
+
+
+@pytest.mark.parametrize('history', [5, WINDOW, 60])
+def test_chunks_match_batch(tmp_path, history):
+    prices = make_prices(6, 150, seed=11)
+    # Ein fehlender und ein unendlicher Wert mitten in der Reihe
+    prices.loc[40, 'Daily_Return'] = np.nan
+    prices.loc[200, 'Daily_Return'] = np.inf
+    expected = _batch(prices)
+    dates = sorted(prices['Date'].unique())
+    tickers = list(prices['Ticker'].unique())
+
+    state = OnlineVolatility.from_frame(prices[prices['Date'] < dates[history]], window=WINDOW)
+    # In Blöcken unterschiedlicher Größe anhängen, dazwischen Checkpoint laden
+    position, chunk = history, 1
+    while position < len(dates):
+        for date in dates[position:position + chunk]:
+            day = prices[prices['Date'] == date].set_index('Ticker').loc[tickers]
+            result = state.update_returns(tickers, day['Daily_Return'].to_numpy())
+            np.testing.assert_allclose(result, expected.loc[date, tickers].to_numpy(),
+                                       rtol=1e-9, atol=1e-12, equal_nan=True)
+        path = str(tmp_path / 'state.npz')
+        state.save(path)
+        state = OnlineVolatility.load(path)
+        position += chunk
+        chunk = chunk * 2 + 1
+
+    final = state.volatility(tickers).to_numpy()
+    np.testing.assert_allclose(final, expected.iloc[-1][tickers].to_numpy(), rtol=1e-9, atol=1e-12)
+
+
+def test_prices_match_batch_returns():
+    prices = make_prices(3, 80, seed=2)
+    prices['Daily_Return'] = prices.groupby('Ticker')['Close'].pct_change()
+    expected = _batch(prices)
+    dates = sorted(prices['Date'].unique())
+    tickers = list(prices['Ticker'].unique())
+
+    state = OnlineVolatility.from_frame(prices[prices['Date'] < dates[30]], window=WINDOW)
+    for date in dates[30:]:
+        day = prices[prices['Date'] == date].set_index('Ticker').loc[tickers]
+        result = state.update_prices(tickers, day['Close'].to_numpy())
+    np.testing.assert_allclose(result, expected.iloc[-1][tickers].to_numpy(), rtol=1e-9)
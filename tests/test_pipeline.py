@@ -0,0 +1,103 @@
+"""
+Pipeline-Runner: Überspringen, --resume, geänderte Parameter und --from-stage.
+"""
+import pandas as pd
+import pytest
+
+import sentiment.finbert_analyzer
+from stub_model import StubAnalyzer
+from pipeline.runner import Pipeline, Stage
+from pipeline.stages import build_pipeline
+
+
+class Calls:
+    def __init__(self):
+        self.counts = {}
+
+    def stage(self, name, func):
+        def run(inputs, **params):
+            self.counts[name] = self.counts.get(name, 0) + 1
+            return func(inputs, **params)
+        return run
+
+
+def _prices(inputs, tickers, period):
+    days = {'1mo': 20, '1y': 250}[period]
+    return {'prices': pd.DataFrame({'ticker': [t for t in tickers for _ in range(days)],
+                                    'close': range(days * len(tickers))})}
+
+
+def _rows(inputs, factor):
+    return {'rows': pd.DataFrame({'n': [len(inputs['prices']['prices']) * factor]})}
+
+
+def _pipeline(root, calls, tickers=('A', 'B'), period='1y', factor=1):
+    return Pipeline([
+        Stage('prices', calls.stage('prices', _prices), source=True,
+              params={'tickers': list(tickers), 'period': period}),
+        Stage('rows', calls.stage('rows', _rows), deps=['prices'], params={'factor': factor}),
+    ], root=str(root))
+
+
+def _result(pipeline, manifests):
+    return int(pipeline.load(manifests['rows'])['rows']['n'].iloc[0])
+
+
+def test_unchanged_stages_are_skipped(tmp_path):
+    calls = Calls()
+    _pipeline(tmp_path, calls).run()
+    pipeline = _pipeline(tmp_path, calls)
+    assert _result(pipeline, pipeline.run()) == 500
+    assert calls.counts == {'prices': 1, 'rows': 1}
+
+
+def test_resume_reuses_source_with_same_params(tmp_path):
+    calls = Calls()
+    _pipeline(tmp_path, calls).run()
+    pipeline = _pipeline(tmp_path, calls, factor=2)
+    assert _result(pipeline, pipeline.run(resume=True)) == 1000
+    assert calls.counts == {'prices': 1, 'rows': 2}
+
+
+@pytest.mark.parametrize('changed', [{'period': '1mo'}, {'tickers': ('A',)}])
+def test_resume_with_changed_params_reloads_source(tmp_path, changed):
+    calls = Calls()
+    _pipeline(tmp_path, calls).run()
+    pipeline = _pipeline(tmp_path, calls, **changed)
+    expected = len(changed.get('tickers', 'AB')) * (20 if 'period' in changed else 250)
+    assert _result(pipeline, pipeline.run(resume=True)) == expected
+    assert calls.counts == {'prices': 2, 'rows': 2}
+
+
+def test_resume_picks_older_artifact_with_matching_params(tmp_path):
+    calls = Calls()
+    _pipeline(tmp_path, calls).run()
+    _pipeline(tmp_path, calls, period='1mo').run()
+    pipeline = _pipeline(tmp_path, calls)
+    assert _result(pipeline, pipeline.run(resume=True)) == 500
+    assert calls.counts['prices'] == 2
+
+
+def test_from_stage_recomputes_downstream_only(tmp_path):
+    calls = Calls()
+    _pipeline(tmp_path, calls).run()
+    pipeline = _pipeline(tmp_path, calls)
+    assert _result(pipeline, pipeline.run(from_stage='rows')) == 500
+    assert calls.counts == {'prices': 1, 'rows': 2}
+
+    # Mit anderen Parametern passt das Quell-Artefakt nicht mehr
+    pipeline = _pipeline(tmp_path, calls, period='1mo')
+    assert _result(pipeline, pipeline.run(from_stage='rows')) == 40
+    assert calls.counts == {'prices': 2, 'rows': 3}
+
+
+def test_sentiment_fingerprint_includes_backend(monkeypatch):
+    def sentiment_params(backend):
+        analyzer = StubAnalyzer()
+        analyzer.backend_name = backend
+        monkeypatch.setattr(sentiment.finbert_analyzer, '_default_analyzer', analyzer)
+        return build_pipeline(['A']).by_name['sentiment'].params
+
+    torch, onnx = sentiment_params('torch'), sentiment_params('onnx-int8')
+    assert torch['model']['backend'] == 'torch'
+    assert torch != onnx
@@ -0,0 +1,50 @@
+"""
+InferencePool: mehrere Worker liefern dieselben Scores wie ein Prozess,
+Fehler beenden die Worker sofort.
+"""
+import pickle
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from stub_model import StubAnalyzer
+from synthetic import make_news_items, make_prices
+from sentiment.finbert_analyzer import analyze_dataframe
+from sentiment.pool import InferencePool
+
+
+@pytest.fixture(scope='module')
+def news():
+    return pd.DataFrame(make_news_items(make_prices(2, 15, seed=3), articles_per_day=2, seed=4))
+
+
+def test_analyzer_copy_is_unloaded():
+    analyzer = StubAnalyzer(max_length=64, seed=3).load()
+    clone = pickle.loads(pickle.dumps(analyzer))
+
+    assert type(clone) is StubAnalyzer
+    assert not clone.is_loaded and analyzer.is_loaded
+    assert (clone.max_length, clone.seed, clone.backend_name) == (64, 3, 'stub')
+    np.testing.assert_allclose(clone.predict_proba(['shares rise']),
+                               analyzer.predict_proba(['shares rise']))
+
+
+def test_two_workers_match_single_process(news):
+    kwargs = dict(use_cache=False, batch_size=8)
+    single = analyze_dataframe(news, analyzer=StubAnalyzer(), n_workers=1, **kwargs)
+    pooled = analyze_dataframe(news, analyzer=StubAnalyzer(), n_workers=2, **kwargs)
+    np.testing.assert_allclose(pooled['sentiment_score'], single['sentiment_score'],
+                               rtol=1e-6, atol=1e-6)
+
+
+def test_error_terminates_workers():
+    def batches():
+        yield ['shares rise']
+        raise ValueError("Quelle kaputt")
+
+    pool = InferencePool(StubAnalyzer(), n_workers=2, threads_per_worker=1)
+    with pytest.raises(ValueError):
+        with pool:
+            list(pool.imap(batches()))
+    assert pool._pool is None
@@ -0,0 +1,85 @@
+"""
+PriceStore.update_ticker: der zuletzt gespeicherte (ggf. unvollständige) Tag
+wird beim nächsten Update durch den neu geladenen Kurs ersetzt; nach einem
+Split wird die gesamte Historie neu geladen.
+"""
+import pandas as pd
+
+from data.price_store import PriceStore
+
+
+def _bars(days, close, splits=0.0):
+    return pd.DataFrame({'Date': pd.to_datetime(days), 'Open': 1.0, 'High': 2.0, 'Low': 0.5,
+                         'Close': close, 'Volume': 100, 'Dividends': 0.0, 'Stock Splits': splits})
+
+
+def test_last_bar_is_replaced(tmp_path, monkeypatch):
+    store = PriceStore(root=str(tmp_path))
+    # Erster Lauf während der Handelszeit am 2024-01-03: letzter Tag unvollständig
+    store.save('ABC', _bars(['2024-01-01', '2024-01-02', '2024-01-03'], [10.0, 11.0, 11.5]))
+    store._index['ABC'] = {'covered_from': '2023-01-01'}
+
+    requests = []
+
+    def download(ticker, start=None, end=None, period=None):
+        requests.append((start, end))
+        return _bars(['2024-01-02', '2024-01-03', '2024-01-04'], [11.0, 12.0, 13.0])
+
+    monkeypatch.setattr(store, '_download', download)
+    added = store.update_ticker('ABC', period='1y', today='2024-01-04')
+
+    assert requests == [('2024-01-02', '2024-01-05')]
+    assert added == 1
+    stored = store.load('ABC')
+    assert list(stored['Date'].dt.strftime('%Y-%m-%d')) == ['2024-01-01', '2024-01-02',
+                                                            '2024-01-03', '2024-01-04']
+    assert list(stored['Close']) == [10.0, 11.0, 12.0, 13.0]
+
+
+def test_same_day_update_refreshes_partial_bar(tmp_path, monkeypatch):
+    store = PriceStore(root=str(tmp_path))
+    store.save('ABC', _bars(['2024-01-02', '2024-01-03'], [11.0, 11.5]))
+    store._index['ABC'] = {'covered_from': '2023-01-01'}
+    monkeypatch.setattr(store, '_download', lambda ticker, start=None, end=None, period=None:
+                        _bars(['2024-01-02', '2024-01-03'], [11.0, 12.5]))
+
+    assert store.update_ticker('ABC', period='1y', today='2024-01-03') == 0
+    assert list(store.load('ABC')['Close']) == [11.0, 12.5]
+
+
+def test_split_reloads_full_history(tmp_path, monkeypatch):
+    store = PriceStore(root=str(tmp_path))
+    store.save('ABC', _bars(['2024-01-01', '2024-01-02', '2024-01-03'], [100.0, 102.0, 104.0]))
+    store._index['ABC'] = {'covered_from': '2023-01-01'}
+
+    # 2:1-Split am 2024-01-05: yfinance liefert die gesamte Historie halbiert
+    adjusted = _bars(['2024-01-01', '2024-01-02', '2024-01-03', '2024-01-04', '2024-01-05'],
+                     [50.0, 51.0, 52.0, 53.0, 27.0], splits=[0, 0, 0, 0, 2.0])
+    requests = []
+
+    def download(ticker, start=None, end=None, period=None):
+        requests.append((start, end))
+        return adjusted[adjusted['Date'] >= pd.Timestamp(start)].reset_index(drop=True)
+
+    monkeypatch.setattr(store, '_download', download)
+    added = store.update_ticker('ABC', period='1y', today='2024-01-05')
+
+    assert requests == [('2024-01-02', '2024-01-06'), ('2023-01-01', '2024-01-06')]
+    assert added == 2
+    stored = store.load('ABC')
+    assert list(stored['Close']) == [50.0, 51.0, 52.0, 53.0, 27.0]
+    # Keine künstliche Rendite am Übergang alte/neue Daten
+    assert stored['Close'].pct_change().abs().iloc[1:4].max() < 0.05
+
+
+def test_dividend_on_new_day_reloads_full_history(tmp_path, monkeypatch):
+    store = PriceStore(root=str(tmp_path))
+    store.save('ABC', _bars(['2024-01-01', '2024-01-02'], [100.0, 101.0]))
+    store._index['ABC'] = {'covered_from': '2023-01-01'}
+    recent = _bars(['2024-01-01', '2024-01-02', '2024-01-03'], [99.0, 100.0, 100.5])
+    recent.loc[2, 'Dividends'] = 1.0
+    monkeypatch.setattr(store, '_download', lambda ticker, start=None, end=None, period=None:
+                        recent[recent['Date'] >= pd.Timestamp(start)].reset_index(drop=True))
+
+    store.update_ticker('ABC', period='1y', today='2024-01-03')
+    assert list(store.load('ABC')['Close']) == [99.0, 100.0, 100.5]
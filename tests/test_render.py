@@ -0,0 +1,78 @@
+"""
+render_plots: unveränderte Figuren werden nicht neu gerendert, plotly.js
+liegt als lokale Datei neben den Seiten.
+"""
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+pytest.importorskip('plotly')
+
+from analysis.correlation import lead_lag_analysis
+from visualizations.render import MANIFEST_FILE, plotly_asset_name, render_plots
+
+
+def _merged(n_days=40):
+    rng = np.random.default_rng(0)
+    dates = pd.bdate_range('2024-01-01', periods=n_days)
+    return pd.concat([pd.DataFrame({'ticker': ticker, 'date': dates,
+                                    'sentiment_score': rng.normal(0, 0.3, n_days),
+                                    'Volatility': rng.uniform(0.01, 0.03, n_days)})
+                      for ticker in ('AAA', 'BBB')], ignore_index=True)
+
+
+def _mtimes(plots_dir):
+    return {name: os.stat(os.path.join(plots_dir, name)).st_mtime_ns
+            for name in os.listdir(plots_dir) if name.endswith('.html')}
+
+
+def test_unchanged_figures_are_skipped(tmp_path):
+    plots_dir = str(tmp_path / 'plots')
+    merged = _merged()
+    lead_lag = lead_lag_analysis(merged, max_lag=3)
+
+    files, rendered = render_plots(merged, lead_lag, plots_dir, n_workers=1)
+    assert rendered == 5
+    assert all(os.path.exists(path) for path in files)
+    assert os.path.exists(os.path.join(plots_dir, MANIFEST_FILE))
+    before = _mtimes(plots_dir)
+
+    assert render_plots(merged, lead_lag, plots_dir, n_workers=1)[1] == 0
+    assert _mtimes(plots_dir) == before
+
+    # Nur die Figuren des geänderten Tickers werden neu gerendert
+    changed = merged.copy()
+    changed.loc[changed['ticker'] == 'BBB', 'sentiment_score'] *= -1
+    assert render_plots(changed, lead_lag, plots_dir, n_workers=1)[1] == 2
+    after = _mtimes(plots_dir)
+    assert {name for name in after if after[name] != before[name]} == \
+        {'BBB_sentiment_volatility.html', 'BBB_correlation.html'}
+
+    # Fehlende Datei trotz unverändertem Hash
+    os.remove(os.path.join(plots_dir, 'AAA_correlation.html'))
+    assert render_plots(changed, lead_lag, plots_dir, n_workers=1)[1] == 1
+    assert render_plots(changed, lead_lag, plots_dir, n_workers=1, force=True)[1] == 5
+
+
+def test_pages_use_local_plotly_asset(tmp_path):
+    plots_dir = str(tmp_path / 'plots')
+    merged = _merged()
+    files, _ = render_plots(merged, lead_lag_analysis(merged, max_lag=3), plots_dir, n_workers=1)
+
+    asset = os.path.join(plots_dir, plotly_asset_name())
+    assert files[0] == asset
+    assert os.path.getsize(asset) > 1_000_000
+
+    for path in files[1:]:
+        with open(path, encoding='utf-8') as f:
+            html = f.read()
+        assert f'src="{plotly_asset_name()}"' in html
+        assert 'cdn.plot.ly' not in html
+        assert len(html) < 200_000
+
+    # Vorhandenes Asset wird nicht neu geschrieben
+    mtime = os.stat(asset).st_mtime_ns
+    render_plots(merged, lead_lag_analysis(merged, max_lag=3), plots_dir, n_workers=1, force=True)
+    assert os.stat(asset).st_mtime_ns == mtime
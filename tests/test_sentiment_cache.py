@@ -0,0 +1,110 @@
+"""
+SentimentCache: stabile Schlüssel, getrennte Backends und Verdrängung.
+"""
+import pytest
+
+from sentiment import cache as cache_module
+from sentiment.cache import SentimentCache, make_key
+
+MODEL = 'ProsusAI/finbert'
+PROBS = [0.1, 0.2, 0.7]
+
+
+class Clock:
+    """Ersetzt time.time() im Cache-Modul durch eine steuerbare Uhr."""
+
+    def __init__(self, now=1_700_000_000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(cache_module.time, 'time', clock)
+    return clock
+
+
+@pytest.fixture
+def make_cache(tmp_path):
+    caches = []
+
+    def make(**kwargs):
+        cache = SentimentCache(path=str(tmp_path / 'cache' / 'sentiment.sqlite'), **kwargs)
+        caches.append(cache)
+        return cache
+
+    yield make
+    for cache in caches:
+        cache.close()
+
+
+def test_key_is_stable():
+    # Festwert: ändert sich der Schlüssel, sind alle bestehenden Caches ungültig
+    assert make_key('Apple beats estimates', MODEL) == \
+        '38251a7db5b7f0544a1634dd8711606937b933599314a9ee8d6663550e1a752b'
+    assert make_key('  Apple\tbeats\n estimates ', MODEL) == make_key('Apple beats estimates', MODEL)
+    assert make_key('Ａｐｐｌｅ beats estimates', MODEL) == make_key('Apple beats estimates', MODEL)
+    assert make_key('Apple beats estimates', MODEL, revision='main') == \
+        make_key('Apple beats estimates', MODEL)
+
+
+def test_key_separates_model_settings_and_backend():
+    base = make_key('Apple beats estimates', MODEL)
+    variants = [
+        make_key('apple beats estimates', MODEL),
+        make_key('Apple beats estimates', 'yiyanghkust/finbert-tone'),
+        make_key('Apple beats estimates', MODEL, revision='abc123'),
+        make_key('Apple beats estimates', MODEL, max_length=128),
+        make_key('Apple beats estimates', MODEL, backend='onnx'),
+        make_key('Apple beats estimates', MODEL, backend='onnx-int8'),
+    ]
+    assert len({base, *variants}) == len(variants) + 1
+    assert make_key('Apple beats estimates', MODEL, backend='torch') == base
+
+
+def test_roundtrip_and_persistence(make_cache):
+    key = make_key('Apple beats estimates', MODEL)
+    cache = make_cache()
+    cache.put_many([(key, PROBS)])
+    assert cache.get_many([key, 'missing']) == {key: pytest.approx(PROBS)}
+    assert cache.stats()['hits'] == 1 and cache.stats()['misses'] == 1
+    cache.close()
+
+    assert make_cache().get_many([key]) == {key: pytest.approx(PROBS)}
+
+
+def test_max_entries_evicts_least_recently_accessed(make_cache, clock):
+    cache = make_cache(max_entries=3, max_age_days=None)
+    for i in range(3):
+        clock.now += 1
+        cache.put_many([(f"k{i}", PROBS)])
+
+    # k0 wird gelesen und ist damit jünger als k1
+    clock.now += 1
+    assert 'k0' in cache.get_many(['k0'])
+    clock.now += 1
+    cache.put_many([('k3', PROBS)])
+
+    assert len(cache) == 3
+    assert set(cache.get_many(['k0', 'k1', 'k2', 'k3'])) == {'k0', 'k2', 'k3'}
+
+
+def test_max_age_days_expires_entries(make_cache, clock):
+    cache = make_cache(max_entries=None, max_age_days=30)
+    cache.put_many([('old', PROBS)])
+    clock.now += 20 * 86400
+    cache.put_many([('new', PROBS)])
+
+    clock.now += 11 * 86400
+    # Abgelaufene Einträge sind sofort unsichtbar, auch vor evict()
+    assert set(cache.get_many(['old', 'new'])) == {'new'}
+    assert len(cache) == 2
+    cache.evict()
+    assert len(cache) == 1
+
+    # Lesen verlängert das Alter nicht (maßgeblich ist created_at)
+    clock.now += 20 * 86400
+    assert cache.get_many(['new']) == {}
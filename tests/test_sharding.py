@@ -0,0 +1,99 @@
+"""
+Sharded-Läufe + merge ergeben dieselben Ergebnistabellen wie ein voller Lauf
+(offline: synthetische Kurse/Nachrichten, Stub-Modell statt FinBERT).
+"""
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from stub_model import StubAnalyzer
+from synthetic import make_news_items, make_prices
+import data.news_archive
+import data.stock_fetcher
+import main
+import sentiment.finbert_analyzer
+from data.news_fetcher import news_to_dataframe
+from data.universe import shard_universe
+
+N_TICKERS = 8
+N_DAYS = 120
+
+
+class FakeArchive:
+    """NewsArchive ohne Netzwerk; liefert die Zeilen in wechselnder Reihenfolge."""
+
+    items = None
+
+    def __init__(self, *args, **kwargs):
+        pass
+
+    def update(self, tickers=None, **kwargs):
+        return 0
+
+    def load(self, tickers=None, since=None):
+        items = [item for item in self.items if tickers is None or item['ticker'] in tickers]
+        # Reihenfolge wie aus einer Datenbank ohne ORDER BY: abhängig vom Lauf
+        order = np.random.default_rng(len(tickers or [])).permutation(len(items))
+        return news_to_dataframe([items[i] for i in order])
+
+
+@pytest.fixture
+def offline(tmp_path, monkeypatch):
+    prices = make_prices(N_TICKERS, N_DAYS, seed=7)
+    FakeArchive.items = make_news_items(prices, articles_per_day=3, seed=7)
+
+    def fetch_all_stocks(tickers=None, period='1y'):
+        return prices[prices['Ticker'].isin(tickers)].reset_index(drop=True)
+
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(data.stock_fetcher, 'fetch_all_stocks', fetch_all_stocks)
+    monkeypatch.setattr(data.news_archive, 'NewsArchive', FakeArchive)
+    monkeypatch.setattr(sentiment.finbert_analyzer, '_default_analyzer', StubAnalyzer())
+    monkeypatch.setattr(sentiment.finbert_analyzer, 'get_cache', lambda: None)
+    monkeypatch.setattr(main, 'DEFAULT_PIPELINE_DIR', str(tmp_path / 'cache'))
+
+    companies = dict(data.stock_fetcher.COMPANIES)
+    tickers = list(prices['Ticker'].unique())
+    with open('universe.txt', 'w') as f:
+        f.write('ticker,company\n' + '\n'.join(f"{t},Company {t}" for t in tickers))
+    yield tickers
+    data.stock_fetcher.COMPANIES.clear()
+    data.stock_fetcher.COMPANIES.update(companies)
+
+
+def _table(directory, name):
+    df = pd.read_csv(os.path.join(directory, name), sep=';', decimal=',')
+    key = 'Ticker' if 'Ticker' in df.columns else df.columns[0]
+    return df.sort_values(key).reset_index(drop=True)
+
+
+def test_shards_and_merge_match_full_run(offline):
+    tickers = offline
+    assert all(shard_universe(dict.fromkeys(tickers), i, 2) for i in range(2))
+
+    common = ['--universe', 'universe.txt', '--workers', '1', '--resamples', '200']
+    main.main(['run', *common, '--output', 'full'])
+    main.main(['run', *common, '--shard', '0/2'])
+    main.main(['run', *common, '--shard', '1/2'])
+    main.main(['merge', 'shard-0-of-2', 'shard-1-of-2', *common, '--output', 'merged'])
+
+    for name in ('results_correlation_per_ticker.csv', 'results_overall_correlations.csv'):
+        full = _table('full', name)
+        assert len(full) > 0
+        pd.testing.assert_frame_equal(_table('merged', name), full)
+    assert len(_table('merged', 'results_correlation_per_ticker.csv')) == len(tickers)
+
+    full = pd.read_parquet('full/merged.parquet').sort_values(['ticker', 'date']).reset_index(drop=True)
+    merged = pd.concat([pd.read_parquet(f'shard-{i}-of-2/merged.parquet') for i in range(2)])
+    merged = merged.sort_values(['ticker', 'date']).reset_index(drop=True)
+    pd.testing.assert_frame_equal(merged, full)
+
+
+def test_unknown_estimator_is_rejected_by_the_parser(capsys):
+    assert main.parse_args(['--estimator', 'parkinson']).estimator == 'parkinson'
+    assert main.parse_args([]).estimator == 'Volatility'
+    with pytest.raises(SystemExit):
+        main.parse_args(['run', '--estimator', 'parkinsen'])
+    assert "invalid choice: 'parkinsen'" in capsys.readouterr().err
@@ -0,0 +1,64 @@
+"""
+score_stream: Reihenfolge, Scores aus Cache und Modell, flush_timeout.
+"""
+import threading
+import time
+
+import pytest
+
+from stub_model import StubAnalyzer
+from sentiment.cache import SentimentCache
+from sentiment.stream import score_stream
+
+TITLES = [f"T{i:04d} shares {'rise' if i % 3 else 'falls'} on outlook {i}" for i in range(10)]
+
+
+@pytest.fixture
+def cache(tmp_path):
+    cache = SentimentCache(path=str(tmp_path / 'sentiment.sqlite'))
+    yield cache
+    cache.close()
+
+
+def test_stream_keeps_order_and_record_fields():
+    records = [{'title': title, 'ticker': f"T{i:04d}"} for i, title in enumerate(TITLES)]
+    result = list(score_stream(iter(records), batch_size=4, analyzer=StubAnalyzer(), use_cache=False))
+
+    assert [r['title'] for r in result] == TITLES
+    assert [r['ticker'] for r in result] == [r['ticker'] for r in records]
+    assert all('sentiment_score' not in r for r in records)
+    assert [r['title'] for r in score_stream(TITLES, batch_size=3, analyzer=StubAnalyzer(),
+                                             use_cache=False)] == TITLES
+
+
+def test_cached_scores_equal_fresh_scores(cache):
+    fresh = list(score_stream(TITLES, batch_size=4, analyzer=StubAnalyzer(), cache=cache))
+    assert cache.stats()['hits'] == 0
+    cached = list(score_stream(TITLES, batch_size=4, analyzer=StubAnalyzer(), cache=cache))
+    assert cache.stats()['hits'] == len(TITLES)
+
+    for a, b in zip(fresh, cached):
+        assert type(a['sentiment_score']) is float
+        assert type(b['sentiment_score']) is float
+        assert a['sentiment_score'] == b['sentiment_score']
+
+
+def test_flush_timeout_emits_partial_batch():
+    release = threading.Event()
+
+    def source():
+        yield from TITLES[:3]
+        # Ohne flush_timeout bliebe der Batch bis hierher unvollständig
+        if not release.wait(5):
+            raise RuntimeError("Teil-Batch wurde nicht ausgegeben")
+        yield from TITLES[3:]
+
+    stream = score_stream(source(), batch_size=8, flush_timeout=0.05,
+                          analyzer=StubAnalyzer(), use_cache=False)
+    t0 = time.monotonic()
+    first = [next(stream)['title'] for _ in range(3)]
+    assert time.monotonic() - t0 < 2
+    assert first == TITLES[:3]
+
+    release.set()
+    assert [r['title'] for r in stream] == TITLES[3:]
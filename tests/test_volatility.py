@@ -0,0 +1,62 @@
+"""
+rolling_volatility / calculate_volatility_by_ticker entsprechen
+groupby('Ticker')['Daily_Return'].rolling(window).std(), auch mit ±inf
+und konstanten Reihen.
+"""
+import numpy as np
+import pandas as pd
+import pytest
+
+from synthetic import make_prices
+from analysis.volatility import calculate_volatility_by_ticker, rolling_volatility
+
+
+def _reference(df, window):
+    """Direkt mit pandas pro Ticker; ±inf wie fehlende Werte."""
+    df = df.sort_values(['Ticker', 'Date']).reset_index(drop=True)
+    returns = df['Daily_Return'].where(np.isfinite(df['Daily_Return']))
+    std = returns.groupby(df['Ticker']).rolling(window).std().reset_index(level=0, drop=True)
+    return df.assign(Volatility=std.sort_index())
+
+
+def _prices():
+    df = make_prices(4, 120, seed=3)
+    # Ticker T0001: ein inf-Wert mitten in der Reihe, T0002: konstante Renditen
+    df.loc[(df['Ticker'] == 'T0001') & (df.index % 120 == 50), 'Daily_Return'] = np.inf
+    df.loc[(df['Ticker'] == 'T0001') & (df.index % 120 == 70), 'Daily_Return'] = -np.inf
+    df.loc[df['Ticker'] == 'T0002', 'Daily_Return'] = 0.01
+    # Gemischte Zeilenreihenfolge wie nach einem concat mehrerer Quellen
+    return df.sample(frac=1.0, random_state=0)
+
+
+@pytest.mark.parametrize('window', [5, 20, 60])
+def test_matches_pandas_groupby_rolling_std(window):
+    df = _prices()
+    expected = _reference(df, window)
+    result = calculate_volatility_by_ticker(df, window=window)
+
+    merged = expected.merge(result[['Ticker', 'Date', 'Volatility']], on=['Ticker', 'Date'],
+                            suffixes=('_expected', ''))
+    assert len(merged) == len(df)
+    np.testing.assert_allclose(merged['Volatility'], merged['Volatility_expected'],
+                               rtol=1e-8, atol=1e-12, equal_nan=True)
+
+
+def test_inf_does_not_leak_into_other_tickers():
+    df = _prices()
+    clean = df.copy()
+    clean.loc[np.isinf(clean['Daily_Return']), 'Daily_Return'] = 0.0
+
+    with_inf = rolling_volatility(df, windows=(20,))
+    without = rolling_volatility(clean, windows=(20,))
+    other = with_inf['Ticker'] != 'T0001'
+    # Gleiches NaN-Muster, Werte bis auf Rundung der kumulativen Summen gleich
+    np.testing.assert_allclose(with_inf.loc[other, 'Volatility_20'].to_numpy(),
+                               without.loc[other, 'Volatility_20'].to_numpy(), rtol=1e-5)
+
+
+def test_constant_series_has_zero_volatility():
+    result = calculate_volatility_by_ticker(_prices(), window=20)
+    constant = result.loc[result['Ticker'] == 'T0002', 'Volatility']
+    assert constant.isna().sum() == 19
+    np.testing.assert_allclose(constant.dropna(), 0.0, atol=1e-15)
@@ -10,8 +10,12 @@ def create_dashboard(tickers, ticker_stats=None):
     
     Args:
         tickers: Liste der Ticker-Symbole
-        ticker_stats: Dictionary mit Statistiken pro Ticker (optional)
+        ticker_stats: Dictionary mit Statistiken pro Ticker oder DataFrame
+            aus analysis.correlation.compute_ticker_stats (optional)
     """
+    # Tabelle aus compute_ticker_stats: eine Zeile pro Ticker
+    if hasattr(ticker_stats, 'set_index'):
+        ticker_stats = ticker_stats.set_index('ticker').to_dict('index')
     
     html_content = """
 <!DOCTYPE html>
@@ -10,6 +10,7 @@ def plot_sentiment_vs_volatility(df, ticker):
     
     Args:
         df: DataFrame mit 'date', 'sentiment_score', 'Volatility'
+            (optional 'rolling_correlation' aus correlation.rolling_correlation)
         ticker: Ticker-Symbol
     """
     ticker_df = df[df['ticker'] == ticker].sort_values('date')
@@ -40,6 +41,18 @@ def plot_sentiment_vs_volatility(df, ticker):
         secondary_y=True,
     )
     
+    # 3. Rolling-Korrelation (gleicher Wertebereich wie das Sentiment)
+    if 'rolling_correlation' in ticker_df.columns:
+        fig.add_trace(
+            go.Scatter(
+                x=ticker_df['date'],
+                y=ticker_df['rolling_correlation'],
+                name="Rolling-Korrelation",
+                line=dict(color='green', width=2, dash='dot')
+            ),
+            secondary_y=False,
+        )
+    
     # Layout anpassen
     fig.update_layout(
         title_text=f"Sentiment vs. Volatilität: {ticker}<br><sub>Zeitreihenanalyse | FinBERT Sentiment-Score & 20-Tage Rolling Volatility</sub>",
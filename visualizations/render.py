@@ -0,0 +1,159 @@
+"""
+Rendert die Plots parallel und inkrementell.
+
+- plotly.js wird einmal als lokale Datei (plotly-<version>.min.js) neben die
+  HTML-Seiten geschrieben; jede Seite bindet sie per <script src> ein. Die
+  Seiten funktionieren damit ohne Internetzugang (kein CDN) und sind nur
+  wenige KB groß.
+- Figuren werden in einem Prozess-Pool erstellt und geschrieben.
+- Pro Figur wird ein Hash der Eingabedaten (plus Code- und plotly-Version)
+  in plots_dir/.render_manifest.json abgelegt; Figuren mit unverändertem
+  Hash und vorhandener Datei werden nicht neu gerendert.
+"""
+import hashlib
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+import plotly
+import plotly.offline
+
+try:
+    from visualizations.plots import (
+        plot_sentiment_vs_volatility, plot_correlation_scatter, plot_lead_lag_heatmap
+    )
+except ImportError:
+    from plots import plot_sentiment_vs_volatility, plot_correlation_scatter, plot_lead_lag_heatmap
+
+
+MANIFEST_FILE = '.render_manifest.json'
+# Spalten, die die Plots pro Ticker verwenden
+TICKER_COLUMNS = ['ticker', 'date', 'sentiment_score', 'Volatility', 'rolling_correlation']
+# Darunter lohnt sich der Start eines Prozess-Pools (Import von plotly) nicht
+MIN_POOL_TASKS = 16
+
+_PLOTTERS = {
+    'timeseries': lambda df, ticker: plot_sentiment_vs_volatility(df, ticker),
+    'scatter': lambda df, ticker: plot_correlation_scatter(df, ticker),
+    'heatmap': lambda df, ticker: plot_lead_lag_heatmap(df),
+}
+
+
+def plotly_asset_name():
+    return f"plotly-{plotly.offline.get_plotlyjs_version()}.min.js"
+
+
+def write_plotly_asset(plots_dir):
+    """Schreibt plotly.js nach plots_dir (nur wenn noch nicht vorhanden). Returns: Pfad."""
+    path = os.path.join(plots_dir, plotly_asset_name())
+    if not os.path.exists(path):
+        tmp = path + '.tmp'
+        with open(tmp, 'w', encoding='utf-8') as f:
+            f.write(plotly.offline.get_plotlyjs())
+        os.replace(tmp, path)
+    return path
+
+
+def _code_version():
+    """Änderungen an den Plot-Funktionen oder an plotly erzwingen neues Rendern."""
+    digest = hashlib.sha256(plotly.__version__.encode())
+    directory = os.path.dirname(os.path.abspath(__file__))
+    for name in ('plots.py', 'render.py'):
+        with open(os.path.join(directory, name), 'rb') as f:
+            digest.update(f.read())
+    return digest.hexdigest()
+
+
+def _data_hash(kind, df, version):
+    digest = hashlib.sha256(f"{kind}|{version}|{list(df.columns)}".encode())
+    digest.update(pd.util.hash_pandas_object(df, index=False).to_numpy().tobytes())
+    return digest.hexdigest()
+
+
+def _render_task(task):
+    """Erstellt eine Figur und schreibt sie als HTML (läuft ggf. im Worker-Prozess)."""
+    kind, ticker, df, path, asset = task
+    fig = _PLOTTERS[kind](df, ticker)
+    tmp = path + '.tmp'
+    fig.write_html(tmp, include_plotlyjs=asset)
+    os.replace(tmp, path)
+    return path
+
+
+def _read_manifest(plots_dir):
+    path = os.path.join(plots_dir, MANIFEST_FILE)
+    if not os.path.exists(path):
+        return {}
+    try:
+        with open(path, encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _write_manifest(plots_dir, manifest):
+    path = os.path.join(plots_dir, MANIFEST_FILE)
+    with open(path + '.tmp', 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=1, sort_keys=True)
+    os.replace(path + '.tmp', path)
+
+
+def safe_name(ticker):
+    """Ticker-Name bereinigen (Sonderzeichen entfernen)."""
+    return str(ticker).strip().replace('\r', '').replace('\n', '')
+
+
+def render_plots(merged_df, lead_lag_df, plots_dir, n_workers=None, force=False):
+    """
+    Rendert Zeitreihe und Scatter pro Ticker sowie die Lead-Lag-Heatmap.
+
+    Args:
+        merged_df: Kombinierter DataFrame (ticker, date, sentiment_score, Volatility, ...)
+        lead_lag_df: Ergebnis von correlation.lead_lag_analysis
+        plots_dir: Zielverzeichnis
+        n_workers: Anzahl Prozesse (Standard: Anzahl CPU-Kerne; 1 = ohne Pool)
+        force: Alle Figuren neu rendern
+
+    Returns:
+        (Liste aller Dateien inkl. plotly.js, Anzahl neu gerenderter Figuren)
+    """
+    os.makedirs(plots_dir, exist_ok=True)
+    asset_path = write_plotly_asset(plots_dir)
+    asset = os.path.basename(asset_path)
+    version = _code_version()
+
+    columns = [c for c in TICKER_COLUMNS if c in merged_df.columns]
+    figures = []
+    for ticker, ticker_df in merged_df[columns].groupby('ticker', sort=False):
+        ticker_df = ticker_df.sort_values('date').reset_index(drop=True)
+        name = safe_name(ticker)
+        figures.append(('timeseries', ticker, ticker_df, f"{name}_sentiment_volatility.html"))
+        figures.append(('scatter', ticker, ticker_df, f"{name}_correlation.html"))
+    figures.append(('heatmap', None, lead_lag_df.reset_index(drop=True), "lead_lag_heatmap.html"))
+
+    old = {} if force else _read_manifest(plots_dir)
+    manifest = {}
+    tasks = []
+    files = [asset_path]
+    for kind, ticker, df, filename in figures:
+        path = os.path.join(plots_dir, filename)
+        key = _data_hash(kind, df, version)
+        manifest[filename] = key
+        files.append(path)
+        if old.get(filename) != key or not os.path.exists(path):
+            tasks.append((kind, ticker, df, path, asset))
+
+    n_workers = min(n_workers or os.cpu_count() or 1, len(tasks))
+    if n_workers <= 1 or len(tasks) < MIN_POOL_TASKS:
+        for task in tasks:
+            _render_task(task)
+    else:
+        chunksize = max(1, len(tasks) // (n_workers * 4))
+        with ProcessPoolExecutor(max_workers=n_workers) as executor:
+            for _ in executor.map(_render_task, tasks, chunksize=chunksize):
+                pass
+
+    # Einträge nicht mehr gerenderter Figuren (z.B. entfernte Ticker) behalten
+    _write_manifest(plots_dir, {**old, **manifest})
+    return files, len(tasks)